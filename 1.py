@@ -1,218 +1,531 @@
 # Corrected Code (Adds import datetime)
 import streamlit as st
 import time
-import random # Keep random for placeholder data where SDK calls fail/are not implemented
-import string # Needed for mock key generation if SDK fails
 import datetime # <<< FIXED: Added missing import
+import os
+import uuid
+
+from nem import metrics as nem_metrics # Request latency, node errors, cache and parse counters
+from nem import wallet # Balances, sends and history without any UI; errors come back as values
+from nem import stream as nem_stream # Pushed blocks and account events over the node's websocket
+from nem.nodes import NodePool # Latency-aware node selection with background health probing
+from nem.index import DEFAULT_INDEX_PATH, TransactionIndex # Local SQLite history, synced incrementally
+from nem.cache import HeightCache # Entries valid until the next block or until their address is invalidated
+from nem.archive import DEFAULT_ARCHIVE_PATH, ArchivedApi, ResponseArchive # Final transactions and blocks kept on disk
+from nem.crypto import TESTNET, generate_keypairs # NIS1 ed25519-keccak keys and addresses
+from nem.address import Address, normalize_address # Checksum-validated addresses, memoized normalization
+from nem.transactions import send_batch # Serialize, sign and announce NIS1 transfers in bulk
+from nem.tracker import PendingTracker # One blocks-after request per new block resolves every announced hash
+from nem.history import nem_datetime # NEM timestamps (seconds since the nemesis block) as UTC datetimes
+from nem.registry import AccountRegistry # Accounts by address in O(1), searchable pages, CSV import/export
 
 st.set_page_config(page_title="NEM (XEM) Testnet Demo", layout="wide")
 
-# --- !!! SDK PLACEHOLDER !!! ---
-# You would need to install a NEM NIS1 Python SDK, e.g., pip install nem-python-kit (if available/working)
-# Then import the necessary classes. The names below are *examples*.
-try:
-    # --- Replace with actual SDK imports ---
-    from nem_sdk import NemClient, KeyPair, Transaction, NetworkType, NodeSelector, Address
-    from nem_sdk.models import TransferTransaction, PlainMessage
-    from nem_sdk.network import NetworkConfig
-    # --- End Replace ---
-    SDK_AVAILABLE = True
-except ImportError:
-    st.sidebar.error("⚠️ NEM NIS1 SDK not found. Please install a suitable library (e.g., 'nem-python-kit') and adjust imports. Running in limited mock mode.")
-    SDK_AVAILABLE = False
-    # Define dummy classes/functions if SDK is missing, to prevent NameErrors
-    class KeyPair:
-        @staticmethod
-        def generate(): return KeyPair()
-        def __init__(self):
-            self.private_key = "mock_private_" + ''.join(random.choices(string.ascii_lowercase + string.digits, k=64))
-            self.public_key = "mock_public_" + ''.join(random.choices(string.ascii_lowercase + string.digits, k=64))
-        def get_address(self, net_type): return "T" + "MOCKADDRESS" + ''.join(random.choices(string.ascii_uppercase + string.digits, k=30))
-        def sign(self, tx): return "signed_mock_tx_payload"
-    class NemClient:
-        def __init__(self, url): self.url = url
-        def get_account_info(self, addr): return {"balance": random.randint(0, 1000) * 1000000} # Mock microXem
-        def announce_transaction(self, signed_tx): return {"transactionHash": "mock_tx_hash_" + ''.join(random.choices(string.hexdigits, k=64))}
-        def get_account_transactions(self, addr, direction='all'): return [] # Mock history
-    class TransferTransaction:
-        @staticmethod
-        def create(*args, **kwargs): return "mock_tx_object"
-    class PlainMessage:
-        def __init__(self, msg): self.message = msg
-    class NetworkType:
-        TEST_NET = 152 # Example value for testnet identifier
-    class Address:
-        def __init__(self, addr): self.plain = addr
-        def is_valid(self): return isinstance(self.plain, str) and len(self.plain) > 30 and self.plain.startswith("T") # Basic mock validation
-# --- END SDK PLACEHOLDER ---
-
 
 # --- Configuration ---
 # Find public NEM Testnet node URLs (search online for "NEM NIS1 Testnet nodes")
-# Example list, check for currently active ones!
-# TESTNET_NODE_URLS = [
-#     "http://bob.nem.ninja:7778", # Often used NIS testnet nodes
-#     "http://104.128.226.60:7890",
-#     "http://23.228.67.85:7890",
-# ]
-# Using a single reliable one for simplicity in the demo:
-DEFAULT_TESTNET_NODE = "http://bob.nem.ninja:7778" # CHECK IF THIS IS ACTIVE!
-NEM_EPOCH = datetime.datetime(2015, 3, 29, 0, 6, 25, tzinfo=datetime.timezone.utc)
-
-
-# --- SDK Helper Functions (Adapt based on actual SDK) ---
+# Example list, check for currently active ones! Requests go to the fastest healthy node in the pool.
+TESTNET_NODE_URLS = [
+    "http://bob.nem.ninja:7778", # Often used NIS testnet nodes
+    "http://104.128.226.60:7890",
+    "http://23.228.67.85:7890",
+]
+HISTORY_PAGE_SIZES = (100, 500, 1000) # Rows per history table page
+HISTORY_SORTS = { # Label -> (index column, descending)
+    "Newest first": ("id", True), "Oldest first": ("id", False),
+    "Largest amount": ("amount", True), "Smallest amount": ("amount", False), "Highest fee": ("fee", True),
+}
+EXPLORER_TX_URL = "http://bob.nem.ninja:8765/transaction/" # Example explorer
+NEM_GENESIS_DATE = nem_datetime(0).date() # Earliest date the history filter offers
+ACCOUNTS_PAGE_SIZE = 20 # Accounts listed (and balance-checked) per page of the sidebar picker
+PORTFOLIO_PAGE_SIZE = 100 # Accounts looked up per portfolio page; totals over every account are on demand
+WATCH_ONLY_ERROR = "❌ Cannot send: the selected account is watch-only (no private key imported)."
+METRICS_FILE = os.environ.get("NEM_METRICS_FILE") # Prometheus textfile, rewritten after every render
+METRICS_PORT = os.environ.get("NEM_METRICS_PORT") # Serve /metrics on this port
+NODE_STATUS_REFRESH_SECONDS = 15 # Sidebar node health redraw interval (matches the background probe interval)
+# Push updates need the optional websockets package; NEM_LIVE_UPDATES=0 turns them off
+LIVE_UPDATES = nem_stream.available() and os.environ.get("NEM_LIVE_UPDATES", "1") != "0"
+LIVE_REFRESH_SECONDS = 5 # How often a session checks the pushed events of the account it shows (no node requests)
+SENT_STATUS_REFRESH_SECONDS = 5 # Redraw of this session's sent transactions from the tracker's state
+
+
+# --- SDK Helper Functions (UI wrappers around nem.wallet) ---
 def generate_testnet_account():
-    """Generate a new NEM Testnet account."""
-    # Generate a random private key (32 bytes)
-    private_key = ''.join(random.choices(string.hexdigits.lower(), k=64))
-    # Public key is derived from private key (mock implementation)
-    public_key = ''.join(random.choices(string.hexdigits.lower(), k=64))
-    # Address format: T- followed by 39 characters (mock implementation)
-    address = f"T-{''.join(random.choices(string.ascii_uppercase + string.digits, k=39))}"
-    
-    return {
-        "private_key": private_key,
-        "public_key": public_key,
-        "address": address
-    }
+    """Generate a new NEM Testnet account (public key and address derived from the private key)."""
+    return wallet.generate_account(TESTNET)
 
-def get_account_balance(address):
-    """Get account balance (mock implementation)."""
-    # In real implementation, this would query the NEM Testnet node
-    return random.randint(0, 1000000)  # Return random balance for demo
+@st.cache_resource # One SQLite response archive per process; every worker process opens the same file
+def get_response_archive():
+    return ResponseArchive(os.environ.get("NEM_ARCHIVE_PATH", DEFAULT_ARCHIVE_PATH))
 
-@st.cache_resource # Cache the client connection per node URL
-def get_nem_client(node_url):
-    if not SDK_AVAILABLE:
-        # st.warning("SDK not available, using mock client.") # Warning moved to sidebar
-        return NemClient(node_url) # Return mock client
+@st.cache_resource # One pool (and one prober thread) per node list, shared by all sessions
+def get_nem_client(node_urls):
     try:
-        # --- Replace with actual SDK client initialization ---
-        client = NemClient(node_url)
-        # Perform a basic check if possible, e.g., get node info
-        # client.get_node_info()
-        # --- End Replace ---
-        return client
+        pool = NodePool(node_urls).start() # Probing runs in the background, never on the request path
+        # Transactions and blocks more than 360 blocks deep are served from disk, everything else goes to the pool
+        return ArchivedApi(pool, get_response_archive(), lambda: pool.best_height)
     except Exception as e:
-        st.error(f"Failed to connect to node {node_url}: {e}")
+        st.error(f"Failed to set up node pool {list(node_urls)}: {e}")
         return None
 
-def generate_testnet_account_sdk():
-    if not SDK_AVAILABLE: return KeyPair().generate() # Use mock KeyPair
-    # --- Replace with actual SDK key generation ---
-    key_pair = KeyPair.generate()
-    # --- End Replace ---
-    return key_pair
+@st.cache_resource # One height-aware cache per node pool, shared by all sessions
+def get_height_cache(node_urls):
+    pool = get_nem_client(node_urls)
+    return HeightCache(lambda: pool.best_height if pool else None) # Height comes from the background prober
 
-@st.cache_data(ttl=60) # Cache balance for 60 seconds
-def get_account_balance_sdk(_client, address_str): # _client arg helps caching trigger
-    if not SDK_AVAILABLE or _client is None: return 0.0
+def get_account_balance_sdk(_client, address_str, cache):
+    if _client is None: return 0.0
     try:
-        client = _client # Avoid modifying the cached client object directly if needed
-        address_obj = Address(address_str) # Create address object
-        if not address_obj.is_valid(): # Check validity before SDK call
-            # st.warning(f"Invalid address format for balance check: {address_str[:8]}...", icon="⚠️")
-            return 0.0
-        # --- Replace with actual SDK balance check ---
-        account_info = client.get_account_info(address_obj) # Pass address object
-        balance_micro_xem = account_info['balance'] # Adjust based on actual SDK return structure
-        # --- End Replace ---
-        return balance_micro_xem / 1_000_000.0 # Convert from microXEM to XEM
+        return wallet.account_balance(_client, address_str, cache, TESTNET) # Unknown accounts are 0.0, not errors
     except Exception as e:
-        # Handle accounts not found (zero balance) vs other errors
-        if "does not exist" in str(e).lower() or "account_not_found" in str(e).upper():
-             return 0.0
         st.warning(f"Could not get balance for {address_str[:8]}...: {e}", icon="⚠️")
         return 0.0 # Return 0 on error
 
+def get_account_balances_sdk(_client, address_strs, cache):
+    """Balance, vested balance and importance for many accounts in one round of concurrent requests."""
+    if _client is None or not address_strs: return []
+    return wallet.account_balances(_client, address_strs, cache)
+
 def send_transaction_sdk(client, key_pair, recipient_address_str, amount_xem, message_str=""):
-    if not SDK_AVAILABLE or client is None:
-        st.error("SDK not available or client not connected.")
-        return None, "SDK Error"
+    if client is None:
+        st.error("Client not connected.")
+        return None, "Client Error"
     try:
-        sender_address = key_pair.get_address(NetworkType.TEST_NET) # Get sender addr from keys
-        recipient_address = Address(recipient_address_str)
-
-        # --- Input validation ---
-        if not recipient_address.is_valid(): # Use SDK's validation
-             return None, "Invalid recipient address format."
-        if amount_xem <= 0:
-            return None, "Amount must be positive."
-        # Basic check if sender has *any* balance - more precise check done by network/SDK
-        # current_balance = get_account_balance_sdk(client, sender_address) # Careful with caching here if needed immediately
-        # if current_balance < amount_xem: # Doesn't account for fee accurately here
-        #    return None, "Insufficient balance (pre-check, fee not included)."
-
-        # --- Replace with actual SDK transaction creation ---
-        tx = TransferTransaction.create(
-            network_type=NetworkType.TEST_NET, # Make sure SDK uses this constant
-            recipient_address=recipient_address, # Pass address object
-            amount=int(amount_xem * 1_000_000), # Use microXEM
-            message=PlainMessage(message_str) if message_str else None
-        )
-        # SDK might calculate fees automatically, or you might need to set it.
-        # tx.fee = calculate_fee(tx) # Example if manual calc needed
-
-        signed_tx = key_pair.sign(tx)
-        response = client.announce_transaction(signed_tx)
-        tx_hash = response['transactionHash'] # Adjust based on actual SDK return structure
-        # --- End Replace ---
-
-        return tx_hash, None # Return hash on success, None for error message
+        return wallet.send_transfer(client, key_pair, recipient_address_str, amount_xem, message_str, TESTNET) # Hash on success, error message otherwise
     except Exception as e:
         st.error(f"Transaction failed: {e}")
         return None, str(e)
 
-@st.cache_data(ttl=120) # Cache history for 2 minutes
-def get_transaction_history_sdk(_client, address_str):
-    if not SDK_AVAILABLE or _client is None: return []
+def send_transaction_batch(client, key_pair, entries):
+    """Send ``(recipient, amount_xem, message)`` entries from one account; one result dict per entry."""
     try:
-        client = _client
-        address_obj = Address(address_str) # Create address object
-        if not address_obj.is_valid(): # Check validity
-             return []
-        # --- Replace with actual SDK history fetch ---
-        # Note: SDKs often return complex objects. You'll need to parse them.
-        # This might fetch incoming, outgoing, or all. Check SDK docs.
-        transactions = client.get_account_transactions(address_obj, direction='all') # Example
-        # --- End Replace ---
-
-        # --- Basic Parsing Example (ADAPT TO YOUR SDK's return format) ---
-        parsed_history = []
-        for tx in transactions:
-             # This is highly dependent on the SDK's transaction object structure
-             tx_data = {}
-             try:
-                 # Use getattr for safety in case attributes are missing in some tx types
-                 tx_data['hash'] = getattr(tx, 'hash', 'N/A')
-                 tx_data['type'] = getattr(tx, 'type', 'N/A')
-                 tx_data['sender'] = getattr(getattr(getattr(tx, 'signer', None), 'address', None), 'plain', 'N/A')
-                 tx_data['recipient'] = getattr(getattr(tx, 'recipient', None), 'plain', 'N/A')
-                 tx_data['amount'] = getattr(tx, 'amount', 0) / 1000000.0 # Amount in XEM
-                 tx_data['fee'] = getattr(tx, 'fee', 0) / 1000000.0 # Fee in XEM
-                 # Timestamps might need conversion from NEM epoch
-                 nem_timestamp = getattr(tx, 'timestamp', None) # Or tx.transaction_info.timestamp
-                 if nem_timestamp is not None:
-                      tx_data['timestamp'] = NEM_EPOCH + datetime.timedelta(seconds=nem_timestamp)
-                 else:
-                      tx_data['timestamp'] = datetime.datetime.now(datetime.timezone.utc) # Fallback timestamp
-
-                 message_obj = getattr(tx, 'message', None)
-                 tx_data['message'] = getattr(message_obj, 'payload', '') if message_obj else '' # Extract message payload
-
-                 parsed_history.append(tx_data)
-             except Exception as e: # Catch broader exceptions during parsing
-                 st.warning(f"Skipping transaction due to parsing error: {e}", icon="⚠️")
-                 continue # Skip transactions that don't fit the expected structure
-        return parsed_history
-        # --- End Basic Parsing Example ---
-
+        return send_batch(client, key_pair, entries, network=TESTNET)
     except Exception as e:
-        st.error(f"Failed to get transaction history: {e}")
-        return []
+        st.error(f"Transaction failed: {e}")
+        return [{"recipient": str(entry[0]), "amount": None, "hash": None, "error": str(e)} for entry in entries]
+
+@st.cache_resource # One websocket per node and one set of subscriptions per pool, shared by all sessions
+def get_live_updates(node_urls):
+    pool = get_nem_client(node_urls)
+    if not LIVE_UPDATES or pool is None:
+        return None
+    stream = nem_stream.get_pool_stream(pool) # Reconnects to the pool's best node, so a dead node is replaced
+    return nem_stream.LiveUpdates(stream, get_height_cache(node_urls), pool)
+
+@st.cache_resource # One confirmation tracker per node pool: all sessions' transactions share each block check
+def get_tracker(node_urls):
+    pool = get_nem_client(node_urls)
+    if pool is None:
+        return None
+    tracker = PendingTracker(pool).start(lambda: pool.best_height)
+    live = get_live_updates(node_urls)
+    if live:
+        live.on_unconfirmed(tracker.mark_unconfirmed) # Pushed for the accounts on screen, e.g. the sender
+    return tracker
+
+def track_sent(tracker, results, height):
+    """Remember this session's announced transactions and have the shared tracker resolve them from ``height`` on."""
+    if tracker is None:
+        return
+    tracker.add_results(results, height)
+    st.session_state.setdefault("sent_hashes", []).extend(r["hash"] for r in results if r.get("hash"))
+
+@st.cache_resource # One SQLite transaction index per process, shared by all sessions
+def get_transaction_index():
+    return TransactionIndex(os.environ.get("NEM_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+def get_transaction_page_sdk(_client, address_str, cache, page, page_size, direction, order_by, descending, min_xem, max_xem, since, until):
+    """Return (one page of filtered, sorted transfers as TransferColumns, rows matching, history complete?) from the local index."""
+    history, total, complete, error = wallet.transfer_history_page(
+        _client, get_transaction_index(), address_str, cache, page, page_size, direction,
+        order_by, descending, min_xem, max_xem, since, until, TESTNET,
+    )
+    if error:
+        st.warning(f"Node unavailable, showing locally indexed history: {error}", icon="⚠️")
+    return history, total, complete
+
+@st.cache_resource # One /metrics endpoint per process
+def start_metrics_endpoint(port):
+    return nem_metrics.start_http_server(port)
+
+def render_diagnostics(requests_before):
+    """Sidebar panel with request latency, node errors, cache efficiency and parse times."""
+    registry = nem_metrics.REGISTRY
+    with st.sidebar.expander("Diagnostics"):
+        st.metric("Node requests during this render", registry.total("nem_request_seconds") - requests_before,
+                  help="Includes background node probes that ran meanwhile.")
+        st.caption("Request latency")
+        st.dataframe(nem_metrics.latency_summary(registry), hide_index=True)
+        errors, failovers = nem_metrics.error_summary(registry)
+        st.caption(f"Node errors ({failovers} failover(s))")
+        if errors:
+            st.dataframe(errors, hide_index=True)
+        else:
+            st.write("No node errors.")
+        flow = nem_metrics.flow_summary(registry)
+        st.caption(f"{flow['coalesced']:,} request(s) answered by an identical one in flight · "
+                   f"{flow['rate_limited']:,} paced by node rate limits ({flow['rate_limit_wait_s']:,} s)")
+        st.caption("Cache")
+        st.dataframe(nem_metrics.cache_summary(registry), hide_index=True)
+        archive = get_response_archive().stats()
+        st.caption(f"Response archive: {archive['entries']:,} final responses, "
+                   f"{archive['bytes'] / 2**20:,.1f} of {archive['max_bytes'] / 2**20:,.0f} MiB")
+        st.caption("Parsing")
+        st.dataframe(nem_metrics.parse_summary(registry), hide_index=True)
+        st.download_button("⬇️ Prometheus metrics", nem_metrics.render_prometheus(), file_name="nem_metrics.prom", mime="text/plain")
+    if METRICS_FILE:
+        nem_metrics.write_prometheus(METRICS_FILE)
+
+
+# --- Fragments ---
+# Each sidebar section and tab reruns on its own: a widget inside a fragment
+# reruns only that fragment, and st.rerun() (scope "app") is used only where
+# the whole page depends on the change (e.g. a different selected account).
+@st.fragment(run_every=NODE_STATUS_REFRESH_SECONDS) # Re-reads the prober's cached stats; never calls the nodes itself
+def render_node_status(client, live):
+    node_status = client.status()
+    healthy = [n for n in node_status if n["healthy"]]
+    if not any(n["latency_ms"] is not None for n in node_status):
+         st.info(f"⏳ Probing {len(node_status)} node(s)...")
+    elif healthy:
+         st.success(f"🟢 {len(healthy)}/{len(node_status)} node(s) healthy, using {healthy[0]['url']} ({healthy[0]['latency_ms']} ms)")
+    else:
+         st.error("🔴 No healthy node in the pool. Requests will still try every node.")
+    with st.expander("Node Pool Status"):
+         st.dataframe(node_status, hide_index=True)
+    if live:
+         stream_status = live.stream.status()
+         state = "connected" if stream_status["connected"] else f"reconnecting ({stream_status['last_error'] or 'connecting'})"
+         st.caption(f"📡 Live updates {state}, {stream_status['subscriptions']} subscription(s) on {stream_status['url']}")
+
+@st.fragment
+def render_accounts_sidebar(client, cache):
+    registry = st.session_state.accounts
+    st.header("Testnet Accounts")
+    st.info("ℹ️ Get free Testnet XEM from a [NEM Testnet Faucet](https://nemfaucet.utazukin.com/) (external link, search for others if down).")
+
+    if st.button("🔑 Generate New Testnet Account"):
+             with st.spinner("Generating keys..."):
+                 account = generate_testnet_account()
+                 registry.add(account['address'], account['public_key'], account['private_key'])
+                 st.session_state.selected_address = account['address']
+                 st.session_state.new_account = account # Shown once after the page reruns for the new account
+             st.rerun() # The main area now shows a different account
+    new_account = st.session_state.pop("new_account", None)
+    if new_account: # Keep the keys on screen so the user can copy them
+         st.success(f"Generated Account: {new_account['address'][:8]}...")
+         st.code(f"Address: {new_account['address']}\nPublic Key: {new_account['public_key']}\nPrivate Key: {new_account['private_key']}\n\n--- !!! SAVE PRIVATE KEY SECURELY !!! ---", language=None)
+
+    with st.expander("Bulk Generate (load testing)"):
+        bulk_count = st.number_input("Number of accounts", min_value=1, max_value=100_000, value=100, step=100)
+        if st.button("🔑 Generate Accounts", key="bulk_generate_btn"):
+            with st.spinner(f"Deriving {bulk_count} key pairs on a process pool..."):
+                started = time.perf_counter()
+                generated = generate_keypairs(int(bulk_count), TESTNET)
+                registry.extend(generated)
+            st.success(f"Generated {len(generated)} accounts in {time.perf_counter() - started:.1f}s.")
+            st.download_button("⬇️ Download keys (CSV)", "address,public_key,private_key\n" + "\n".join(
+                f"{acc['address']},{acc['public_key']},{acc['private_key']}" for acc in generated), file_name="testnet_accounts.csv", on_click="ignore")
+
+    with st.expander("Import / Export"):
+        st.caption("CSV with `address,public_key,private_key,label` columns; a line with only an address adds a watch-only account.")
+        uploaded = st.file_uploader("Accounts CSV", type=["csv", "txt"])
+        pasted = st.text_area("...or paste addresses / CSV lines", key="import_text")
+        verify = st.checkbox("Reject lines whose public key does not match their private key", value=True)
+        if st.button("📥 Import", key="import_btn") and (uploaded or pasted.strip()):
+            text = uploaded.getvalue().decode("utf-8-sig") if uploaded else pasted
+            with st.spinner("Importing accounts..."):
+                st.session_state.import_result = registry.import_csv(text, verify=verify) # Kept across reruns, e.g. the one selecting a first account
+        import_result = st.session_state.get("import_result")
+        if import_result:
+            imported, errors = import_result
+            st.success(f"Last import: {imported:,} account(s); {len(registry):,} in total.")
+            if errors:
+                st.warning(f"{len(errors)} line(s) skipped.", icon="⚠️")
+                st.dataframe([{"line": line, "error": error} for line, error in errors[:1000]], hide_index=True)
+        if registry:
+            include_keys = st.checkbox("Include private keys in export")
+            st.download_button("⬇️ Export accounts (CSV)", registry.export_csv(include_private_keys=include_keys),
+                               file_name="nem_accounts.csv", on_click="ignore")
+
+    if not registry:
+        st.write("No testnet accounts generated yet.")
+        return
+    if registry.get(st.session_state.selected_address) is None:
+        # Nothing (or an address no longer registered) is selected: default to the first account
+        st.session_state.selected_address = next(iter(registry)).address
+        st.rerun() # The main area was drawn for the old selection
+
+    # Searchable, paginated picker: only one page of accounts is listed (and has its balance fetched) per rerun
+    query = st.text_input("Search accounts", placeholder="Address or label", key="account_query")
+    page_count = max(1, -(-len(registry.search(query)) // ACCOUNTS_PAGE_SIZE))
+    page = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, value=1, step=1, key="account_page") if page_count > 1 else 1
+    records, total = registry.page(query, int(page) - 1, ACCOUNTS_PAGE_SIZE)
+    st.caption(f"{total:,} of {len(registry):,} account(s) match" if query.strip() else f"{len(registry):,} account(s)")
+    if not records:
+        st.write("No account matches the search.")
+        return
+    # Balances for this page only, in one batch; cached per block so reruns don't hit the node again
+    balances = {row["address"]: row for row in get_account_balances_sdk(client, [record.address for record in records], cache)}
+
+    def account_label(address):
+        record, row = registry.get(address), balances.get(address)
+        balance_label = f"{row['balance']:,.2f} XEM" if row and not row["error"] else "? XEM"
+        name = f" · {record.label}" if record.label else ""
+        return f"{address[:8]}...{name} ({balance_label}){' 👁' if record.watch_only else ''}"
+
+    options = [record.address for record in records]
+    selected = st.session_state.selected_address
+    selected_key = st.selectbox(
+        "Select Account:",
+        options=options,
+        format_func=account_label,
+        index=options.index(selected) if selected in options else None, # A page never lists more than ACCOUNTS_PAGE_SIZE
+        placeholder=f"Selected: {selected[:8]}... (not on this page)",
+    )
+    # Update state only if selection changed
+    if selected_key is not None and selected_key != selected:
+         st.session_state.selected_address = selected_key
+         st.rerun() # Whole page: every tab shows the selected account
+
+@st.fragment # "Refresh Balance" reruns only this block; pushed changes rerun the page via watch_live_updates
+def render_balance(client, cache, live, address):
+    st.subheader("Balance")
+    if st.button("🔄 Refresh Balance", key="refresh_balance_btn"):
+        # Invalidate only this account before fetching
+         cache.invalidate(normalize_address(address))
+
+    # Fetch and display balance
+    balance = get_account_balance_sdk(client, address, cache)
+    st.metric("Balance (Testnet XEM)", f"{balance:.6f}")
+    if balance == 0: # Unknown accounts report a zero balance
+         st.warning("Account might be empty or not yet seen by the network. Fund it via a Faucet.")
+    pending = live.pending(normalize_address(address)) if live else []
+    if pending:
+         st.info(f"⏳ {len(pending)} unconfirmed transaction(s) involving this account.")
+
+@st.fragment
+def render_send_tab(client, cache, tracker, selected_account_data, selected_key_pair):
+    st.subheader("Create Testnet Transaction")
+
+    # Allow sending to any testnet address (checksum validated before signing)
+    recipient_address_input = st.text_input("Recipient Testnet Address (starts with T)")
+    amount_to_send = st.number_input("Amount (Testnet XEM)", min_value=0.000001, step=0.1, format="%.6f")
+    message_input = st.text_input("Message (Optional)")
+
+    st.caption("The minimum network fee is added automatically (0.05 XEM per 10,000 XEM sent, plus 0.05 XEM per 32 message bytes).")
+
+    if st.button("🚀 Send Testnet XEM", key="send_xem_btn"):
+        if not selected_key_pair:
+             st.error(WATCH_ONLY_ERROR)
+        elif not recipient_address_input:
+             st.error("❌ Please enter a recipient address.")
+        elif amount_to_send <= 0:
+             st.error("❌ Please enter a positive amount.")
+        else:
+            sent_at = client.best_height # Taken before announcing: the transaction cannot be in this block or older ones
+            with st.spinner("📡 Preparing and sending transaction to Testnet..."):
+                tx_hash, error_msg = send_transaction_sdk(
+                    client,
+                    selected_key_pair, # Send the keypair object
+                    recipient_address_input,
+                    amount_to_send,
+                    message_input
+                )
+
+            if tx_hash:
+                st.success(f"✅ Transaction announced to the network!")
+                st.caption("It may take a minute or two to confirm; its status is tracked below.")
+                st.code(f"Transaction Hash: {tx_hash}", language=None)
+                # Provide link to a Testnet explorer (replace with a real one if known)
+                explorer_url = f"http://bob.nem.ninja:8765/transaction/{tx_hash}" # Example explorer, CHECK IF VALID
+                st.markdown(f"[View on Testnet Explorer (Example Link)]({explorer_url})", unsafe_allow_html=True)
+                st.balloons()
+                # Clear balance cache after sending TO update UI potentially faster
+                # It won't reflect instantly, but next refresh will be sooner
+                # Only the two accounts touched by this transfer are refetched
+                cache.invalidate(normalize_address(selected_account_data.address), normalize_address(recipient_address_input))
+                track_sent(tracker, [{"hash": tx_hash}], sent_at)
+            else:
+                st.error(f"❌ Transaction Failed: {error_msg}")
+
+    with st.expander("Batch Send"):
+        batch_text = st.text_area("One transfer per line: recipient,amount[,message]", key="batch_send_text", height=150)
+        batch_entries = wallet.parse_batch_lines(batch_text)
+        st.caption(f"{len(batch_entries)} transfer(s). All are signed together and announced concurrently; a bad line fails on its own.")
+        if not selected_key_pair:
+             st.error(WATCH_ONLY_ERROR)
+        if st.button("🚀 Send Batch", key="send_batch_btn", disabled=not batch_entries or not selected_key_pair) and selected_key_pair:
+            sent_at = client.best_height
+            with st.spinner(f"📡 Signing and announcing {len(batch_entries)} transaction(s)..."):
+                batch_results = send_transaction_batch(client, selected_key_pair, batch_entries)
+            sent = [r for r in batch_results if r["hash"]]
+            (st.success if len(sent) == len(batch_results) else st.warning)(f"{len(sent)}/{len(batch_results)} transaction(s) announced.")
+            st.dataframe(batch_results, hide_index=True)
+            recipients = [normalize_address(r["recipient"]) for r in sent]
+            cache.invalidate(normalize_address(selected_account_data.address), *recipients)
+            track_sent(tracker, sent, sent_at)
+
+    if tracker is not None:
+        render_sent_status(tracker)
+
+@st.fragment(run_every=SENT_STATUS_REFRESH_SECONDS) # Reads the tracker's state only; the tracker does the node requests
+def render_sent_status(tracker):
+    sent_hashes = st.session_state.get("sent_hashes", [])
+    if not sent_hashes:
+        return
+    statuses = tracker.statuses(reversed(sent_hashes))
+    counts = {state: sum(1 for s in statuses if s["state"] == state) for state in ("pending", "unconfirmed", "confirmed", "expired")}
+    st.markdown("---")
+    st.subheader("Sent Transactions")
+    st.caption(f"⏳ {counts['pending']} pending · 📨 {counts['unconfirmed']} unconfirmed · ✅ {counts['confirmed']} confirmed · ⌛ {counts['expired']} expired"
+               + (f" · checks paused after an error: {tracker.last_error}" if tracker.last_error else ""))
+    st.dataframe(statuses, hide_index=True)
+
+@st.fragment # Confirmed transfers invalidate the cache, so the redraw watch_live_updates triggers syncs them
+def render_history_tab(client, cache, selected_account_data):
+    st.subheader("Testnet Transaction History")
+    address = selected_account_data.address
+
+    col_refresh, col_full = st.columns(2)
+    if col_refresh.button("🔄 Refresh History", key="refresh_history_btn"):
+         cache.invalidate(normalize_address(address))
+    if col_full.button("📚 Index full history", key="index_full_history_btn", help="Fetch every older page so sorting and filters cover the whole history."):
+        with st.spinner("Indexing older transfers..."):
+            indexed, error = wallet.index_full_history(client, get_transaction_index(), address, TESTNET)
+        if error:
+            st.warning(f"Stopped after {indexed:,} transfers: {error}", icon="⚠️")
+
+    # Filters and sorting run as SQL in the local index; only the requested page reaches the browser
+    col_direction, col_sort = st.columns(2)
+    direction = col_direction.radio("Direction", ["all", "incoming", "outgoing"], horizontal=True, format_func=str.capitalize, key="history_direction")
+    sort_label = col_sort.selectbox("Sort", list(HISTORY_SORTS), key="history_sort")
+    col_min, col_max, col_dates = st.columns(3)
+    min_xem = col_min.number_input("Min amount (XEM)", min_value=0.0, value=None, format="%.6f", key="history_min")
+    max_xem = col_max.number_input("Max amount (XEM)", min_value=0.0, value=None, format="%.6f", key="history_max")
+    dates = col_dates.date_input("Date range (UTC)", value=[], min_value=NEM_GENESIS_DATE, max_value=datetime.date.today(), key="history_dates")
+    since = datetime.datetime.combine(dates[0], datetime.time.min, datetime.timezone.utc) if len(dates) > 0 else None
+    until = datetime.datetime.combine(dates[-1], datetime.time.max, datetime.timezone.utc) if len(dates) > 1 else None
+
+    query = (address, direction, sort_label, min_xem, max_xem, since, until)
+    if st.session_state.get("history_query") != query: # Another account or filter: back to the first page
+        st.session_state.history_query = query
+        st.session_state.history_page = 1
+    col_page, col_size = st.columns(2)
+    page_size = col_size.selectbox("Rows per page", HISTORY_PAGE_SIZES, key="history_page_size")
+    page = col_page.number_input("Page", min_value=1, step=1, key="history_page")
+
+    order_by, descending = HISTORY_SORTS[sort_label]
+    history, total, complete = get_transaction_page_sdk(
+        client, address, cache, int(page) - 1, page_size, direction, order_by, descending, min_xem, max_xem, since, until
+    )
+
+    account_address = Address(address)
+    totals = get_transaction_index().totals(account_address.plain)
+    col_in, col_out, col_fee = st.columns(3)
+    col_in.metric(f"Received ({totals['incoming']} indexed)", f"{totals['received']:.6f} XEM")
+    col_out.metric(f"Sent ({totals['outgoing']} indexed)", f"{totals['sent']:.6f} XEM")
+    col_fee.metric("Fees paid", f"{totals['fees']:.6f} XEM")
+
+    if not len(history):
+        if total:
+            st.info(f"Page {page} is past the last page ({-(-total // page_size):,}).")
+        else:
+            st.info("No transaction history found for this account on the selected node, or account is new.")
+        return
+    first = (int(page) - 1) * page_size + 1
+    st.caption(f"Rows {first:,}–{first + len(history) - 1:,} of {total:,} matching"
+               + ("" if complete else " among the indexed transfers; older ones are indexed as you page, or all at once with \"Index full history\""))
+    # One table element per page, built from whole columns; select a row for its details
+    event = st.dataframe(
+        history.table(account_address.plain),
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="history_table",
+        column_config={
+            "time": st.column_config.DatetimeColumn("Time (UTC)", format="YYYY-MM-DD HH:mm:ss"),
+            "direction": st.column_config.TextColumn("In/Out", width="small"),
+            "amount": st.column_config.NumberColumn("Amount (XEM)", format="%.6f"),
+            "fee": st.column_config.NumberColumn("Fee (XEM)", format="%.6f"),
+            "counterparty": st.column_config.TextColumn("Counterparty", help="Sender public key for incoming, recipient address for outgoing"),
+        },
+    )
+    selected_rows = event.selection.rows
+    if selected_rows and selected_rows[0] < len(history):
+        tx = history.rows(account_address.plain, selected_rows[0], selected_rows[0] + 1)[0]
+        with st.container(border=True):
+            ts_str = tx['timestamp'].strftime('%Y-%m-%d %H:%M:%S UTC') if isinstance(tx.get('timestamp'), datetime.datetime) else 'N/A'
+            if tx["incoming"]:
+                 st.markdown(f"➕ **Received:** `{tx['amount']:.6f}` XEM from `{tx['sender']}`")
+            else:
+                 st.markdown(f"➖ **Sent:** `{tx['amount']:.6f}` XEM to `{tx['recipient']}`")
+            st.caption(f"*Time:* {ts_str} | *Fee:* {tx['fee']:.6f} XEM | *Height:* {tx['height']:,} | "
+                       f"*Hash:* [{tx['hash']}]({EXPLORER_TX_URL}{tx['hash']})")
+            # st.code so the message is shown verbatim, without markdown interpretation
+            st.code(f"Message: {tx['message']}" if tx.get("message") else "No message", language=None)
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS) # Draws nothing; reruns the page only when an event touched the shown account
+def watch_live_updates(live, address):
+    live.watch(st.session_state.viewer_id, [address]) # Keeps this session's subscriptions alive; others are dropped
+    if st.session_state.get("live_drawn") != (address, live.version(address)):
+         st.rerun() # Balance, pending count and history were drawn before the change
+
+def portfolio_totals(rows):
+    return {
+        "balance": sum(row["balance"] for row in rows),
+        "vested_balance": sum(row["vested_balance"] for row in rows),
+        "accounts": len(rows),
+        "failed": sum(1 for row in rows if row["error"]),
+    }
+
+@st.fragment
+def render_portfolio_tab(client, cache):
+    registry = st.session_state.accounts
+    st.subheader("Portfolio")
+    # One page of accounts is looked up per rerun; a rerun never fetches the whole registry
+    page_count = max(1, -(-len(registry) // PORTFOLIO_PAGE_SIZE))
+    page = st.number_input(f"Page (of {page_count:,})", min_value=1, max_value=page_count, value=1, step=1, key="portfolio_page") if page_count > 1 else 1
+    records, _ = registry.page("", int(page) - 1, PORTFOLIO_PAGE_SIZE)
+    portfolio = get_account_balances_sdk(client, [record.address for record in records], cache)
+    failed = [row for row in portfolio if row["error"]]
+
+    if page_count == 1:
+        totals = portfolio_totals(portfolio) # Every account is on this page
+    else:
+        if st.button(f"Σ Compute totals for all {len(registry):,} accounts", key="portfolio_totals_btn"):
+            with st.spinner(f"Looking up {len(registry):,} accounts..."):
+                totals = portfolio_totals(get_account_balances_sdk(client, registry.addresses(), cache))
+            st.session_state.portfolio_totals = dict(totals, height=client.best_height)
+        totals = st.session_state.get("portfolio_totals")
+    col_total, col_vested, col_count = st.columns(3)
+    if totals:
+        col_total.metric("Total Balance (Testnet XEM)", f"{totals['balance']:,.6f}")
+        col_vested.metric("Total Vested (Testnet XEM)", f"{totals['vested_balance']:,.6f}")
+        col_count.metric("Accounts", f"{totals['accounts']:,}")
+        if page_count > 1:
+            st.caption(f"Totals as of block {totals['height'] or '?'}; press the button again to update them."
+                       + (f" {totals['failed']:,} account(s) could not be looked up." if totals["failed"] else ""))
+    else:
+        col_count.metric("Accounts", f"{len(registry):,}")
+        st.caption("Totals over every account are computed on demand; this page lists balances for its accounts only.")
+    st.dataframe(
+        portfolio,
+        hide_index=True,
+        column_config={
+            "balance": st.column_config.NumberColumn("Balance (XEM)", format="%.6f"),
+            "vested_balance": st.column_config.NumberColumn("Vested (XEM)", format="%.6f"),
+            "importance": st.column_config.NumberColumn("Importance", format="%.8f"),
+        },
+    )
+    if failed:
+        st.warning(f"{len(failed)} account(s) could not be looked up; see the error column.", icon="⚠️")
 
 
 # --- Streamlit App ---
+if METRICS_PORT:
+    start_metrics_endpoint(int(METRICS_PORT))
+requests_at_start = nem_metrics.REGISTRY.total("nem_request_seconds")
 st.title(" Krypto NEM (XEM) Testnet Interaction Demo")
 st.caption("Interacts with the **NEM Testnet**. Transactions are real but use valueless test XEM.")
 st.warning("⚠️ **Security Risk:** Never enter real mainnet private keys here. Testnet keys generated are stored temporarily in session state for convenience, which is insecure for real applications.")
@@ -220,204 +533,73 @@ st.markdown("---")
 
 # --- Initialize Session State ---
 if 'accounts' not in st.session_state:
-    st.session_state.accounts = [] # Stores dicts: {"address": str, "public_key": str, "key_pair": KeyPair_object} - **Storing KeyPair is insecure!**
+    st.session_state.accounts = AccountRegistry(TESTNET) # Key-holding and watch-only accounts - **Storing private keys is insecure!**
 if 'selected_address' not in st.session_state:
     st.session_state.selected_address = None
-if 'selected_node' not in st.session_state:
-     st.session_state.selected_node = DEFAULT_TESTNET_NODE
+if 'selected_nodes' not in st.session_state:
+     st.session_state.selected_nodes = "\n".join(TESTNET_NODE_URLS)
+if 'viewer_id' not in st.session_state:
+    st.session_state.viewer_id = uuid.uuid4().hex # This session's share of the live-update subscriptions
 
 # --- Sidebar ---
 with st.sidebar:
     st.header("Network")
-    st.session_state.selected_node = st.text_input("Testnet Node URL", st.session_state.selected_node)
-    # Get client only once per run based on selected node
-    client = get_nem_client(st.session_state.selected_node)
-
-    if client and SDK_AVAILABLE: # Only show success if SDK is loaded and client initialized
-         # Add a more concrete check if possible with your SDK, e.g. fetching node time
-         try:
-              # node_time = client.get_node_time() # Example SDK call
-              st.success(f"🟢 Connected (Client initialized for {st.session_state.selected_node})")
-         except Exception as e:
-              st.error(f"🔴 Node Check Failed: {e}")
-              client = None # Invalidate client if check fails
-    elif SDK_AVAILABLE and not client:
-        st.error("🔴 Connection failed. Check Node URL or network.")
-    # If SDK not available, the error is shown during import time
+    st.session_state.selected_nodes = st.text_area("Testnet Node Pool (one URL per line)", st.session_state.selected_nodes)
+    node_urls = tuple(url.strip() for url in st.session_state.selected_nodes.splitlines() if url.strip())
+    # Get the pool only once per node list; health comes from the background prober, not from this run
+    client = get_nem_client(node_urls) if node_urls else None
+    cache = get_height_cache(node_urls) if client else None
+    live = get_live_updates(node_urls) if client else None
+    tracker = get_tracker(node_urls) if client else None
+
+    if client:
+         render_node_status(client, live)
+    else:
+        st.error("🔴 No usable node pool. Check the node URLs.")
 
     st.markdown("---")
-    st.header("Testnet Accounts")
-    st.info("ℹ️ Get free Testnet XEM from a [NEM Testnet Faucet](https://nemfaucet.utazukin.com/) (external link, search for others if down).")
-
-
-    if st.button("🔑 Generate New Testnet Account"):
-        if not SDK_AVAILABLE:
-            st.error("Cannot generate account without SDK.")
-        else:
-             with st.spinner("Generating keys..."):
-                 account = generate_testnet_account()
-                 new_account_data = {
-                     "address": account['address'],
-                     "public_key": account['public_key'],
-                     "private_key": account['private_key']
-                 }
-                 st.session_state.accounts.append(new_account_data)
-                 st.session_state.selected_address = account['address']
-                 st.success(f"Generated Account: {account['address'][:8]}...")
-                 st.code(f"Address: {account['address']}\nPublic Key: {account['public_key']}\nPrivate Key: {account['private_key']}\n\n--- !!! SAVE PRIVATE KEY SECURELY !!! ---", language=None)
-                 # Don't rerun here, allow user to copy the key first
-                 # st.rerun() # Removed rerun
-
-
-    if st.session_state.accounts:
-        account_options = {acc["address"]: f"{acc['address'][:8]}..." for acc in st.session_state.accounts}
-        current_selection_index = 0
-        # Safely get the current selection index
-        if st.session_state.selected_address in account_options:
-            current_selection_index = list(account_options.keys()).index(st.session_state.selected_address)
-        else:
-             # If selected address is no longer valid (e.g., state reset issue), default to first
-             if account_options:
-                  st.session_state.selected_address = list(account_options.keys())[0]
-                  current_selection_index = 0
-             else: # No accounts exist
-                 st.session_state.selected_address = None
-
-
-        selected_key = st.selectbox(
-            "Select Account:",
-            options=list(account_options.keys()),
-            format_func=lambda x: account_options.get(x, "N/A"), # Use .get for safety
-            index=current_selection_index,
-            key="account_selector_real"
-        )
-        # Update state only if selection changed
-        if selected_key != st.session_state.selected_address:
-             st.session_state.selected_address = selected_key
-             # Clear caches when account changes, forces refresh of balance/history for new account
-             get_account_balance_sdk.clear()
-             get_transaction_history_sdk.clear()
-             st.rerun() # Rerun immediately on selection change
-    else:
-        st.write("No testnet accounts generated yet.")
+    render_accounts_sidebar(client, cache)
 
 # --- Main Area ---
-selected_account_data = None
-selected_key_pair = None # Store the keypair object for the selected account
-if st.session_state.selected_address:
-    for acc in st.session_state.accounts:
-        if acc["address"] == st.session_state.selected_address:
-            selected_account_data = acc
-            # selected_key_pair = acc.get("key_pair") # Use .get for safety
-            break
+# Dictionary lookup in the registry; the key pair is derived once per account, not on every rerun
+selected_account_data = st.session_state.accounts.get(st.session_state.selected_address)
+selected_key_pair = selected_account_data.key_pair if selected_account_data else None # None for watch-only accounts
 
 if not selected_account_data or not client:
-    if not client and SDK_AVAILABLE:
+    if not client:
         st.error("🔴 Cannot proceed: Failed to connect to the selected Testnet node. Please check the URL and your connection.")
     else:
         st.info("👈 Please select/generate an account and ensure a valid Testnet Node is entered in the sidebar.")
 
 else:
-    # Make sure key_pair is loaded if account is selected (handle potential state loss)
-    if not selected_key_pair:
-        st.error("⚠️ Critical Error: Key pair for selected account is missing from session state. Please regenerate the account.")
-    else:
-        tab1, tab2, tab3 = st.tabs(["📊 Account Info", "💸 Send Testnet XEM", "📜 Transaction History"])
-
-        with tab1:
-            st.subheader(f"Account Details: `{selected_account_data['address'][:8]}...`")
-            address = selected_account_data['address']
-            st.code(f"Full Address: {address}", language=None)
-            st.code(f"Public Key: {selected_account_data['public_key']}", language=None)
-            st.info(f"ℹ️ To receive funds, use the address above. Fund via a [Testnet Faucet](https://nemfaucet.utazukin.com/).")
-
-            st.markdown("---")
-            st.subheader("Balance")
-            if st.button("🔄 Refresh Balance", key="refresh_balance_btn"):
-                # Clear cache for this specific account before fetching
-                 get_account_balance_sdk.clear()
-
-            # Fetch and display balance
-            balance = get_account_balance(address) # Pass client for caching check
-            st.metric("Balance (Testnet XEM)", f"{balance:.6f}")
-            if balance == 0 and SDK_AVAILABLE: # Only show warning if SDK is supposed to be working
-                 st.warning("Account might be empty or not yet seen by the network. Fund it via a Faucet.")
-
-        with tab2:
-            st.subheader("Create Testnet Transaction")
-
-            # Allow sending to any address (must be validated by SDK/network)
-            recipient_address_input = st.text_input("Recipient Testnet Address (starts with T)")
-            amount_to_send = st.number_input("Amount (Testnet XEM)", min_value=0.000001, step=0.1, format="%.6f")
-            message_input = st.text_input("Message (Optional)")
-
-            st.caption("Transaction fees will be deducted automatically by the network.")
-
-            if st.button("🚀 Send Testnet XEM", key="send_xem_btn"):
-                if not selected_key_pair:
-                     st.error("❌ Cannot send: Selected account's key pair not found.")
-                elif not recipient_address_input:
-                     st.error("❌ Please enter a recipient address.")
-                elif amount_to_send <= 0:
-                     st.error("❌ Please enter a positive amount.")
-                else:
-                    with st.spinner("📡 Preparing and sending transaction to Testnet..."):
-                        tx_hash, error_msg = send_transaction_sdk(
-                            client,
-                            selected_key_pair, # Send the keypair object
-                            recipient_address_input,
-                            amount_to_send,
-                            message_input
-                        )
-
-                    if tx_hash:
-                        st.success(f"✅ Transaction announced to the network!")
-                        st.caption("It may take a minute or two to confirm.")
-                        st.code(f"Transaction Hash: {tx_hash}", language=None)
-                        # Provide link to a Testnet explorer (replace with a real one if known)
-                        explorer_url = f"http://bob.nem.ninja:8765/transaction/{tx_hash}" # Example explorer, CHECK IF VALID
-                        st.markdown(f"[View on Testnet Explorer (Example Link)]({explorer_url})", unsafe_allow_html=True)
-                        st.balloons()
-                        # Clear balance cache after sending TO update UI potentially faster
-                        # It won't reflect instantly, but next refresh will be sooner
-                        get_account_balance_sdk.clear()
-                        get_transaction_history_sdk.clear() # Also clear history cache
-                    else:
-                        st.error(f"❌ Transaction Failed: {error_msg}")
-
-        with tab3:
-            st.subheader("Testnet Transaction History")
-            address = selected_account_data['address']
-
-            if st.button("🔄 Refresh History", key="refresh_history_btn"):
-                 get_transaction_history_sdk.clear()
-
-            # Fetch and display history
-            history = get_transaction_history_sdk(client, address)
-
-            if not history:
-                st.info("No transaction history found for this account on the selected node, or account is new.")
-            else:
-                st.write(f"Found {len(history)} transactions (showing latest):")
-                for tx in history[:20]: # Show latest 20 to avoid clutter
-                    ts_str = tx['timestamp'].strftime('%Y-%m-%d %H:%M:%S UTC') if isinstance(tx.get('timestamp'), datetime.datetime) else 'N/A'
-                    tx_hash_short = str(tx.get('hash', 'N/A'))[:8] + "..." + str(tx.get('hash', 'N/A'))[-4:] if tx.get('hash') != 'N/A' else 'N/A'
-                    explorer_link = f"http://bob.nem.ninja:8765/transaction/{tx.get('hash', '')}" # Example explorer
-
-                    # Determine direction
-                    direction_info = ""
-                    if tx.get("sender") == address:
-                        direction_info = f"➖ **Sent:** `{tx.get('amount', 0):.4f}` XEM to `{str(tx.get('recipient', 'N/A'))[:8]}...`"
-                    elif tx.get("recipient") == address:
-                         direction_info = f"➕ **Received:** `{tx.get('amount', 0):.4f}` XEM from `{str(tx.get('sender', 'N/A'))[:8]}...`"
-                    else: # Should not happen if filtered correctly by SDK, but good to have a fallback
-                         direction_info = f"ℹ️ **Other:** Type `{tx.get('type', 'N/A')}` involving this address."
-
-                    # Construct display string
-                    st.markdown(direction_info)
-                    st.caption(f"   *Time:* {ts_str} | *Fee:* {tx.get('fee', 0):.4f} XEM | *Hash:* [{tx_hash_short}]({explorer_link})")
-
-                    if tx.get('message'):
-                         # Use st.text or st.code for message to prevent markdown interpretation
-                         st.code(f"   Message: {tx['message']}", language=None)
-                    st.markdown("---") # Separator
\ No newline at end of file
+    if live:
+        # Subscribe before drawing, and remember which events the page shows
+        live_address = normalize_address(selected_account_data.address)
+        live.watch(st.session_state.viewer_id, [live_address])
+        st.session_state.live_drawn = (live_address, live.version(live_address))
+
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Account Info", "💸 Send Testnet XEM", "📜 Transaction History", "💼 Portfolio"])
+
+    with tab1:
+        st.subheader(f"Account Details: `{selected_account_data.address[:8]}...`")
+        address = selected_account_data.address
+        st.code(f"Full Address: {address}", language=None)
+        st.code(f"Public Key: {selected_account_data.public_key or 'unknown (watch-only account)'}", language=None)
+        st.info(f"ℹ️ To receive funds, use the address above. Fund via a [Testnet Faucet](https://nemfaucet.utazukin.com/).")
+
+        st.markdown("---")
+        render_balance(client, cache, live, address)
+
+    with tab2:
+        render_send_tab(client, cache, tracker, selected_account_data, selected_key_pair)
+
+    with tab3:
+        render_history_tab(client, cache, selected_account_data)
+
+    with tab4:
+        render_portfolio_tab(client, cache)
+
+    if live:
+        watch_live_updates(live, live_address)
+
+render_diagnostics(requests_at_start)
@@ -0,0 +1,73 @@
+"""NEM (NIS1) node access, keys, addresses, history, caching and decoding.
+
+Nothing in this package imports Streamlit; the apps are thin front-ends over
+it. Submodules are loaded on first attribute access (PEP 562), so
+``import nem`` costs almost nothing and ``nem.normalize_address`` loads only
+the address and crypto modules. Heavy dependencies are deferred the same way:
+``requests`` is imported on the first node call, NumPy only with
+``nem.columns`` / ``nem.index``, and ``http.server`` only when a metrics
+endpoint or stand-in node is started::
+
+    import nem
+
+    client = nem.NodePool(["http://bob.nem.ninja:7778"]).start()
+    rows = nem.fetch_account_rows(client, addresses)
+
+``python -m nem`` resolves addresses or transaction hashes in bulk from the
+command line (see ``nem.lookup``).
+"""
+import importlib
+
+SUBMODULES = (
+    "accounts", "address", "archive", "bench", "blocks", "cache", "client", "columns", "crypto", "flow", "history",
+    "index", "lookup", "metrics", "mock", "nodes", "registry", "standin", "stream", "synthetic", "tracker", "transactions", "wallet",
+)
+
+_EXPORTS = { # name -> submodule defining it
+    # Node access
+    "NisClient": "client", "NisError": "client", "TRANSFERS_PAGE_SIZE": "client",
+    "NodePool": "nodes", "fan_out": "nodes",
+    "SingleFlight": "flow", "TokenBucket": "flow",
+    "HeightCache": "cache",
+    "ResponseArchive": "archive", "ArchivedApi": "archive", "DEFAULT_ARCHIVE_PATH": "archive",
+    "get_stream": "stream", "get_pool_stream": "stream", "LiveUpdates": "stream",
+    "fetch_account_rows": "accounts", "account_row": "accounts",
+    # Keys and addresses
+    "MAINNET": "crypto", "TESTNET": "crypto", "KeyPair": "crypto", "generate_keypairs": "crypto",
+    "Address": "address", "InvalidAddress": "address", "normalize_address": "address",
+    # History
+    "NEM_EPOCH": "history", "NEM_EPOCH_UNIX": "history", "TRANSFER_TYPE": "history", "nem_datetime": "history",
+    "transfer_record": "history", "parse_transfer": "history",
+    "TransferColumns": "columns",
+    "TransactionIndex": "index", "DEFAULT_INDEX_PATH": "index",
+    # Transactions and blocks
+    "minimum_fee": "transactions", "nem_timestamp": "transactions", "send_batch": "transactions",
+    "PendingTracker": "tracker",
+    "decode_block": "blocks", "decode_transaction": "blocks", "decode_message": "blocks",
+    "iter_blocks": "blocks", "iter_transactions": "blocks", "transaction_type_name": "blocks",
+    # Account operations
+    "generate_account": "wallet", "account_balance": "wallet", "account_balances": "wallet",
+    "send_transfer": "wallet", "parse_batch_lines": "wallet",
+    "transfer_history": "wallet", "transfer_history_page": "wallet", "index_full_history": "wallet",
+    "AccountRegistry": "registry", "AccountRecord": "registry",
+    "resolve_all": "lookup",
+    # Offline data
+    "SyntheticChain": "synthetic", "get_mock_data": "mock",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBMODULES) | set(__all__))
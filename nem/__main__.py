@@ -0,0 +1,7 @@
+"""``python -m nem``: bulk lookups from the command line (see ``nem.lookup``)."""
+import sys
+
+from .lookup import main
+
+if __name__ == "__main__":
+    sys.exit(main())
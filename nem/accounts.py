@@ -0,0 +1,40 @@
+"""Batched account lookups.
+
+``fetch_account_rows`` resolves many addresses at once with bounded
+concurrency. Lookups go through the same ``HeightCache`` kind ("account") as
+single balance checks, so a portfolio view and a balance tab never fetch the
+same account twice within a block.
+"""
+import functools
+
+from .nodes import fan_out
+
+MAX_CONCURRENT_LOOKUPS = 8 # Keep public nodes from throttling us
+
+
+def account_row(address, account_info=None, error=None):
+    """Flatten a NIS AccountMetaDataPair into a table row (XEM units)."""
+    account = (account_info or {}).get("account") or {}
+    return {
+        "address": address,
+        "balance": account.get("balance", 0) / 1_000_000.0,
+        "vested_balance": account.get("vestedBalance", 0) / 1_000_000.0,
+        "importance": account.get("importance", 0.0),
+        "error": str(error) if error else None,
+    }
+
+
+def _lookup(client, cache, address):
+    if cache is None:
+        return client.account_get(address)
+    return cache.get_or_fetch("account", address, lambda: client.account_get(address))
+
+
+def fetch_account_rows(client, addresses, cache=None, max_workers=MAX_CONCURRENT_LOOKUPS):
+    """Return one ``account_row`` per address (input order); failed lookups carry ``error`` instead of raising."""
+    unique = list(dict.fromkeys(addresses))
+    jobs = {address: functools.partial(_lookup, client, cache, address) for address in unique}
+    rows = {}
+    for address, info, error, _ in fan_out(jobs, max_workers=max_workers):
+        rows[address] = account_row(address, info, error)
+    return [rows[address] for address in addresses]
@@ -0,0 +1,111 @@
+"""Checksum-validated NIS1 addresses.
+
+An ``Address`` holds the 25 decoded bytes (network byte, 20-byte account hash,
+4-byte checksum) and compares on them, so dashed, plain, upper and lower case
+spellings of the same address are equal. Parsing is memoized in an LRU cache:
+repeated normalization of the same string (history rows, sidebar lists) costs
+a dictionary lookup instead of a base32 decode and a Keccak checksum.
+"""
+import base64
+import functools
+
+from .crypto import MAINNET, TESTNET, address_bytes_from_public_key, keccak_256
+
+ADDRESS_LENGTH = 40 # Base32 characters in a plain address
+NORMALIZE_CACHE_SIZE = 65536
+NETWORK_NAMES = {MAINNET: "mainnet", TESTNET: "testnet"}
+
+
+class InvalidAddress(ValueError):
+    """Raised for strings that are not a well-formed NIS1 address."""
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _decode(text):
+    if not isinstance(text, str):
+        raise InvalidAddress(f"Address must be a string, got {type(text).__name__}")
+    plain = text.strip().upper().replace("-", "")
+    if len(plain) != ADDRESS_LENGTH:
+        raise InvalidAddress(f"Address must be {ADDRESS_LENGTH} characters without dashes, got {len(plain)}")
+    try:
+        raw = base64.b32decode(plain)
+    except ValueError as e:
+        raise InvalidAddress("Address is not valid base32") from e
+    if raw[0] not in NETWORK_NAMES:
+        raise InvalidAddress(f"Unknown network byte {raw[0]:#04x}")
+    if keccak_256(raw[:21])[:4] != raw[21:]:
+        raise InvalidAddress("Address checksum does not match")
+    return raw
+
+
+class Address:
+    """A parsed NIS1 address, e.g. ``Address("TALICE-...")`` or ``Address.from_public_key(pk)``."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, address, network=None):
+        if isinstance(address, Address):
+            raw = address.raw
+        elif isinstance(address, (bytes, bytearray)):
+            raw = bytes(address)
+            if len(raw) != 25 or raw[0] not in NETWORK_NAMES or keccak_256(raw[:21])[:4] != raw[21:]:
+                raise InvalidAddress("Not a valid 25-byte address")
+        elif isinstance(address, str):
+            raw = _decode(address)
+        else: # Checked here as well: unhashable input would fail in _decode's cache before its own check
+            raise InvalidAddress(f"Address must be a string, bytes or Address, got {type(address).__name__}")
+        if network is not None and raw[0] != network:
+            raise InvalidAddress(f"Address is for {NETWORK_NAMES[raw[0]]}, expected {NETWORK_NAMES.get(network, network)}")
+        self.raw = raw
+
+    @classmethod
+    def from_public_key(cls, public_key_hex, network=TESTNET):
+        return cls(address_bytes_from_public_key(public_key_hex, network))
+
+    @staticmethod
+    def is_valid(address, network=None):
+        try:
+            Address(address, network)
+        except InvalidAddress:
+            return False
+        return True
+
+    @property
+    def network(self):
+        return self.raw[0]
+
+    @property
+    def plain(self):
+        """Upper-case form without dashes, as NIS expects in requests."""
+        return base64.b32encode(self.raw).decode("ascii")
+
+    @property
+    def pretty(self):
+        """Dashed form in groups of six, as wallets display it."""
+        plain = self.plain
+        return "-".join(plain[i:i + 6] for i in range(0, ADDRESS_LENGTH, 6))
+
+    def __str__(self):
+        return self.plain
+
+    def __repr__(self):
+        return f"Address({self.pretty!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, Address):
+            return self.raw == other.raw
+        if isinstance(other, str):
+            try:
+                return self.raw == _decode(other)
+            except InvalidAddress:
+                return False
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.raw)
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_address(address):
+    """Plain form of any spelling of a valid address; raises ``InvalidAddress`` otherwise."""
+    return base64.b32encode(_decode(address)).decode("ascii")
@@ -0,0 +1,181 @@
+"""On-disk cache for node responses that can no longer change.
+
+A transaction or block buried more than ``FINALITY_DEPTH`` blocks deep is
+final: NIS never rolls back further than that, so its response is stored
+without any expiry. Entries live in one SQLite file (WAL mode, so every
+worker process shares it), keyed by the SHA-256 of method, endpoint and
+canonical JSON parameters, and hold zlib-compressed JSON. When the file's
+payload grows past ``max_bytes`` the least recently used entries are
+evicted.
+
+``ArchivedApi`` puts the archive in front of any ``NisApi`` (usually a
+``NodePool``)::
+
+    pool = NodePool(urls).start()
+    api = ArchivedApi(pool, ResponseArchive("nem_responses.sqlite3"), lambda: pool.best_height)
+    api.transaction_get(tx_hash) # From disk once the transaction is final
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+from . import metrics
+from .client import NisApi
+from .flow import request_key
+
+DEFAULT_ARCHIVE_PATH = "nem_responses.sqlite3"
+FINALITY_DEPTH = 360 # NIS rollback limit: blocks deeper than this never change
+MAX_BYTES = 256 * 1024 * 1024 # Compressed payload kept on disk
+PRUNE_TARGET = 0.9 # Eviction frees space down to this fraction of max_bytes; writing the rest triggers a size check
+TOUCH_INTERVAL = 60.0 # Seconds; a hit refreshes last_used at most this often
+COMPRESSION_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key BLOB PRIMARY KEY,
+    kind TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_by_last_used ON responses (last_used);
+"""
+
+
+def _block_list_height(result):
+    return max((entry["block"]["height"] for entry in result.get("data", ())), default=None)
+
+
+# path -> (kind, height the request asks about or None, highest height in the response)
+IMMUTABLE = {
+    "/transaction/get": ("transaction", lambda params, body: None, lambda result: result["meta"]["height"]),
+    "/block/at/public": ("block", lambda params, body: body["height"], lambda result: result["height"]),
+    "/local/chain/blocks-after": ("blocks", lambda params, body: body["height"] + 1, _block_list_height),
+}
+
+
+def response_key(method, path, params=None, body=None):
+    """SHA-256 of method, endpoint and parameters in canonical (sorted, compact) JSON."""
+    return hashlib.sha256(request_key(method, path, params, body).encode()).digest()
+
+
+class ResponseArchive:
+    """Size-bounded LRU of final responses in SQLite, e.g. ``ResponseArchive("nem_responses.sqlite3")``.
+
+    Safe to share between threads; several processes may open the same path.
+    """
+
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._written = 0 # Bytes stored by this process since the last size check
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10.0) # Waits for other processes' writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self.prune()
+
+    def close(self):
+        self._db.close()
+
+    def get(self, key, kind="response"):
+        """The stored response for ``key`` (see ``response_key``), or ``None``."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT body, last_used FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > TOUCH_INTERVAL:
+                with self._db:
+                    self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        metrics.inc("nem_cache_events_total", cache="archive", kind=kind, event="miss" if row is None else "hit")
+        if row is None:
+            return None
+        with metrics.timed("nem_parse_seconds", stage="archive"):
+            return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key, value, kind="response"):
+        """Store a final response; it is only removed again by LRU eviction."""
+        body = zlib.compress(json.dumps(value, separators=(",", ":")).encode(), COMPRESSION_LEVEL)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, kind, body, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, body, len(body), time.time()),
+            )
+            self._written += len(body)
+            due = self._written >= self.max_bytes * (1 - PRUNE_TARGET)
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Evict least recently used entries until the payload fits ``max_bytes``; returns how many were evicted."""
+        with self._lock:
+            self._written = 0
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            target = self.max_bytes * PRUNE_TARGET
+            evicted = []
+            with self._db:
+                for key, kind, size in self._db.execute("SELECT key, kind, size FROM responses ORDER BY last_used").fetchall():
+                    if total <= target:
+                        break
+                    evicted.append((key, kind))
+                    total -= size
+                self._db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key, _ in evicted])
+        for _, kind in evicted:
+            metrics.inc("nem_cache_events_total", cache="archive", kind=kind, event="eviction")
+        return len(evicted)
+
+    def stats(self):
+        """``{"entries", "bytes", "max_bytes"}`` of the whole file (all processes' entries)."""
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+
+class ArchivedApi(NisApi):
+    """``NisApi`` that serves final transactions and blocks from a ``ResponseArchive`` and passes everything else on.
+
+    ``height_source`` returns the current best height (or ``None`` while it
+    is unknown, in which case nothing new is stored). Attributes of the
+    wrapped API, such as a pool's ``best_height`` or ``status()``, stay
+    reachable through the wrapper.
+    """
+
+    def __init__(self, api, archive, height_source, finality_depth=FINALITY_DEPTH):
+        self.api = api
+        self.archive = archive
+        self.height_source = height_source
+        self.finality_depth = finality_depth
+
+    def __repr__(self):
+        return f"ArchivedApi({self.api!r})"
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+    def request(self, method, path, params=None, body=None, timeout=None):
+        rule = IMMUTABLE.get(path)
+        if rule is None:
+            return self.api.request(method, path, params=params, body=body, timeout=timeout)
+        kind, requested_height, response_height = rule
+        tip = self.height_source()
+        asked = requested_height(params, body)
+        if tip is not None and asked is not None and asked > tip - self.finality_depth:
+            return self.api.request(method, path, params=params, body=body, timeout=timeout) # Too recent to be stored
+        key = response_key(method, path, params, body)
+        cached = self.archive.get(key, kind)
+        if cached is not None:
+            return cached
+        result = self.api.request(method, path, params=params, body=body, timeout=timeout)
+        height = response_height(result)
+        if tip is not None and height is not None and height <= tip - self.finality_depth:
+            self.archive.put(key, result, kind)
+        return result
@@ -0,0 +1,329 @@
+"""Benchmarks for the data paths, with baseline regression checks.
+
+Each benchmark times one operation over a fixed batch (``ops`` per run),
+repeated ``--repeat`` times. The best per-operation time is what gets
+compared, as ``timeit`` recommends, since slower runs measure interference.
+Results are written as JSON, and when a baseline file exists every benchmark
+in both is compared against it: the run exits with status 1 if any benchmark
+is slower than the baseline by more than ``--threshold``.
+
+    python -m nem.bench                          # run all, compare with nem_bench_baseline.json
+    python -m nem.bench --save-baseline          # run all and store the result as the new baseline
+    python -m nem.bench -k history -k address    # only benchmarks whose name contains one of these
+    python -m nem.bench --output results.json --threshold 0.10
+
+Baselines are machine specific; record one on the machine that runs the
+comparison. Client benchmarks talk to an in-process ``nem.standin`` node
+with no injected latency, so they measure the client, not the network.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from . import address as nem_address
+from .accounts import fetch_account_rows
+from .archive import ArchivedApi, ResponseArchive
+from .address import normalize_address
+from .blocks import decode_block, decode_message
+from .client import NisClient
+from .columns import TransferColumns
+from .history import COLUMNS, history_row, transfer_record
+from .index import TransactionIndex
+from .mock import MOCK_EXAMPLE_ADDRESS, SYNTHETIC_CHAIN, get_mock_data
+from .nodes import NodePool
+from .standin import start_standin
+
+DEFAULT_BASELINE = "nem_bench_baseline.json"
+DEFAULT_THRESHOLD = 0.25 # Fail when more than 25% slower than the baseline
+DEFAULT_REPEAT = 5
+
+BENCHMARKS = {} # name -> setup(); setup returns (run, ops[, cleanup]) where run() does ``ops`` operations
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _synthetic_items(count, start=1_000_000):
+    return [SYNTHETIC_CHAIN.transaction(n) for n in range(start, start + count)]
+
+
+def _synthetic_addresses(count, start=1000):
+    return [SYNTHETIC_CHAIN.address(i) for i in range(start, start + count)]
+
+
+# --- Mock data ---
+@benchmark("mock.fixture_lookup")
+def _():
+    address = normalize_address(MOCK_EXAMPLE_ADDRESS)
+    return lambda: [get_mock_data("/account/get", {"address": address}) for _ in range(10_000)], 10_000
+
+
+@benchmark("mock.synthetic_account")
+def _():
+    addresses = _synthetic_addresses(1000)
+    for address in addresses:
+        normalize_address(address) # Warm the address parse cache; this measures the chain, not base32
+    return lambda: [get_mock_data("/account/get", {"address": a}) for a in addresses], 1000
+
+
+@benchmark("mock.synthetic_transfers_page")
+def _():
+    addresses = _synthetic_addresses(100)
+    return lambda: [get_mock_data("/account/transfers/all", {"address": a}) for a in addresses], 100
+
+
+# --- History parsing ---
+@benchmark("history.flatten_items")
+def _():
+    items = _synthetic_items(10_000)
+    return lambda: [transfer_record(item) for item in items], 10_000
+
+
+@benchmark("history.columns_from_items")
+def _():
+    items = _synthetic_items(10_000)
+    return lambda: TransferColumns.from_items(items), 10_000
+
+
+@benchmark("history.row_dicts")
+def _():
+    records = [transfer_record(item) for item in _synthetic_items(10_000)]
+    return lambda: [history_row(dict(zip(COLUMNS, record))) for record in records], 10_000
+
+
+@benchmark("history.columns_totals_100k")
+def _():
+    records = [transfer_record(item) for item in _synthetic_items(10_000)] * 10
+    columns = TransferColumns.from_records(records)
+    address = records[0][5]
+    return lambda: columns.totals(address), 1
+
+
+@benchmark("history.index_query")
+def _():
+    scratch = tempfile.TemporaryDirectory(prefix="nem_bench_")
+    index = TransactionIndex(os.path.join(scratch.name, "index.sqlite3"))
+    address = SYNTHETIC_CHAIN.address(42)
+    records = [transfer_record(item) for item in _synthetic_items(5000)]
+    with index._db:
+        index._insert(address, records)
+
+    def cleanup():
+        index.close()
+        scratch.cleanup()
+    return lambda: index.history(address, limit=1000), 1000, cleanup
+
+
+# --- Decoding and conversion ---
+@benchmark("decode.plain_message")
+def _():
+    messages = [{"type": 1, "payload": f"payment reference {i} - cảm ơn".encode("utf-8").hex()} for i in range(10_000)]
+    return lambda: [decode_message(message) for message in messages], 10_000
+
+
+@benchmark("decode.block")
+def _():
+    chain = SYNTHETIC_CHAIN
+    blocks = []
+    for height in range(1000, 1100):
+        block = chain.block(height)
+        first = (height - 1) * chain.per_block
+        txes = [{"tx": tx, "hash": chain.transaction_hash(first + i), "innerHash": {}} for i, tx in enumerate(block["transactions"])]
+        blocks.append({"block": block, "hash": chain.block_hash(height), "txes": txes})
+    count = sum(len(block["txes"]) for block in blocks)
+    return lambda: [decode_block(block) for block in blocks], count
+
+
+@benchmark("epoch.scalar")
+def _():
+    rows = [{"amount": 1, "fee": 1, "timestamp": 100_000_000 + i} for i in range(10_000)]
+    return lambda: [history_row(row) for row in rows], 10_000
+
+
+@benchmark("epoch.vectorized")
+def _():
+    records = [transfer_record(item) for item in _synthetic_items(10_000)]
+    columns = TransferColumns.from_records(records)
+    return lambda: columns.datetimes, 10_000
+
+
+@benchmark("address.normalize_cached")
+def _():
+    addresses = [f"{a[:6]}-{a[6:12]}-{a[12:]}".lower() for a in _synthetic_addresses(1000)]
+    for address in addresses:
+        normalize_address(address)
+    return lambda: [normalize_address(a) for a in addresses], 1000
+
+
+@benchmark("address.normalize_uncached")
+def _():
+    addresses = _synthetic_addresses(200, start=500_000)
+
+    def run():
+        normalize_address.cache_clear()
+        nem_address._decode.cache_clear() # Parse cache behind Address() and normalize_address
+        return [normalize_address(a) for a in addresses]
+    return run, 200
+
+
+# --- Client end to end against a local stand-in ---
+_standin_url = None
+
+
+def _standin():
+    global _standin_url
+    if _standin_url is None:
+        _, _standin_url = start_standin()
+    return _standin_url
+
+
+@benchmark("client.account_get")
+def _():
+    client = NisClient(_standin())
+    address = SYNTHETIC_CHAIN.address(7)
+    return lambda: [client.account_get(address) for _ in range(200)], 200
+
+
+@benchmark("client.pool_account_get")
+def _():
+    pool = NodePool([_standin()], probe_interval=3600, rate_limit=None) # Measure routing, not pacing
+    pool.probe_all()
+    address = SYNTHETIC_CHAIN.address(7)
+    return lambda: [pool.account_get(address) for _ in range(200)], 200
+
+
+@benchmark("client.fetch_account_rows")
+def _():
+    client = NisClient(_standin())
+    addresses = _synthetic_addresses(100)
+    return lambda: fetch_account_rows(client, addresses), 100
+
+
+@benchmark("client.transfers_sync")
+def _():
+    client = NisClient(_standin())
+    addresses = _synthetic_addresses(20, start=2000)
+    scratch = tempfile.TemporaryDirectory(prefix="nem_bench_")
+
+    def run():
+        index = TransactionIndex(os.path.join(scratch.name, f"index-{time.perf_counter_ns()}.sqlite3"))
+        for address in addresses:
+            index.backfill(client, address, 30)
+        index.close()
+    return run, len(addresses), scratch.cleanup
+
+
+@benchmark("client.archived_transaction_get")
+def _():
+    client = NisClient(_standin())
+    scratch = tempfile.TemporaryDirectory(prefix="nem_bench_")
+    archive = ResponseArchive(os.path.join(scratch.name, "responses.sqlite3"))
+    api = ArchivedApi(client, archive, lambda: SYNTHETIC_CHAIN.height)
+    hashes = [SYNTHETIC_CHAIN.transaction_hash(n) for n in range(200)]
+    for tx_hash in hashes:
+        api.transaction_get(tx_hash) # Fill the archive; the timed runs are all disk hits
+
+    def cleanup():
+        archive.close()
+        scratch.cleanup()
+    return lambda: [api.transaction_get(tx_hash) for tx_hash in hashes], 200, cleanup
+
+
+# --- Runner ---
+def run_benchmarks(names, repeat=DEFAULT_REPEAT):
+    results = {}
+    for name in names:
+        run, ops, *cleanup = BENCHMARKS[name]()
+        try:
+            run() # Warm up caches, connections and lazy imports
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+        finally:
+            for close in cleanup: # Scratch databases and directories
+                close()
+        median = statistics.median(timings)
+        results[name] = {
+            "ops": ops,
+            "median_s": median,
+            "min_s": min(timings),
+            "per_op_us": min(timings) / ops * 1e6,
+            "ops_per_s": ops / min(timings) if min(timings) else None,
+        }
+        print(f"{name:32s} {results[name]['per_op_us']:12.2f} us/op  {results[name]['ops_per_s'] or 0:14,.0f} op/s")
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return ``[(name, ratio)]`` for benchmarks slower than the baseline by more than ``threshold``."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("per_op_us"):
+            continue
+        ratio = result["per_op_us"] / previous["per_op_us"]
+        marker = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:32s} {ratio:6.2f}x baseline {marker}")
+        if marker:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NEM data paths")
+    parser.add_argument("-k", dest="filters", action="append", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    names = [name for name in BENCHMARKS if not args.filters or any(f in name for f in args.filters)]
+    report = {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": run_benchmarks(names, args.repeat),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(report["results"], baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
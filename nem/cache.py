@@ -0,0 +1,89 @@
+"""Chain-height-aware cache for per-address node data.
+
+Each entry remembers the chain height it was fetched at and is only served
+while the chain is still at that height, so a new block makes every entry
+stale at once without a timer. Single addresses can be invalidated when a
+transaction touching them is announced or confirmed, leaving everyone else's
+entries in place.
+"""
+import threading
+from collections import OrderedDict
+
+from . import metrics
+
+MAX_ENTRIES = 4096
+
+
+class HeightCache:
+    """LRU of ``(kind, address) -> value`` valid for one chain height.
+
+    ``height_source`` is a callable returning the current best height (e.g. a
+    ``NodePool``'s probe result) or ``None`` while it is unknown; nothing is
+    served from the cache until a height is known.
+    """
+
+    def __init__(self, height_source, max_entries=MAX_ENTRIES, name="height"):
+        self.height_source = height_source
+        self.name = name # Label for this cache's metrics
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # (kind, address) -> (height, value)
+        self._height = None # Height the entries were last checked against
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_fetch(self, kind, address, fetch):
+        """Return the cached value for the current height, or call ``fetch()`` and cache its result."""
+        height = self.height_source()
+        key = (kind, address)
+        with self._lock:
+            if height != self._height:
+                self._drop_stale(height)
+            entry = self._entries.get(key)
+            if entry is not None and height is not None and entry[0] == height:
+                self._entries.move_to_end(key)
+                self._count(kind, "hit")
+                return entry[1]
+        self._count(kind, "miss")
+        value = fetch()
+        if height is not None:
+            with self._lock:
+                self._entries[key] = (height, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    (evicted_kind, _), _ = self._entries.popitem(last=False)
+                    self._count(evicted_kind, "eviction")
+        return value
+
+    def put(self, kind, address, value):
+        """Store ``value`` for the current height, e.g. account data pushed by the node."""
+        height = self.height_source()
+        if height is None:
+            return
+        with self._lock:
+            if height != self._height:
+                self._drop_stale(height)
+            self._entries[(kind, address)] = (height, value)
+            self._entries.move_to_end((kind, address))
+            while len(self._entries) > self.max_entries:
+                (evicted_kind, _), _ = self._entries.popitem(last=False)
+                self._count(evicted_kind, "eviction")
+
+    def _count(self, kind, event, amount=1):
+        metrics.inc("nem_cache_events_total", amount, cache=self.name, kind=kind, event=event)
+
+    def invalidate(self, *addresses):
+        """Drop every entry for the given addresses, e.g. sender and recipient of an announced transfer."""
+        targets = set(addresses)
+        with self._lock:
+            for key in [key for key in self._entries if key[1] in targets]:
+                del self._entries[key]
+                self._count(key[0], "invalidation")
+
+    def _drop_stale(self, height):
+        # A new block was seen: entries from other heights can never be served again
+        for key in [key for key, (h, _) in self._entries.items() if h != height]:
+            del self._entries[key]
+            self._count(key[0], "stale")
+        self._height = height
@@ -0,0 +1,186 @@
+"""Pooled NIS1 REST client.
+
+All clients in a process share one ``requests.Session`` so TCP connections to a
+node are kept alive and reused between calls instead of being re-established
+for every request. Every call takes an optional per-request ``timeout``.
+
+The asyncio interface is exposed through ``client.aio``: any endpoint method
+can be awaited there, e.g. ``await client.aio.chain_height()``. The calls run
+on a shared worker pool over the same connection pool.
+
+``requests`` and ``asyncio`` are imported on first use, not with this
+module, so code that only needs the constants or ``NisError`` starts without
+them.
+"""
+import abc
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+
+DEFAULT_TIMEOUT = (3.05, 10.0) # (connect, read) seconds
+POOL_CONNECTIONS = 16 # Number of distinct nodes kept in the pool
+POOL_MAXSIZE = 32 # Keep-alive connections per node
+TRANSFERS_PAGE_SIZE = 25 # NIS returns at most 25 transfers per page
+
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+
+class NisError(Exception):
+    """Raised when a node cannot be reached or answers with an error."""
+
+    def __init__(self, message, status=None, node_url=None):
+        super().__init__(message)
+        self.status = status
+        self.node_url = node_url
+
+    @property
+    def is_transport_error(self):
+        """True when the node did not answer at all (timeout, refused, reset)."""
+        return self.status is None
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+                _session = session
+    return _session
+
+
+def get_executor():
+    """Return the worker pool used by the asyncio interface."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=POOL_MAXSIZE, thread_name_prefix="nis")
+    return _executor
+
+
+class NisApi(abc.ABC):
+    """NIS1 endpoint methods on top of ``request(method, path, ...)``."""
+
+    @abc.abstractmethod
+    def request(self, method, path, params=None, body=None, timeout=None):
+        """Send one request and return the decoded JSON answer, raising ``NisError`` on failure."""
+
+    @property
+    def aio(self):
+        return _AsyncApi(self)
+
+    # --- Node ---
+    def heartbeat(self, timeout=None):
+        return self.request("GET", "/heartbeat", timeout=timeout)
+
+    def node_info(self, timeout=None):
+        return self.request("GET", "/node/info", timeout=timeout)
+
+    def chain_height(self, timeout=None):
+        return self.request("GET", "/chain/height", timeout=timeout)["height"]
+
+    def network_time(self, timeout=None):
+        """Node clock as ``{"sendTimeStamp", "receiveTimeStamp"}`` in milliseconds since the NEM epoch."""
+        return self.request("GET", "/time-sync/network-time", timeout=timeout)
+
+    # --- Blocks ---
+    def block_at(self, height, timeout=None):
+        """The block at ``height``; its transactions carry no hashes."""
+        return self.request("POST", "/block/at/public", body={"height": height}, timeout=timeout)
+
+    def blocks_after(self, height, timeout=None):
+        """Up to ten explorer blocks after ``height``, each with its transactions' hashes."""
+        return self.request("POST", "/local/chain/blocks-after", body={"height": height}, timeout=timeout)["data"]
+
+    # --- Accounts ---
+    def account_get(self, address, timeout=None):
+        return self.request("GET", "/account/get", params={"address": address}, timeout=timeout)
+
+    def account_transfers(self, address, direction="all", id=None, timeout=None):
+        """Return one page (newest first) of transfers; pass ``id`` to get the page after it."""
+        if direction not in ("all", "incoming", "outgoing"):
+            raise ValueError(f"Unknown transfer direction: {direction}")
+        params = {"address": address}
+        if id is not None:
+            params["id"] = id
+        return self.request("GET", f"/account/transfers/{direction}", params=params, timeout=timeout)["data"]
+
+    # --- Transactions ---
+    def transaction_get(self, tx_hash, timeout=None):
+        return self.request("GET", "/transaction/get", params={"hash": tx_hash}, timeout=timeout)
+
+    def announce_transaction(self, signed_tx, timeout=None):
+        """Announce a ``{"data": hex, "signature": hex}`` request; returns the NIS result."""
+        return self.request("POST", "/transaction/announce", body=signed_tx, timeout=timeout)
+
+
+class _AsyncApi:
+    """Awaitable view of a ``NisApi``; calls run on the shared worker pool."""
+
+    def __init__(self, api):
+        self._api = api
+
+    def __getattr__(self, name):
+        method = getattr(self._api, name)
+
+        async def call(*args, **kwargs):
+            import asyncio # Loaded by whoever runs the event loop; kept out of this module's import cost
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(get_executor(), functools.partial(method, *args, **kwargs))
+        return call
+
+
+class NisClient(NisApi):
+    """Client for a single NIS1 node, e.g. ``NisClient("http://bob.nem.ninja:7778")``."""
+
+    def __init__(self, node_url, timeout=DEFAULT_TIMEOUT):
+        self.url = node_url.rstrip("/")
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f"NisClient({self.url!r})"
+
+    def request(self, method, path, params=None, body=None, timeout=None):
+        session = get_session()
+        import requests # Already loaded by get_session(); a dictionary lookup from here on
+
+        started = time.perf_counter()
+        try:
+            response = session.request(
+                method, self.url + path, params=params, json=body,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+        except requests.RequestException as e:
+            metrics.inc("nem_request_errors_total", node=self.url, kind="transport")
+            raise NisError(f"{method} {path} failed: {e}", node_url=self.url) from e
+        finally:
+            metrics.observe("nem_request_seconds", time.perf_counter() - started, endpoint=path, method=method)
+
+        if response.status_code != 200:
+            metrics.inc("nem_request_errors_total", node=self.url, kind=str(response.status_code))
+            # NIS reports errors as {"timeStamp", "error", "message", "status"}
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            message = (body.get("message") if isinstance(body, dict) else None) or response.reason
+            raise NisError(f"{method} {path}: {message}", status=response.status_code, node_url=self.url)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise NisError(f"{method} {path}: invalid JSON response", status=response.status_code, node_url=self.url) from e
@@ -0,0 +1,171 @@
+"""Columnar transfer history.
+
+``TransferColumns`` keeps a history as one NumPy array per field instead of
+one dict per transfer: int64 ids, heights, amounts and fees (microXEM), int32
+NEM timestamps, and sender/recipient as int32 codes into a shared ``parties``
+dictionary. Unit conversion, timestamps, direction and totals are whole-array
+operations, and only the rows actually displayed are turned back into dicts.
+"""
+import numpy as np
+
+from . import metrics
+from .history import COLUMNS, NEM_EPOCH_UNIX, transfer_record
+
+NO_TIMESTAMP = -1 # Stored for transfers without a timestamp; shows as NaT
+
+
+def _encode(values, parties, index):
+    """Dictionary-encode strings to int32 codes, adding unseen ones to ``parties``/``index``."""
+    def code(value):
+        found = index.get(value)
+        if found is None:
+            found = index[value] = len(parties)
+            parties.append(value)
+        return found
+    return np.fromiter((code(value) for value in values), dtype=np.int32, count=len(values))
+
+
+class TransferColumns:
+    """A newest-first transfer history, e.g. ``TransferColumns.from_records(cursor.fetchall())``."""
+
+    __slots__ = ("id", "height", "hash", "type", "sender", "recipient", "amount", "fee", "timestamp", "message", "parties", "_index")
+
+    def __init__(self, id, height, hash, type, sender, recipient, amount, fee, timestamp, message, parties, index=None):
+        self.id = id
+        self.height = height
+        self.hash = hash
+        self.type = type
+        self.sender = sender # int32 codes into ``parties`` (signer public keys)
+        self.recipient = recipient # int32 codes into ``parties`` (addresses)
+        self.amount = amount
+        self.fee = fee
+        self.timestamp = timestamp
+        self.message = message
+        self.parties = parties
+        self._index = index if index is not None else {party: code for code, party in enumerate(parties)}
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from tuples in ``history.COLUMNS`` order, e.g. SQLite rows or ``transfer_record`` output."""
+        with metrics.timed("nem_parse_seconds", stage="columns"):
+            return cls._from_records(list(records))
+
+    @classmethod
+    def _from_records(cls, records):
+        if not records:
+            return cls.empty()
+        ids, heights, hashes, types, senders, recipients, amounts, fees, timestamps, messages = zip(*records)
+        parties, index = [], {}
+        timestamps = np.array(timestamps, dtype=np.float64) # None becomes NaN
+        return cls(
+            np.array(ids, dtype=np.int64),
+            np.array(heights, dtype=np.int64),
+            np.array(hashes, dtype=object),
+            np.array(types, dtype=np.int32),
+            _encode(senders, parties, index),
+            _encode(recipients, parties, index),
+            np.array(amounts, dtype=np.int64),
+            np.array(fees, dtype=np.int64),
+            np.where(np.isnan(timestamps), NO_TIMESTAMP, timestamps).astype(np.int32),
+            np.array(messages, dtype=object),
+            parties,
+            index,
+        )
+
+    @classmethod
+    def from_items(cls, items):
+        """Build from raw NIS TransactionMetaDataPairs."""
+        return cls.from_records(transfer_record(item) for item in items)
+
+    @classmethod
+    def empty(cls):
+        ints = np.empty(0, dtype=np.int64)
+        codes = np.empty(0, dtype=np.int32)
+        objects = np.empty(0, dtype=object)
+        return cls(ints, ints, objects, codes, codes, codes, ints, ints, codes, objects, [])
+
+    def __len__(self):
+        return len(self.id)
+
+    @property
+    def nbytes(self):
+        """Memory held by the arrays (object columns count their pointers only)."""
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    def take(self, selector):
+        """Rows picked by a slice, boolean mask or index array; shares the ``parties`` dictionary."""
+        return TransferColumns(*(getattr(self, name)[selector] for name in COLUMNS), self.parties, self._index)
+
+    # --- Vectorized views ---
+    @property
+    def amount_xem(self):
+        return self.amount / 1_000_000.0
+
+    @property
+    def fee_xem(self):
+        return self.fee / 1_000_000.0
+
+    @property
+    def datetimes(self):
+        """UTC ``datetime64[s]`` per transfer, NaT where the timestamp is missing."""
+        times = (self.timestamp.astype(np.int64) + NEM_EPOCH_UNIX).astype("datetime64[s]")
+        times[self.timestamp == NO_TIMESTAMP] = np.datetime64("NaT")
+        return times
+
+    def incoming(self, address):
+        """Boolean mask of transfers paying ``address`` (plain form); the rest were signed by it."""
+        code = self._index.get(address)
+        if code is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.recipient == code
+
+    def totals(self, address):
+        """Received, sent and fees paid in XEM plus transfer counts, as ``TransactionIndex.totals``."""
+        incoming = self.incoming(address)
+        outgoing = ~incoming
+        return {
+            "received": int(self.amount[incoming].sum()) / 1_000_000.0,
+            "incoming": int(incoming.sum()),
+            "sent": int(self.amount[outgoing].sum()) / 1_000_000.0,
+            "fees": int(self.fee[outgoing].sum()) / 1_000_000.0,
+            "outgoing": int(outgoing.sum()),
+        }
+
+    # --- Display ---
+    def table(self, address):
+        """Display columns (NumPy arrays) for one table element; nothing is converted row by row.
+
+        ``counterparty`` is the signer's public key for incoming transfers and
+        the recipient address for outgoing ones.
+        """
+        incoming = self.incoming(address)
+        parties = np.array(self.parties, dtype=object)
+        return {
+            "time": self.datetimes,
+            "direction": np.where(incoming, "in", "out"),
+            "amount": self.amount_xem,
+            "fee": self.fee_xem,
+            "counterparty": np.where(incoming, parties[self.sender], parties[self.recipient]),
+            "message": self.message,
+            "height": self.height,
+            "hash": self.hash,
+        }
+
+    def rows(self, address=None, start=0, stop=None):
+        """Dicts in display units for rows ``start:stop``; with ``address`` each row also gets ``incoming``."""
+        page = self.take(slice(start, stop))
+        columns = {
+            "id": page.id.tolist(),
+            "height": page.height.tolist(),
+            "hash": page.hash.tolist(),
+            "type": page.type.tolist(),
+            "sender": [page.parties[code] for code in page.sender.tolist()],
+            "recipient": [page.parties[code] for code in page.recipient.tolist()],
+            "amount": page.amount_xem.tolist(),
+            "fee": page.fee_xem.tolist(),
+            "timestamp": page.datetimes.astype(object).tolist(), # Naive UTC datetimes, None for NaT
+            "message": page.message.tolist(),
+        }
+        if address is not None:
+            columns["incoming"] = page.incoming(address).tolist()
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
@@ -0,0 +1,358 @@
+"""NIS1 keys, signatures and addresses.
+
+NIS1 uses the ed25519 curve with Keccak-512 in place of SHA-512, and derives
+addresses as base32(network byte + RIPEMD-160(Keccak-256(public key)) +
+4-byte checksum). Note that NEM's "SHA3" is the original Keccak padding, not
+the FIPS-202 SHA3 that ``hashlib.sha3_*`` implements, so Keccak is provided
+here in pure Python unless pycryptodome is installed.
+
+Private keys are written as big-endian hex (NIS's BigInteger form) and used
+as the reversed 32 bytes, matching NIS and the NanoWallet.
+
+``generate_keypairs`` / ``derive_keypairs`` spread bulk derivation over a
+process pool for creating thousands of test wallets per call.
+"""
+import base64
+import hashlib
+import os
+
+MAINNET = 0x68 # 104, addresses start with "N"
+TESTNET = 0x98 # 152 (-104 as a signed byte), addresses start with "T"
+NETWORKS = {"mainnet": MAINNET, "testnet": TESTNET}
+
+BULK_CHUNK_SIZE = 256 # Keypairs derived per worker task
+
+# --- Keccak ---
+_MASK64 = (1 << 64) - 1
+_ROUND_CONSTANTS = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+)
+_ROTATIONS = ( # _ROTATIONS[x][y]
+    (0, 36, 3, 41, 18), (1, 44, 10, 45, 2), (62, 6, 43, 15, 61), (28, 55, 25, 21, 56), (27, 20, 39, 8, 14),
+)
+# (source lane, destination lane, rotation) for the combined rho and pi steps
+_RHO_PI = tuple((x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5), _ROTATIONS[x][y]) for x in range(5) for y in range(5))
+
+
+def _keccak_f(lanes):
+    for rc in _ROUND_CONSTANTS:
+        c = [lanes[x] ^ lanes[x + 5] ^ lanes[x + 10] ^ lanes[x + 15] ^ lanes[x + 20] for x in range(5)]
+        d = [c[(x - 1) % 5] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63)) & _MASK64) for x in range(5)]
+        b = [0] * 25
+        for src, dst, rot in _RHO_PI:
+            lane = lanes[src] ^ d[src % 5]
+            b[dst] = ((lane << rot) | (lane >> (64 - rot))) & _MASK64 if rot else lane
+        lanes = [b[i] ^ (~b[i - i % 5 + (i + 1) % 5] & b[i - i % 5 + (i + 2) % 5]) for i in range(25)]
+        lanes[0] ^= rc
+    return lanes
+
+
+def _keccak(data, digest_size, pad=0x01):
+    rate = 200 - 2 * digest_size
+    padded = bytearray(data) + bytes([pad]) + bytes(-(len(data) + 1) % rate)
+    padded[-1] |= 0x80
+    lanes = [0] * 25
+    for offset in range(0, len(padded), rate):
+        for i in range(rate // 8):
+            lanes[i] ^= int.from_bytes(padded[offset + 8 * i:offset + 8 * i + 8], "little")
+        lanes = _keccak_f(lanes)
+    return b"".join(lane.to_bytes(8, "little") for lane in lanes)[:digest_size]
+
+
+try:
+    from Crypto.Hash import keccak as _keccak_backend # pycryptodome, much faster when installed
+
+    def keccak_256(data):
+        return _keccak_backend.new(data=data, digest_bits=256).digest()
+
+    def keccak_512(data):
+        return _keccak_backend.new(data=data, digest_bits=512).digest()
+except ImportError:
+    def keccak_256(data):
+        return _keccak(data, 32)
+
+    def keccak_512(data):
+        return _keccak(data, 64)
+
+
+# --- RIPEMD-160 ---
+try:
+    hashlib.new("ripemd160")
+
+    def ripemd160(data):
+        return hashlib.new("ripemd160", data).digest()
+except ValueError: # OpenSSL 3 builds may only ship it in the legacy provider
+    _RMD_KL = (0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E)
+    _RMD_KR = (0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000)
+    _RMD_ML = (
+        range(16),
+        (7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8),
+        (3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12),
+        (1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2),
+        (4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13),
+    )
+    _RMD_MR = (
+        (5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12),
+        (6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2),
+        (15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13),
+        (8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14),
+        (12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11),
+    )
+    _RMD_SL = (
+        (11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8),
+        (7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12),
+        (11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5),
+        (11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12),
+        (9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6),
+    )
+    _RMD_SR = (
+        (8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6),
+        (9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11),
+        (9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5),
+        (15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8),
+        (8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11),
+    )
+    _RMD_F = (
+        lambda x, y, z: x ^ y ^ z,
+        lambda x, y, z: (x & y) | (~x & z),
+        lambda x, y, z: (x | ~y) ^ z,
+        lambda x, y, z: (x & z) | (y & ~z),
+        lambda x, y, z: x ^ (y | ~z),
+    )
+
+    def _rol32(x, n):
+        return ((x << n) | (x >> (32 - n))) & 0xFFFFFFFF
+
+    def ripemd160(data):
+        h = [0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0]
+        message = data + b"\x80" + bytes(-(len(data) + 9) % 64) + (8 * len(data)).to_bytes(8, "little")
+        for offset in range(0, len(message), 64):
+            words = [int.from_bytes(message[offset + 4 * i:offset + 4 * i + 4], "little") for i in range(16)]
+            al, bl, cl, dl, el = h
+            ar, br, cr, dr, er = h
+            for j in range(5):
+                for i in range(16):
+                    t = _rol32((al + _RMD_F[j](bl, cl, dl) + words[_RMD_ML[j][i]] + _RMD_KL[j]) & 0xFFFFFFFF, _RMD_SL[j][i]) + el
+                    al, el, dl, cl, bl = el, dl, _rol32(cl, 10), bl, t & 0xFFFFFFFF
+                    t = _rol32((ar + _RMD_F[4 - j](br, cr, dr) + words[_RMD_MR[j][i]] + _RMD_KR[j]) & 0xFFFFFFFF, _RMD_SR[j][i]) + er
+                    ar, er, dr, cr, br = er, dr, _rol32(cr, 10), br, t & 0xFFFFFFFF
+            h = [
+                (h[1] + cl + dr) & 0xFFFFFFFF, (h[2] + dl + er) & 0xFFFFFFFF, (h[3] + el + ar) & 0xFFFFFFFF,
+                (h[4] + al + br) & 0xFFFFFFFF, (h[0] + bl + cr) & 0xFFFFFFFF,
+            ]
+        return b"".join(x.to_bytes(4, "little") for x in h)
+
+
+# --- ed25519 (Keccak-512 variant) ---
+_P = 2 ** 255 - 19
+_L = 2 ** 252 + 27742317777372353535851937790883648493
+_D = -121665 * pow(121666, _P - 2, _P) % _P
+_SQRT_M1 = pow(2, (_P - 1) // 4, _P)
+
+
+def _recover_x(y, sign):
+    x2 = (y * y - 1) * pow(_D * y * y + 1, _P - 2, _P) % _P
+    if x2 == 0:
+        if sign:
+            raise ValueError("Invalid point encoding")
+        return 0
+    x = pow(x2, (_P + 3) // 8, _P)
+    if (x * x - x2) % _P != 0:
+        x = x * _SQRT_M1 % _P
+    if (x * x - x2) % _P != 0:
+        raise ValueError("Invalid point encoding")
+    if x & 1 != sign:
+        x = _P - x
+    return x
+
+
+_BASE_Y = 4 * pow(5, _P - 2, _P) % _P
+_BASE_X = _recover_x(_BASE_Y, 0)
+_BASE = (_BASE_X, _BASE_Y, 1, _BASE_X * _BASE_Y % _P) # Extended coordinates (X, Y, Z, T)
+_IDENTITY = (0, 1, 1, 0)
+
+
+def _point_add(p, q):
+    a = (p[1] - p[0]) * (q[1] - q[0]) % _P
+    b = (p[1] + p[0]) * (q[1] + q[0]) % _P
+    c = 2 * p[3] * q[3] * _D % _P
+    d = 2 * p[2] * q[2] % _P
+    e, f, g, h = b - a, d - c, d + c, b + a
+    return (e * f % _P, g * h % _P, f * g % _P, e * h % _P)
+
+
+def _scalar_mult(point, scalar):
+    result = _IDENTITY
+    while scalar:
+        if scalar & 1:
+            result = _point_add(result, point)
+        point = _point_add(point, point)
+        scalar >>= 1
+    return result
+
+
+_base_powers = None # _BASE * 2**i, built on first use
+
+
+def _base_mult(scalar):
+    """Fixed-base multiplication using precomputed doublings of the base point."""
+    global _base_powers
+    if _base_powers is None:
+        powers, point = [], _BASE
+        for _ in range(256):
+            powers.append(point)
+            point = _point_add(point, point)
+        _base_powers = powers
+    result = _IDENTITY
+    i = 0
+    while scalar:
+        if scalar & 1:
+            result = _point_add(result, _base_powers[i])
+        scalar >>= 1
+        i += 1
+    return result
+
+
+def _encode_point(point):
+    z_inv = pow(point[2], _P - 2, _P)
+    x, y = point[0] * z_inv % _P, point[1] * z_inv % _P
+    return (y | ((x & 1) << 255)).to_bytes(32, "little")
+
+
+def _decode_point(data):
+    value = int.from_bytes(data, "little")
+    y = value & ((1 << 255) - 1)
+    if y >= _P:
+        raise ValueError("Invalid point encoding")
+    x = _recover_x(y, value >> 255)
+    return (x, y, 1, x * y % _P)
+
+
+def _points_equal(p, q):
+    return (p[0] * q[2] - q[0] * p[2]) % _P == 0 and (p[1] * q[2] - q[1] * p[2]) % _P == 0
+
+
+def _secret_scalar(digest):
+    a = int.from_bytes(digest[:32], "little")
+    a &= (1 << 254) - 8
+    a |= 1 << 254
+    return a
+
+
+def _private_key_bytes(private_key_hex):
+    """NIS hex private key (64 chars, or 66 with a sign byte of 00) to the 32 raw bytes used for hashing."""
+    private_key_hex = private_key_hex.strip().lower()
+    if len(private_key_hex) == 66 and private_key_hex.startswith("00"):
+        private_key_hex = private_key_hex[2:]
+    if len(private_key_hex) != 64:
+        raise ValueError("Private key must be 64 hex characters")
+    return bytes.fromhex(private_key_hex)[::-1]
+
+
+def public_key_from_private(private_key_hex):
+    """Derive the 64-char hex public key for a NIS private key."""
+    digest = keccak_512(_private_key_bytes(private_key_hex))
+    return _encode_point(_base_mult(_secret_scalar(digest))).hex()
+
+
+def sign(private_key_hex, data):
+    """Sign ``data`` (bytes); returns the 64-byte signature."""
+    digest = keccak_512(_private_key_bytes(private_key_hex))
+    a = _secret_scalar(digest)
+    public_key = _encode_point(_base_mult(a))
+    r = int.from_bytes(keccak_512(digest[32:] + data), "little") % _L
+    encoded_r = _encode_point(_base_mult(r))
+    h = int.from_bytes(keccak_512(encoded_r + public_key + data), "little") % _L
+    return encoded_r + ((r + h * a) % _L).to_bytes(32, "little")
+
+
+def verify(public_key_hex, data, signature):
+    """Check a 64-byte ``signature`` over ``data``; returns False for malformed keys or signatures."""
+    if len(signature) != 64:
+        return False
+    try:
+        public_key = bytes.fromhex(public_key_hex)
+        point_a = _decode_point(public_key)
+        point_r = _decode_point(signature[:32])
+    except ValueError:
+        return False
+    s = int.from_bytes(signature[32:], "little")
+    if s >= _L:
+        return False
+    h = int.from_bytes(keccak_512(signature[:32] + public_key + data), "little") % _L
+    return _points_equal(_base_mult(s), _point_add(point_r, _scalar_mult(point_a, h)))
+
+
+# --- Addresses ---
+def address_bytes_from_public_key(public_key_hex, network=TESTNET):
+    """The 25 decoded address bytes: network byte, RIPEMD-160(Keccak-256(key)), 4-byte checksum."""
+    versioned = bytes([network]) + ripemd160(keccak_256(bytes.fromhex(public_key_hex)))
+    return versioned + keccak_256(versioned)[:4]
+
+
+def address_from_public_key(public_key_hex, network=TESTNET):
+    """Plain (undashed) 40-character base32 address for a public key."""
+    return base64.b32encode(address_bytes_from_public_key(public_key_hex, network)).decode("ascii")
+
+
+# --- Key pairs ---
+class KeyPair:
+    """A NIS1 key pair, e.g. ``KeyPair.generate()`` or ``KeyPair("575dbb...")``."""
+
+    __slots__ = ("private_key", "public_key")
+
+    def __init__(self, private_key_hex):
+        _private_key_bytes(private_key_hex) # Validate before deriving
+        self.private_key = private_key_hex.strip().lower()[-64:]
+        self.public_key = public_key_from_private(self.private_key)
+
+    def __repr__(self):
+        return f"KeyPair(public_key={self.public_key!r})"
+
+    @classmethod
+    def generate(cls):
+        return cls(os.urandom(32).hex())
+
+    def get_address(self, network=TESTNET):
+        return address_from_public_key(self.public_key, network)
+
+    def sign(self, data):
+        return sign(self.private_key, data)
+
+    def verify(self, data, signature):
+        return verify(self.public_key, data, signature)
+
+
+def _derive_chunk(private_keys, network):
+    rows = []
+    for private_key in private_keys:
+        public_key = public_key_from_private(private_key)
+        rows.append({
+            "private_key": private_key,
+            "public_key": public_key,
+            "address": address_from_public_key(public_key, network),
+        })
+    return rows
+
+
+def derive_keypairs(private_keys, network=TESTNET, workers=None):
+    """Derive public keys and addresses for many private keys, in input order, on a process pool."""
+    private_keys = list(private_keys)
+    chunks = [private_keys[i:i + BULK_CHUNK_SIZE] for i in range(0, len(private_keys), BULK_CHUNK_SIZE)]
+    if len(chunks) <= 1 or workers == 1:
+        return _derive_chunk(private_keys, network)
+    from concurrent.futures import ProcessPoolExecutor # multiprocessing is only loaded for bulk work
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_derive_chunk, chunks, [network] * len(chunks))
+        return [row for chunk in results for row in chunk]
+
+
+def generate_keypairs(count, network=TESTNET, workers=None):
+    """Create ``count`` fresh accounts as ``{"private_key", "public_key", "address"}`` dicts."""
+    return derive_keypairs([os.urandom(32).hex() for _ in range(count)], network, workers)
@@ -0,0 +1,107 @@
+"""Request flow control shared by the node pool and the stand-in node.
+
+* ``SingleFlight`` runs one call per key at a time: callers that ask for a
+  key while it is in flight wait for that call and share its result (or
+  exception) instead of issuing their own.
+* ``TokenBucket`` limits a request rate with bursts; the pool keeps one per
+  node so a spike of sessions is spread out instead of being throttled by
+  the node.
+"""
+import json
+import threading
+import time
+
+
+def request_key(method, path, params=None, body=None):
+    """Canonical text of a request: method, endpoint and parameters as sorted, compact JSON."""
+    return json.dumps([method.upper(), path, params or {}, body], sort_keys=True, separators=(",", ":"))
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls, e.g. ``flights.do(request_key(...), lambda: fetch())``."""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, call):
+        """``(call(), False)``, or ``(result, True)`` when an identical call was already running and this one waited for it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        try:
+            flight.result = call()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key] # Calls from here on start a new flight and see fresh data
+            flight.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second with bursts of up to ``burst`` (default ``rate``) requests."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def pause(self, seconds):
+        """Hand out no token for ``seconds`` (e.g. after the other side said it is overloaded); waiting callers queue behind it."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    def acquire(self, max_wait=None):
+        """Take a token, sleeping until it is available; returns the seconds waited, or ``None`` past ``max_wait``.
+
+        Waiting callers reserve their tokens in turn, so they are served in
+        arrival order at exactly ``rate`` per second.
+        """
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+        if wait:
+            time.sleep(wait)
+        return wait
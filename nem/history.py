@@ -0,0 +1,80 @@
+"""Account transfer history: paging through NIS and flattening transfers.
+
+NIS returns transfers newest first, 25 per page, and the next page is
+requested with the ``id`` of the last transfer seen. ``iter_transfer_pages``
+walks those pages only as far as the caller consumes them; the
+``TransactionIndex`` keeps what has been fetched.
+"""
+import datetime
+
+from .client import TRANSFERS_PAGE_SIZE
+
+NEM_EPOCH = datetime.datetime(2015, 3, 29, 0, 6, 25, tzinfo=datetime.timezone.utc)
+NEM_EPOCH_UNIX = int(NEM_EPOCH.timestamp())
+TRANSFER_TYPE = 257
+MULTISIG_TYPE = 4100
+COLUMNS = ("id", "height", "hash", "type", "sender", "recipient", "amount", "fee", "timestamp", "message")
+
+
+def iter_transfer_pages(client, address, direction="all", start_id=None):
+    """Yield pages of raw NIS transfers for ``address``, fetching each one only when asked for."""
+    last_id = start_id
+    while True:
+        page = client.account_transfers(address, direction=direction, id=last_id)
+        if not page:
+            return
+        yield page
+        if len(page) < TRANSFERS_PAGE_SIZE:
+            return
+        last_id = page[-1]["meta"]["id"]
+
+
+def transfer_record(item):
+    """Flatten a NIS TransactionMetaDataPair to a tuple in ``COLUMNS`` order (microXEM, NEM seconds)."""
+    meta, tx = item["meta"], item["transaction"]
+    if tx.get("type") == MULTISIG_TYPE: # Multisig wrapper: the transfer is the inner transaction
+        tx = tx["otherTrans"]
+    message_obj = tx.get("message") or {}
+    payload = message_obj.get("payload", "")
+    if payload and message_obj.get("type") == 1: # Plain message, hex encoded UTF-8
+        try:
+            payload = bytes.fromhex(payload).decode("utf-8", errors="replace")
+        except ValueError: # Malformed hex: keep the raw text rather than fail the whole page
+            pass
+    return (
+        meta["id"],
+        meta["height"],
+        meta.get("hash", {}).get("data", "N/A"),
+        tx.get("type", 0),
+        tx.get("signer", "N/A"), # NIS reports the signer's public key
+        tx.get("recipient", "N/A"),
+        tx.get("amount", 0),
+        tx.get("fee", 0),
+        tx.get("timeStamp"),
+        payload,
+    )
+
+
+def nem_datetime(nem_timestamp):
+    """UTC datetime of a NEM timestamp (seconds since the NEM epoch), ``None`` when missing."""
+    return NEM_EPOCH + datetime.timedelta(seconds=nem_timestamp) if nem_timestamp is not None else None
+
+
+def raw_transfer(item):
+    """``transfer_record`` as a dict keyed by ``COLUMNS``."""
+    return dict(zip(COLUMNS, transfer_record(item)))
+
+
+def history_row(raw):
+    """Convert a ``raw_transfer`` dict to display units (XEM, UTC datetime)."""
+    row = dict(raw)
+    row["amount"] = raw["amount"] / 1_000_000.0
+    row["fee"] = raw["fee"] / 1_000_000.0
+    row["timestamp"] = nem_datetime(raw["timestamp"])
+    return row
+
+
+def parse_transfer(item):
+    """Turn a NIS TransactionMetaDataPair into a flat history row."""
+    return history_row(raw_transfer(item))
+
@@ -0,0 +1,203 @@
+"""Persistent SQLite index of confirmed transfers per address.
+
+The index keeps, for each address, a contiguous run of its transfers from the
+newest one seen back to ``oldest_id``. ``sync_newer`` asks the node only for
+transfers newer than the stored ones (one request when nothing changed), and
+``backfill`` extends the run into older pages on demand. History queries,
+direction, amount and date filters, sorting and totals are then answered from
+the local database, one page at a time.
+"""
+import sqlite3
+import threading
+import time
+
+from .client import TRANSFERS_PAGE_SIZE
+from . import metrics
+from .columns import TransferColumns
+from .history import COLUMNS, iter_transfer_pages, transfer_record
+
+DEFAULT_INDEX_PATH = "nem_index.sqlite3"
+DIRECTIONS = ("all", "incoming", "outgoing")
+ORDER_COLUMNS = ("id", "amount", "fee", "timestamp", "height") # Sort keys accepted by history()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    address TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    type INTEGER,
+    sender TEXT,
+    recipient TEXT,
+    amount INTEGER NOT NULL,
+    fee INTEGER NOT NULL,
+    timestamp INTEGER,
+    message TEXT,
+    PRIMARY KEY (address, hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transfers_by_id ON transfers (address, id);
+CREATE INDEX IF NOT EXISTS transfers_by_height ON transfers (address, height);
+CREATE INDEX IF NOT EXISTS transfers_by_amount ON transfers (address, amount);
+CREATE INDEX IF NOT EXISTS transfers_by_timestamp ON transfers (address, timestamp);
+CREATE TABLE IF NOT EXISTS sync_state (
+    address TEXT PRIMARY KEY,
+    newest_id INTEGER,
+    oldest_id INTEGER,
+    complete INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL
+);
+"""
+
+
+class TransactionIndex:
+    """Local transfer store, e.g. ``TransactionIndex("nem_index.sqlite3")``; safe to share between threads."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    # --- Sync ---
+    def state(self, address):
+        """Return ``(newest_id, oldest_id, complete, synced_at)`` or ``None`` if never synced."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT newest_id, oldest_id, complete, synced_at FROM sync_state WHERE address = ?", (address,)
+            ).fetchone()
+
+    def sync_newer(self, client, address):
+        """Store transfers newer than the newest indexed one; returns how many were added.
+
+        For an address that was never synced this fetches only the newest page;
+        older pages come from ``backfill``.
+        """
+        state = self.state(address)
+        newest_id = state[0] if state else None
+        fresh = []
+        complete = True # Only meaningful when nothing was indexed before
+        for page in iter_transfer_pages(client, address):
+            new_items = [item for item in page if newest_id is None or item["meta"]["id"] > newest_id]
+            fresh.extend(new_items)
+            if newest_id is None:
+                complete = len(page) < TRANSFERS_PAGE_SIZE
+                break # First sync: one page is enough, the rest is backfilled lazily
+            if len(new_items) < len(page):
+                break # Reached transfers we already have
+
+        with metrics.timed("nem_parse_seconds", stage="transfers"):
+            rows = [transfer_record(item) for item in fresh]
+        with self._lock, self._db:
+            self._insert(address, rows)
+            if newest_id is None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sync_state (address, newest_id, oldest_id, complete, synced_at) VALUES (?, ?, ?, ?, ?)",
+                    (address, rows[0][0] if rows else None, rows[-1][0] if rows else None, int(complete), time.time()),
+                )
+            else:
+                self._db.execute(
+                    "UPDATE sync_state SET newest_id = ?, synced_at = ? WHERE address = ?",
+                    (rows[0][0] if rows else newest_id, time.time(), address),
+                )
+        return len(rows)
+
+    def backfill(self, client, address, count, direction="all"):
+        """Fetch older pages until ``count`` transfers (in ``direction``) are indexed or history is complete."""
+        state = self.state(address)
+        if state is None:
+            self.sync_newer(client, address)
+            state = self.state(address)
+        _, oldest_id, complete, _ = state
+        if complete or self.count(address, direction) >= count:
+            return
+        if oldest_id is None: # Nothing indexed yet
+            return
+        for page in iter_transfer_pages(client, address, start_id=oldest_id):
+            with metrics.timed("nem_parse_seconds", stage="transfers"):
+                rows = [transfer_record(item) for item in page]
+            oldest_id = rows[-1][0]
+            complete = len(page) < TRANSFERS_PAGE_SIZE
+            with self._lock, self._db:
+                self._insert(address, rows)
+                self._db.execute(
+                    "UPDATE sync_state SET oldest_id = ?, complete = ? WHERE address = ?", (oldest_id, int(complete), address)
+                )
+            if self.count(address, direction) >= count:
+                break
+        else:
+            with self._lock, self._db:
+                self._db.execute("UPDATE sync_state SET complete = 1 WHERE address = ?", (address,))
+
+    def _insert(self, address, rows):
+        self._db.executemany(
+            "INSERT OR REPLACE INTO transfers (address, id, height, hash, type, sender, recipient, amount, fee, timestamp, message)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(address, *row) for row in rows],
+        )
+
+    # --- Queries ---
+    def _where(self, address, direction, min_amount=None, max_amount=None, since=None, until=None):
+        """SQL condition and arguments; amounts in microXEM, ``since``/``until`` in NEM seconds (inclusive)."""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction: {direction}")
+        clauses, args = ["address = ?"], [address]
+        if direction == "incoming":
+            clauses.append("recipient = ?")
+            args.append(address)
+        elif direction == "outgoing":
+            clauses.append("recipient != ?")
+            args.append(address)
+        for condition, value in (("amount >= ?", min_amount), ("amount <= ?", max_amount), ("timestamp >= ?", since), ("timestamp <= ?", until)):
+            if value is not None:
+                clauses.append(condition)
+                args.append(value)
+        return " AND ".join(clauses), tuple(args)
+
+    def count(self, address, direction="all", **filters):
+        """Indexed transfers matching ``direction`` and the ``min_amount``/``max_amount``/``since``/``until`` filters."""
+        where, args = self._where(address, direction, **filters)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM transfers WHERE {where}", args).fetchone()[0]
+
+    def history(self, address, limit=20, offset=0, direction="all", order_by="id", descending=True, **filters):
+        """History as ``TransferColumns`` (newest first by default); ``limit=None`` returns everything that matches.
+
+        ``order_by`` is one of ``ORDER_COLUMNS``; ties keep newest-first order.
+        Filters are those of ``count``.
+        """
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"Cannot sort by {order_by}")
+        where, args = self._where(address, direction, **filters)
+        order = f"{order_by} {'DESC' if descending else 'ASC'}" + (", id DESC" if order_by != "id" else "")
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM transfers WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*args, -1 if limit is None else limit, offset),
+            )
+            return TransferColumns.from_records(cursor.fetchall())
+
+    def totals(self, address):
+        """Indexed totals in XEM: received, sent, fees paid, plus transfer counts."""
+        with self._lock:
+            received, incoming, sent, fees, outgoing = self._db.execute(
+                "SELECT"
+                " COALESCE(SUM(CASE WHEN recipient = ?1 THEN amount END), 0),"
+                " COUNT(CASE WHEN recipient = ?1 THEN 1 END),"
+                " COALESCE(SUM(CASE WHEN recipient != ?1 THEN amount END), 0),"
+                " COALESCE(SUM(CASE WHEN recipient != ?1 THEN fee END), 0),"
+                " COUNT(CASE WHEN recipient != ?1 THEN 1 END)"
+                " FROM transfers WHERE address = ?1",
+                (address,),
+            ).fetchone()
+        return {
+            "received": received / 1_000_000.0,
+            "incoming": incoming,
+            "sent": sent / 1_000_000.0,
+            "fees": fees / 1_000_000.0,
+            "outgoing": outgoing,
+        }
@@ -0,0 +1,266 @@
+"""Headless bulk lookups: addresses and transaction hashes in, JSON lines out.
+
+Reads one item per line from a file or stdin (blank lines and ``#`` comments
+are skipped) and resolves them concurrently through a ``NodePool`` (which
+coalesces duplicates and paces every node), the per-block ``HeightCache``
+and the on-disk ``ResponseArchive`` for final transactions, i.e. the same
+stack the apps use. Each result is written as one JSON object as soon as it
+may be, in input order (default) or completion order::
+
+    python -m nem addresses.txt --node http://bob.nem.ninja:7778 -o balances.jsonl
+    python -m nem hashes.txt --node http://a:7890 --node http://b:7890 --order completion
+    python -m nem addresses.txt --kind history --history-count 100 -o history.jsonl
+    cat addresses.txt | python -m nem --standin            # offline, against a local stand-in node
+
+Every record carries the input ``line`` and ``input``; with ``--resume`` the
+lines already written successfully to ``--output`` are skipped and the rest
+is appended, so an interrupted nightly job continues where it stopped
+(failed lines are retried and appear again; the last record of a line wins).
+The exit status is 0 when every item resolved, 1 when some failed.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .accounts import account_row
+from .address import Address, normalize_address
+from .archive import DEFAULT_ARCHIVE_PATH, ArchivedApi, ResponseArchive
+from .blocks import decode_transaction
+from .cache import HeightCache
+from .crypto import NETWORKS
+from .nodes import NodePool
+from .wallet import is_unknown_account, transfer_history
+
+KINDS = ("auto", "account", "transaction", "history")
+DEFAULT_WORKERS = 32
+WINDOW_PER_WORKER = 4 # Items submitted ahead of the slowest pending one, per worker (bounds memory in input order)
+PROGRESS_INTERVAL = 5.0 # Seconds between progress lines on stderr
+HASH_LENGTH = 64
+
+
+def read_items(stream):
+    """``(line number, item)`` for every non-blank, non-comment line."""
+    for number, line in enumerate(stream, start=1):
+        item = line.split("#", 1)[0].strip()
+        if item:
+            yield number, item
+
+
+def detect_kind(item):
+    """``"transaction"`` for 64 hex characters, else ``"account"``."""
+    if len(item) == HASH_LENGTH and all(c in "0123456789abcdefABCDEF" for c in item):
+        return "transaction"
+    return "account"
+
+
+def completed_lines(path):
+    """``{(line, input)}`` recorded as successful in an earlier run's output; drops a partially written last line."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data): # Interrupted mid-write: cut the fragment so appended records start on a fresh line
+            f.truncate(end)
+    for raw in data[:end].splitlines():
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            continue
+        if record.get("ok"):
+            done.add((record.get("line"), record.get("input")))
+    return done
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if hasattr(value, "item"): # NumPy scalars
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class Resolver:
+    """Resolves one item of a given kind; shared by all worker threads."""
+
+    def __init__(self, client, cache, network, index=None, history_count=25):
+        self.client = client
+        self.cache = cache
+        self.network = network
+        self.index = index
+        self.history_count = history_count
+
+    def __call__(self, kind, item):
+        if kind == "transaction":
+            return self.transaction(item)
+        if not Address.is_valid(item, self.network): # Checked locally, no node call
+            raise ValueError("invalid address (format, checksum or network)")
+        address = normalize_address(item)
+        if kind == "history":
+            return self.history(address)
+        return self.account(address)
+
+    def account(self, address):
+        try:
+            info = self.cache.get_or_fetch("account", address, lambda: self.client.account_get(address))
+        except Exception as e:
+            if not is_unknown_account(e):
+                raise
+            info = None # Never seen by the node: an empty account, not an error
+        row = account_row(address, info)
+        del row["error"]
+        return row
+
+    def transaction(self, tx_hash):
+        data = self.client.transaction_get(tx_hash.lower())
+        meta = data["meta"]
+        return decode_transaction(data["transaction"], meta.get("height"), meta["hash"]["data"], (meta.get("innerHash") or {}).get("data"))
+
+    def history(self, address):
+        columns, has_more, error = transfer_history(self.client, self.index, address, self.cache, self.history_count, "all", self.network)
+        if error:
+            raise error
+        return {"totals": self.index.totals(address), "more": has_more, "transfers": columns.rows(address)}
+
+
+def resolve_all(items, resolve, emit, kind="auto", workers=DEFAULT_WORKERS, order="input"):
+    """Resolve ``(line, item)`` pairs on ``workers`` threads and call ``emit(record)`` in ``order``; returns ``(ok, failed)``."""
+    counts = {"ok": 0, "failed": 0}
+
+    def job(line, item):
+        item_kind = detect_kind(item) if kind == "auto" else kind
+        record = {"line": line, "input": item, "kind": item_kind}
+        try:
+            record.update(ok=True, result=resolve(item_kind, item))
+        except Exception as e:
+            record.update(ok=False, error=str(e))
+        return record
+
+    def done(record):
+        counts["ok" if record["ok"] else "failed"] += 1
+        emit(record)
+
+    window = workers * WINDOW_PER_WORKER
+    pending = {} # future -> submission sequence
+    finished = {} # sequence -> record, waiting for earlier ones (input order only)
+    next_emit = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nem-lookup") as executor:
+        sequence = 0
+        items = iter(items)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) + len(finished) < window:
+                try:
+                    line, item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(job, line, item)] = sequence
+                sequence += 1
+            if not pending:
+                continue
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                seq = pending.pop(future)
+                if order == "completion":
+                    done(future.result())
+                else:
+                    finished[seq] = future.result()
+            while next_emit in finished:
+                done(finished.pop(next_emit))
+                next_emit += 1
+    return counts["ok"], counts["failed"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m nem", description="Resolve NEM addresses or transaction hashes in bulk, as JSON lines")
+    parser.add_argument("input", nargs="?", default="-", help="File with one address or hash per line (default: stdin)")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--kind", choices=KINDS, default="auto", help="What to look up; auto treats 64 hex characters as a hash")
+    parser.add_argument("--order", choices=("input", "completion"), default="input", help="Order of the output lines")
+    parser.add_argument("--resume", action="store_true", help="Skip lines already resolved in --output and append the rest")
+    parser.add_argument("--node", action="append", help="NIS node URL; repeat for a pool")
+    parser.add_argument("--standin", action="store_true", help="Start an in-process stand-in node instead (offline runs)")
+    parser.add_argument("--network", choices=sorted(NETWORKS), default="testnet")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent lookups")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second per node (default: the pool's limit, 0: unlimited)")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_PATH, help="Response archive for final transactions ('' to disable)")
+    parser.add_argument("--index", help="Transfer index used by --kind history (default: the apps' nem_index.sqlite3)")
+    parser.add_argument("--history-count", type=int, default=25, help="Newest transfers per address for --kind history")
+    parser.add_argument("--quiet", action="store_true", help="No progress lines on stderr")
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+    if args.standin:
+        from .standin import start_standin
+
+        _, url = start_standin()
+        node_urls = [url]
+    elif args.node:
+        node_urls = args.node
+    else:
+        parser.error("give at least one --node URL, or --standin")
+
+    pool_options = {} if args.rate is None else {"rate_limit": args.rate or None, "rate_burst": max(1, int(args.rate))}
+    pool = NodePool(node_urls, **pool_options)
+    pool.probe_all() # Know the height before the first lookup: the caches and the archive depend on it
+    pool.start()
+    client = ArchivedApi(pool, ResponseArchive(args.archive), lambda: pool.best_height) if args.archive else pool
+    index = None
+    if args.kind == "history":
+        from .index import DEFAULT_INDEX_PATH, TransactionIndex # NumPy is only needed for history
+
+        index = TransactionIndex(args.index or DEFAULT_INDEX_PATH)
+    resolver = Resolver(client, HeightCache(lambda: pool.best_height, name="lookup"), NETWORKS[args.network], index, args.history_count)
+
+    skip = completed_lines(args.output) if args.resume else set()
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = open(args.output, "a" if args.resume else "w", encoding="utf-8") if args.output else sys.stdout
+    items = ((line, item) for line, item in read_items(source) if (line, item) not in skip)
+
+    lock = threading.Lock()
+    progress = {"emitted": 0, "reported": time.monotonic()}
+    started = time.monotonic()
+
+    def emit(record):
+        with lock:
+            out.write(json.dumps(record, default=_json_default, separators=(",", ":")) + "\n")
+            progress["emitted"] += 1
+            now = time.monotonic()
+            if now - progress["reported"] >= PROGRESS_INTERVAL:
+                out.flush() # Everything reported as done is on disk, so --resume can rely on it
+                progress["reported"] = now
+                if not args.quiet:
+                    rate = progress["emitted"] / (now - started)
+                    print(f"{progress['emitted']:,} resolved ({rate:,.0f}/s)", file=sys.stderr)
+
+    try:
+        ok, failed = resolve_all(items, resolver, emit, args.kind, args.workers, args.order)
+    except KeyboardInterrupt:
+        print("Interrupted; rerun with --resume to continue.", file=sys.stderr)
+        return 130
+    except BrokenPipeError: # The reader went away, e.g. output piped into head
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno()) # Let the final flush succeed silently
+        return 1
+    finally:
+        out.flush()
+        if out is not sys.stdout:
+            out.close()
+        if source is not sys.stdin:
+            source.close()
+        pool.stop()
+    if not args.quiet:
+        skipped = f", {len(skip):,} already done" if skip else ""
+        print(f"{ok:,} resolved, {failed:,} failed{skipped} in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
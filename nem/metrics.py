@@ -0,0 +1,271 @@
+"""Process-wide request, cache and parse instrumentation.
+
+The client, node pool, caches and parsers record into ``REGISTRY``:
+
+* ``nem_request_seconds{endpoint,method}``: latency histogram of every node call
+* ``nem_request_errors_total{node,kind}``: failures per node (HTTP status or ``transport``)
+* ``nem_failovers_total{node}``: requests the pool retried on the next node
+* ``nem_coalesced_requests_total{endpoint}``: requests answered by an identical one already in flight
+* ``nem_rate_limit_wait_seconds{node}``: time requests queued for a node's rate limit
+* ``nem_cache_events_total{cache,kind,event}``: hit, miss, eviction, stale and invalidation counts
+* ``nem_parse_seconds{stage}``: time spent turning responses into rows and columns
+* ``nem_stream_messages_total{node,topic}``, ``nem_stream_errors_total{node}``: websocket push events
+
+``render_prometheus()`` returns everything in the Prometheus text format;
+``write_prometheus(path)`` writes it atomically for a node-exporter textfile
+collector, and ``start_http_server(port)`` serves it on ``/metrics``.
+"""
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0) # Seconds
+HELP = {
+    "nem_request_seconds": ("histogram", "Latency of NIS node requests"),
+    "nem_request_errors_total": ("counter", "Failed NIS node requests"),
+    "nem_failovers_total": ("counter", "Requests retried on another node after a failure"),
+    "nem_coalesced_requests_total": ("counter", "Requests that shared the answer of an identical in-flight request"),
+    "nem_rate_limit_wait_seconds": ("histogram", "Time requests waited for a node's rate limit"),
+    "nem_cache_events_total": ("counter", "Cache hits, misses, evictions, stale drops and invalidations"),
+    "nem_parse_seconds": ("histogram", "Time spent parsing node responses"),
+    "nem_stream_messages_total": ("counter", "Messages pushed by nodes over websocket subscriptions"),
+    "nem_stream_errors_total": ("counter", "Websocket connection failures and failing stream listeners"),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram as Prometheus defines it."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1) # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate of the ``q`` quantile, interpolated within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                low = self.bounds[i - 1] if i else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return low + (high - low) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+
+class Registry:
+    """Thread-safe store of labelled counters and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {} # (name, labels) -> value
+        self._histograms = {} # (name, labels) -> Histogram
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def counter(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def counters(self, name):
+        """``[(labels dict, value)]`` for every series of counter ``name``."""
+        with self._lock:
+            return [(dict(labels), value) for (n, labels), value in self._counters.items() if n == name]
+
+    def histograms(self, name):
+        """``[(labels dict, Histogram copy)]`` for every series of histogram ``name``."""
+        with self._lock:
+            series = []
+            for (n, labels), histogram in self._histograms.items():
+                if n == name:
+                    copy = Histogram(histogram.bounds)
+                    copy.counts, copy.sum, copy.count = list(histogram.counts), histogram.sum, histogram.count
+                    series.append((dict(labels), copy))
+            return series
+
+    def total(self, name):
+        """Sum of a counter, or observation count of a histogram, over all label sets."""
+        with self._lock:
+            return sum(v for (n, _), v in self._counters.items() if n == name) + sum(
+                h.count for (n, _), h in self._histograms.items() if n == name
+            )
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self):
+        """All series in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            lines = []
+            described = set()
+
+            def describe(name):
+                if name not in described:
+                    described.add(name)
+                    kind, text = HELP.get(name, ("untyped", name))
+                    lines.extend((f"# HELP {name} {text}", f"# TYPE {name} {kind}"))
+
+            for (name, labels), value in counters:
+                describe(name)
+                lines.append(f"{name}{_labels(labels)} {value}")
+            for (name, labels), histogram in histograms:
+                describe(name)
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+REGISTRY = Registry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+
+
+@contextlib.contextmanager
+def timed(name, **labels):
+    """Observe the duration of the ``with`` block in histogram ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(name, time.perf_counter() - started, **labels)
+
+
+def render_prometheus():
+    return REGISTRY.render_prometheus()
+
+
+# --- Summaries for dashboards and reports ---
+def latency_summary(registry=REGISTRY):
+    """One row per endpoint with call count, mean, p50 and p95 latency in ms, busiest first."""
+    rows = [
+        {
+            "endpoint": f"{labels['method']} {labels['endpoint']}",
+            "calls": h.count,
+            "mean_ms": round(h.sum / h.count * 1000, 1),
+            "p50_ms": round(h.quantile(0.5) * 1000, 1),
+            "p95_ms": round(h.quantile(0.95) * 1000, 1),
+        }
+        for labels, h in registry.histograms("nem_request_seconds")
+    ]
+    return sorted(rows, key=lambda row: -row["calls"])
+
+
+def error_summary(registry=REGISTRY):
+    """``(rows, failovers)``: one row per node and error kind, and the total failover count."""
+    rows = [{"node": labels["node"], "kind": labels["kind"], "count": value} for labels, value in registry.counters("nem_request_errors_total")]
+    return rows, sum(value for _, value in registry.counters("nem_failovers_total"))
+
+
+def flow_summary(registry=REGISTRY):
+    """``{"coalesced", "rate_limited", "rate_limit_wait_s"}``: requests saved by coalescing and time spent pacing."""
+    waits = registry.histograms("nem_rate_limit_wait_seconds")
+    return {
+        "coalesced": sum(value for _, value in registry.counters("nem_coalesced_requests_total")),
+        "rate_limited": sum(h.count for _, h in waits),
+        "rate_limit_wait_s": round(sum(h.sum for _, h in waits), 2),
+    }
+
+
+def cache_summary(registry=REGISTRY):
+    """One row per cached kind with its event counts and hit ratio."""
+    rows = {}
+    for labels, value in registry.counters("nem_cache_events_total"):
+        rows.setdefault(labels["kind"], {"kind": labels["kind"], "hit": 0, "miss": 0, "eviction": 0, "stale": 0, "invalidation": 0})[labels["event"]] += value
+    for row in rows.values():
+        lookups = row["hit"] + row["miss"]
+        row["hit_ratio"] = round(row["hit"] / lookups, 3) if lookups else None
+    return list(rows.values())
+
+
+def parse_summary(registry=REGISTRY):
+    """One row per parse stage with call count, total and p95 time in ms."""
+    return [
+        {"stage": labels["stage"], "calls": h.count, "total_ms": round(h.sum * 1000, 1), "p95_ms": round(h.quantile(0.95) * 1000, 2)}
+        for labels, h in registry.histograms("nem_parse_seconds")
+    ]
+
+
+def write_prometheus(path):
+    """Write the current metrics to ``path`` atomically (write to a temporary file, then rename)."""
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".nem_metrics_")
+    with os.fdopen(fd, "w") as f:
+        f.write(render_prometheus())
+    os.replace(temporary, path)
+
+
+@functools.lru_cache(maxsize=None)
+def _metrics_handler():
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+    return MetricsHandler
+
+
+def start_http_server(port, host="0.0.0.0"):
+    """Serve ``/metrics`` on a daemon thread; returns the server."""
+    from http.server import ThreadingHTTPServer # Imported on demand: it costs more than the rest of the package
+
+    server = ThreadingHTTPServer((host, port), _metrics_handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="nem-metrics", daemon=True).start()
+    return server
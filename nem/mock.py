@@ -0,0 +1,151 @@
+"""Mock NIS1 responses: hand-written fixtures plus a synthetic chain fallback.
+
+``get_mock_data(endpoint, params)`` returns ``(data, error)`` like a node
+call would. The example address and hash come from ``MOCK_DATA``; every
+other address, hash or height is looked up in a ``SyntheticChain``. Kept
+free of Streamlit so the demo, the local stand-in node and benchmarks can
+all share it.
+"""
+import time
+
+from .address import Address, normalize_address
+from .synthetic import SyntheticChain
+
+# --- Dữ liệu Giả (Mock Data) ---
+# Định nghĩa các phản hồi mẫu, trông giống thật, cho các input cụ thể
+
+# Địa chỉ ví NEM mẫu (dùng địa chỉ này khi nhập vào ô input)
+# (địa chỉ Mainnet hợp lệ, suy ra từ public key mẫu bên dưới)
+MOCK_EXAMPLE_ADDRESS = "NBFRX7-MB5N3V-KDA3K5-LK2C37-AHPGF2-3O3ZBD-PO7T"
+MOCK_CLEANED_ADDRESS = normalize_address(MOCK_EXAMPLE_ADDRESS)
+
+# Mã hash giao dịch mẫu (dùng mã hash này khi nhập vào ô input)
+MOCK_EXAMPLE_HASH = "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2"
+
+# Chuỗi khối tổng hợp: mọi địa chỉ/hash/chiều cao khác mẫu được suy ra từ seed khi cần (tra cứu O(1))
+SYNTHETIC_CHAIN = SyntheticChain(seed="nem-demo-vn", height=4012345)
+SYNTHETIC_EXAMPLE_ADDRESS = Address(SYNTHETIC_CHAIN.address(123456)).pretty
+SYNTHETIC_EXAMPLE_HASH = SYNTHETIC_CHAIN.transaction_hash(9876543)
+
+# Đây chính là "bảng dữ liệu ảo" bạn cần, lưu dưới dạng dictionary Python
+MOCK_DATA = {
+    # Dữ liệu giả cho trạng thái node
+    "/heartbeat": {
+        "data": {"code": 1, "type": 2, "message": "ok (Dữ liệu giả)"},
+        "error": None
+    },
+    "/chain/height": {
+        "data": {"height": SYNTHETIC_CHAIN.height}, # Chiều cao khối mẫu (đỉnh của chuỗi tổng hợp)
+        "error": None
+    },
+    "/node/info": {
+        "data": {
+            "node": { "protocol": "http", "host": "mock.nem.local", "port": 7890, },
+            "nisInfo": {
+                "currentTime": int(time.time() * 1000),
+                "application": "NEM Infrastructure Server",
+                "startTime": int((time.time() - 3600*24) * 1000), # Giả lập node chạy 1 ngày
+                "version": "0.6.99-MOCK-VN", # Phiên bản giả
+                "signer": None,
+                "networkId": 104 # 104 là Mainnet, -104 là Testnet
+            }
+        },
+        "error": None
+    },
+    # Dữ liệu giả cho tra cứu tài khoản (chỉ hoạt động với địa chỉ MOCK_EXAMPLE_ADDRESS)
+    f"/account/get?address={MOCK_CLEANED_ADDRESS}": {
+        "data": {
+            "meta": {"cosignatories": [], "cosignatoryOf": [], "status": "LOCKED", "remoteStatus": "INACTIVE"},
+            "account": {
+                "address": MOCK_CLEANED_ADDRESS,
+                "harvestedBlocks": 15,
+                "balance": 123456789, # Số dư: 123.456789 XEM (đơn vị microXEM)
+                "importance": 0.00012345,
+                "vestedBalance": 100000000, # Số dư đã xác nhận: 100 XEM
+                "publicKey": "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2", # Public key mẫu (64 ký tự hex)
+                "label": "Tài khoản Demo Giả",
+                "multisigInfo": {}
+            }
+        },
+        "error": None
+    },
+    # Dữ liệu giả cho tra cứu giao dịch (chỉ hoạt động với MOCK_EXAMPLE_HASH)
+    f"/transaction/get?hash={MOCK_EXAMPLE_HASH}": {
+        "data": {
+            "meta": {
+                "innerHash": {}, "id": 98765, "hash": {"data": MOCK_EXAMPLE_HASH}, "height": 4012300
+            },
+            "transaction": {
+                "timeStamp": 195000000, # Thời gian NEM (giây tính từ block gốc)
+                "amount": 50000000, # Số lượng: 50 XEM (microXEM)
+                "signature": "f1e2d3c4b5a6f1e2d3c4b5a6f1e2d3c4b5a6f1e2d3c4b5a6f1e2d3c4b5a6f1e2d3c4b5a6f1e2d3c4", # Chữ ký mẫu (128 ký tự hex)
+                "fee": 100000, # Phí: 0.1 XEM (microXEM)
+                "recipient": "NDX5DU-74CRBD-UFHIKB-QFJ54F-FORUKF-YOVCDP-64KT", # Địa chỉ người nhận mẫu
+                "type": 257, # Loại giao dịch: Transfer (Chuyển khoản)
+                "deadline": 195003600, # Hạn chót (NEM time)
+                "message": {
+                    # Hex của "Day la tin nhan giao dich gia."
+                    "payload": "446179206c612074696e206e68616e206769616f2064696368206769612e",
+                    "type": 1 # Loại tin nhắn: Plain (văn bản thường)
+                },
+                "version": 1744830465, # Version cho Mainnet (-1744830463 cho testnet)
+                "signer": "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5f6a1b2" # Public key người gửi (giống tài khoản mẫu)
+            }
+        },
+        "error": None
+    },
+    # Dữ liệu lỗi giả khi không tìm thấy tài khoản
+    "ERROR_ACCOUNT_NOT_FOUND": {
+        "data": None,
+        "error": "Lỗi API Giả: Không tìm thấy tài khoản được chỉ định."
+    },
+    # Dữ liệu lỗi giả khi không tìm thấy giao dịch
+    "ERROR_TRANSACTION_NOT_FOUND": {
+         "data": None,
+         "error": "Lỗi API Giả: Mã hash giao dịch không tồn tại hoặc không hợp lệ."
+    }
+}
+
+# --- Hàm lấy dữ liệu giả ---
+def get_mock_data(endpoint, params=None, chain=None):
+    """Trả về dữ liệu giả dựa trên endpoint và tham số (``chain`` thay cho chuỗi tổng hợp mặc định)."""
+    chain = chain or SYNTHETIC_CHAIN
+    # Xử lý logic để trả về đúng dữ liệu giả dựa trên endpoint và params
+    if endpoint == "/account/get":
+        # Nếu tra cứu tài khoản, kiểm tra xem địa chỉ có khớp với địa chỉ mẫu không
+        if params and params.get('address') == MOCK_CLEANED_ADDRESS:
+            key = f"/account/get?address={MOCK_CLEANED_ADDRESS}"
+            return MOCK_DATA[key]['data'], MOCK_DATA[key]['error']
+        # Nếu không, tìm trong chuỗi tổng hợp (địa chỉ chứa sẵn số thứ tự tài khoản)
+        account = chain.account(params.get('address', '')) if params else None
+        if account:
+            return account, None
+        # Nếu không khớp, trả về lỗi giả "không tìm thấy"
+        return MOCK_DATA["ERROR_ACCOUNT_NOT_FOUND"]['data'], MOCK_DATA["ERROR_ACCOUNT_NOT_FOUND"]['error']
+    elif endpoint == "/transaction/get":
+        # Nếu tra cứu giao dịch, kiểm tra xem hash có khớp với hash mẫu không
+        lookup_hash = (params.get('hash') or params.get('id')) if params else None # Chấp nhận cả 'hash' và 'id'
+        if lookup_hash == MOCK_EXAMPLE_HASH:
+             key = f"/transaction/get?hash={MOCK_EXAMPLE_HASH}"
+             return MOCK_DATA[key]['data'], MOCK_DATA[key]['error']
+        transaction = chain.transaction_by_hash(lookup_hash) if lookup_hash else None
+        if transaction:
+            return transaction, None
+        # Nếu không khớp, trả về lỗi giả "không tìm thấy"
+        return MOCK_DATA["ERROR_TRANSACTION_NOT_FOUND"]['data'], MOCK_DATA["ERROR_TRANSACTION_NOT_FOUND"]['error']
+    elif endpoint.startswith("/account/transfers/"):
+        # Lịch sử giao dịch (25 giao dịch/trang, mới nhất trước, phân trang bằng 'id')
+        direction = endpoint.rsplit("/", 1)[-1]
+        if direction not in ("all", "incoming", "outgoing") or not params:
+            return None, f"Endpoint chưa được cấu hình dữ liệu giả: {endpoint}"
+        page_id = int(params['id']) if params.get('id') else None
+        return {"data": chain.transfers_page(params.get('address', ''), direction, page_id)}, None
+    elif endpoint == "/block/at/public":
+        block = chain.block(int((params or {}).get('height', 0)))
+        return (block, None) if block else (None, "Lỗi API Giả: Không có khối ở chiều cao này.")
+    elif endpoint in MOCK_DATA:
+        # Nếu là các endpoint trạng thái node, trả về dữ liệu tương ứng
+        return MOCK_DATA[endpoint]['data'], MOCK_DATA[endpoint]['error']
+    else:
+        # Nếu endpoint không được định nghĩa trong dữ liệu giả
+        return None, f"Endpoint chưa được cấu hình dữ liệu giả: {endpoint}"
@@ -0,0 +1,246 @@
+"""Latency-aware pool of NIS1 nodes.
+
+A background thread probes ``/heartbeat`` and ``/chain/height`` on every
+configured node, keeps an exponentially weighted moving average of their
+latency and marks nodes that are down or lagging behind the best known chain
+height. Requests only read those cached statistics: each call goes to the
+fastest healthy node and falls back to the next one if it fails.
+
+The pool is also where concurrent callers meet, so it coalesces identical
+in-flight requests (a hundred sessions asking for the same account at once
+cause one node call) and paces every node with a token bucket, moving to the
+next healthy node before queueing on a saturated one. A node that answers
+429 or 503 is paused for ``THROTTLE_PAUSE`` seconds and the request moves on
+to the next node; throttled nodes are tried once more, after their pause,
+when no other node could answer. (Without a rate limit there is no bucket
+to pause, so such a node is marked down until its next probe.)
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import metrics
+from .client import NisApi, NisClient, NisError
+from .flow import SingleFlight, TokenBucket, request_key
+
+PROBE_INTERVAL = 15.0 # Seconds between background probe rounds
+PROBE_TIMEOUT = 3.0 # Seconds; a node slower than this is considered down
+MAX_HEIGHT_LAG = 3 # Blocks a node may trail the best height and still be used
+LATENCY_ALPHA = 0.3 # Weight of the newest sample in the moving average
+MAX_FAN_OUT = 64 # Upper bound on concurrent calls issued by fan_out()
+RATE_LIMIT = 20.0 # Requests per second sent to one node (None: unlimited)
+RATE_BURST = 40 # Requests a node may get at once after being idle
+UNCOALESCED = frozenset({"/transaction/announce"}) # Never shared between callers, even when identical
+THROTTLED = frozenset({429, 503}) # Statuses that mean "too busy for now", not "bad request"
+THROTTLE_PAUSE = 1.0 # Seconds a throttling node gets no requests from this pool
+
+
+def fan_out(jobs, max_workers=None):
+    """Run every ``{key: callable}`` job at once and yield ``(key, result, error, elapsed)`` as each finishes.
+
+    Exceptions are returned in ``error`` rather than raised so one failing call
+    does not hide the others. ``elapsed`` is the job's own duration in seconds.
+    The generator is meant to be consumed on the caller's thread, e.g. to update
+    a UI element per result as it arrives.
+    """
+    if not jobs:
+        return
+
+    def timed(job):
+        started = time.perf_counter()
+        try:
+            return job(), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
+    workers = max_workers or min(len(jobs), MAX_FAN_OUT)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nis-fan-out") as executor:
+        futures = {executor.submit(timed, job): key for key, job in jobs.items()}
+        for future in as_completed(futures):
+            result, error, elapsed = future.result()
+            yield futures[future], result, error, elapsed
+
+
+class NodeStats:
+    """Health and latency bookkeeping for one node."""
+
+    __slots__ = ("url", "client", "bucket", "latency", "height", "alive", "lagging", "failures", "last_probe", "last_error")
+
+    def __init__(self, url, bucket=None):
+        self.url = url
+        self.client = NisClient(url)
+        self.bucket = bucket # Paces requests to this node; probes bypass it
+        self.latency = None # Moving average, seconds
+        self.height = None
+        self.alive = None # None until the first probe finishes
+        self.lagging = False
+        self.failures = 0
+        self.last_probe = None
+        self.last_error = None
+
+    @property
+    def healthy(self):
+        return self.alive is not False and not self.lagging
+
+    def record_latency(self, seconds):
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency = LATENCY_ALPHA * seconds + (1 - LATENCY_ALPHA) * self.latency
+
+    def record_failure(self, error):
+        self.alive = False
+        self.failures += 1
+        self.last_error = str(error)
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "height": self.height,
+            "lagging": self.lagging,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class NodePool(NisApi):
+    """Routes every request to the fastest healthy node, e.g. ``NodePool(["http://a:7890", "http://b:7890"])``."""
+
+    def __init__(self, node_urls, probe_interval=PROBE_INTERVAL, probe_timeout=PROBE_TIMEOUT, max_height_lag=MAX_HEIGHT_LAG,
+                 rate_limit=RATE_LIMIT, rate_burst=RATE_BURST):
+        urls = list(dict.fromkeys(url.rstrip("/") for url in node_urls if url.strip()))
+        if not urls:
+            raise ValueError("NodePool needs at least one node URL")
+        self.nodes = [NodeStats(url, TokenBucket(rate_limit, rate_burst) if rate_limit else None) for url in urls]
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.max_height_lag = max_height_lag
+        self.best_height = None
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._stop = threading.Event()
+        self._thread = None
+        self._probe_executor = ThreadPoolExecutor(max_workers=min(len(self.nodes), 16), thread_name_prefix="nis-probe")
+
+    def __repr__(self):
+        return f"NodePool({[node.url for node in self.nodes]!r})"
+
+    # --- Background probing ---
+    def start(self):
+        """Start the background prober (idempotent). Returns the pool for chaining."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="nis-node-prober", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe_all()
+            self._stop.wait(self.probe_interval)
+
+    def probe_all(self):
+        """Probe every node concurrently, then re-evaluate which ones are lagging."""
+        list(self._probe_executor.map(self._probe, self.nodes))
+        with self._lock:
+            heights = [node.height for node in self.nodes if node.alive and node.height is not None]
+            if heights:
+                self.best_height = max(heights)
+            for node in self.nodes:
+                node.lagging = bool(
+                    node.alive and node.height is not None and self.best_height is not None
+                    and node.height < self.best_height - self.max_height_lag
+                )
+
+    def observe_height(self, height):
+        """Raise ``best_height`` to a height learned elsewhere (e.g. a pushed block) without waiting for a probe."""
+        with self._lock:
+            if self.best_height is None or height > self.best_height:
+                self.best_height = height
+
+    def _probe(self, node):
+        try:
+            started = time.perf_counter()
+            node.client.heartbeat(timeout=self.probe_timeout)
+            elapsed = time.perf_counter() - started
+            height = node.client.chain_height(timeout=self.probe_timeout)
+        except NisError as e:
+            with self._lock:
+                node.record_failure(e)
+                node.last_probe = time.time()
+            return
+        with self._lock:
+            node.record_latency(elapsed)
+            node.height = height
+            node.alive = True
+            node.last_error = None
+            node.last_probe = time.time()
+
+    # --- Request routing ---
+    def ranked(self):
+        """Nodes in the order requests try them: healthy by latency, then the rest as a last resort."""
+        with self._lock:
+            nodes = list(self.nodes)
+        unknown_latency = float("inf")
+        return sorted(nodes, key=lambda n: (not n.healthy, n.latency if n.latency is not None else unknown_latency))
+
+    def request(self, method, path, params=None, body=None, timeout=None):
+        """Send to the fastest healthy node, sharing the answer with identical requests already in flight."""
+        send = lambda: self._send(method, path, params, body, timeout)
+        if path in UNCOALESCED:
+            return send()
+        result, shared = self._flights.do(request_key(method, path, params, body), send)
+        if shared:
+            metrics.inc("nem_coalesced_requests_total", endpoint=path)
+        return result
+
+    def _send(self, method, path, params, body, timeout):
+        nodes = self.ranked()
+        # First choice: the fastest healthy node with a token to spare; queue on the fastest only when all are saturated
+        first = next((node for node in nodes if node.healthy and node.bucket is not None and node.bucket.try_acquire()), None)
+        if first is not None:
+            nodes.remove(first)
+            nodes.insert(0, first)
+        last_error = None
+        queue, retried = deque(nodes), set()
+        while queue:
+            node = queue.popleft()
+            if node is not first and node.bucket is not None:
+                waited = node.bucket.acquire() # Also sits out the pause of a throttling node
+                if waited:
+                    metrics.observe("nem_rate_limit_wait_seconds", waited, node=node.url)
+            first = None # A node tried again pays for its token like the others
+            started = time.perf_counter()
+            try:
+                result = node.client.request(method, path, params=params, body=body, timeout=timeout)
+            except NisError as e:
+                throttled = e.status in THROTTLED
+                if not (e.is_transport_error or throttled or e.status >= 500):
+                    raise # The node answered; another node would say the same
+                metrics.inc("nem_failovers_total", node=node.url)
+                last_error = e
+                if throttled and node.bucket is not None and node not in retried:
+                    node.bucket.pause(THROTTLE_PAUSE) # Alive, just busy: slow down instead of marking it down
+                    with self._lock:
+                        node.last_error = str(e)
+                    retried.add(node)
+                    queue.append(node) # Once more, after every other node
+                    continue
+                with self._lock:
+                    node.record_failure(e)
+                continue
+            with self._lock:
+                node.record_latency(time.perf_counter() - started)
+                node.alive = True
+            return result
+        raise NisError(f"{method} {path}: all {len(self.nodes)} nodes failed ({last_error})")
+
+    def status(self):
+        """Snapshot of per-node statistics in routing order."""
+        return [node.as_dict() for node in self.ranked()]
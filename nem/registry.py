@@ -0,0 +1,210 @@
+"""In-memory registry of the accounts a session manages.
+
+Records use ``__slots__`` and are held in one list with an
+``address -> position`` dictionary beside it, so finding the selected
+account, checking for duplicates and paging through thousands of accounts
+never scans the list. Accounts are key-holding (private key known) or
+watch-only (address, optionally public key). CSV import and export use the
+same ``address,public_key,private_key,label`` layout as the bulk generator's
+download, so a generated set can be exported and imported back::
+
+    registry = AccountRegistry()
+    added, errors = registry.import_csv(open("wallets.csv").read())
+    records, total = registry.page("alice", page=0)
+"""
+import csv
+import io
+
+from .address import Address, InvalidAddress, normalize_address
+from .crypto import TESTNET, KeyPair, derive_keypairs
+
+CSV_FIELDS = ("address", "public_key", "private_key", "label")
+PAGE_SIZE = 20
+
+
+class AccountRecord:
+    """One account; ``address`` is the normalized (plain, upper case) form."""
+
+    __slots__ = ("address", "public_key", "private_key", "label", "_key_pair")
+
+    def __init__(self, address, public_key=None, private_key=None, label=""):
+        self.address = address
+        self.public_key = public_key or None
+        self.private_key = private_key or None
+        self.label = label or ""
+        self._key_pair = None
+
+    def __repr__(self):
+        return f"AccountRecord({self.address!r}, {'key-holding' if self.private_key else 'watch-only'})"
+
+    @property
+    def watch_only(self):
+        return self.private_key is None
+
+    @property
+    def key_pair(self):
+        """The signing ``KeyPair`` (derived once, on first use), or ``None`` for watch-only accounts."""
+        if self._key_pair is None and self.private_key:
+            self._key_pair = KeyPair(self.private_key)
+        return self._key_pair
+
+    def as_dict(self):
+        return {field: getattr(self, field) or "" for field in CSV_FIELDS}
+
+
+class AccountRegistry:
+    """Accounts in insertion order, looked up by address in constant time."""
+
+    def __init__(self, network=TESTNET):
+        self.network = network
+        self._records = []
+        self._positions = {} # normalized address -> index in _records
+        self._search_keys = [] # Lower-case "address label" per record, for search
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __contains__(self, address):
+        return self.get(address) is not None
+
+    def get(self, address):
+        """The record for ``address`` in any spelling, or ``None``."""
+        if not address:
+            return None
+        try:
+            position = self._positions.get(normalize_address(address))
+        except InvalidAddress:
+            return None
+        return self._records[position] if position is not None else None
+
+    def index_of(self, address):
+        record = self.get(address)
+        return self._positions[record.address] if record else None
+
+    def addresses(self):
+        return [record.address for record in self._records]
+
+    # --- Adding ---
+    def add(self, address, public_key=None, private_key=None, label=""):
+        """Add an account (or fill in the keys and label of a known one); returns its record.
+
+        Raises ``InvalidAddress`` for malformed addresses and addresses of
+        another network.
+        """
+        address = Address(address, self.network).plain
+        record = self.get(address)
+        if record is None:
+            record = AccountRecord(address, public_key, private_key, label)
+            self._positions[address] = len(self._records)
+            self._records.append(record)
+            self._search_keys.append(self._search_key(record))
+            return record
+        # A watch-only account becomes key-holding when its key is imported later
+        record.public_key = record.public_key or public_key or None
+        if private_key and not record.private_key:
+            record.private_key, record._key_pair = private_key, None
+        if label and not record.label:
+            record.label = label
+            self._search_keys[self._positions[address]] = self._search_key(record)
+        return record
+
+    def extend(self, accounts):
+        """Add ``{"address", "public_key", "private_key"[, "label"]}`` dicts, e.g. ``generate_keypairs`` output."""
+        for account in accounts:
+            self.add(account["address"], account.get("public_key"), account.get("private_key"), account.get("label", ""))
+
+    @staticmethod
+    def _search_key(record):
+        return f"{record.address} {record.label}".lower()
+
+    # --- Browsing ---
+    def search(self, query=""):
+        """Positions of the records whose address or label contains ``query`` (case ignored; dashes optional in addresses)."""
+        needle = query.strip().lower()
+        if not needle:
+            return range(len(self._records))
+        plain = needle.replace("-", "") # A pretty-printed address; labels are matched as typed
+        return [i for i, key in enumerate(self._search_keys) if needle in key or (plain and plain in key)]
+
+    def page(self, query="", page=0, page_size=PAGE_SIZE):
+        """``(records on page, total matching)`` for ``query``; ``page`` counts from 0."""
+        matches = self.search(query)
+        start = max(page, 0) * page_size
+        return [self._records[i] for i in matches[start:start + page_size]], len(matches)
+
+    # --- Import / export ---
+    def import_csv(self, text, verify=True):
+        """Add accounts from CSV text; returns ``(records added or updated, [(line, error)])``.
+
+        Columns are ``address,public_key,private_key,label``, taken from a
+        header row when there is one. Lines with only an address add a
+        watch-only account. Every private key is derived (in bulk, on a
+        process pool) and its address is the one recorded: a line whose
+        address belongs to another key is rejected, since the account would
+        sign for an address other than the one shown. With ``verify`` a
+        public key column that does not match the private key rejects the
+        line too; without it the derived public key replaces it.
+        """
+        reader = csv.reader(io.StringIO(text))
+        rows, line = [], 1 # (first line of the record in the file, cells); blank lines still count
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                rows.append((line, row))
+            line = reader.line_num + 1 # Quoted cells may span lines
+        fields = CSV_FIELDS
+        if rows and "address" in [cell.strip().lower() for cell in rows[0][1]]:
+            fields = tuple(cell.strip().lower() for cell in rows[0][1])
+            rows = rows[1:]
+        entries = [(line, {field: cell.strip() for field, cell in zip(fields, row)}) for line, row in rows]
+
+        to_derive = [entry for _, entry in entries if entry.get("private_key")]
+        errors = []
+        if to_derive:
+            try:
+                derived = derive_keypairs([entry["private_key"] for entry in to_derive], self.network)
+            except ValueError:
+                derived = [self._derive_one(entry["private_key"]) for entry in to_derive] # Find the bad key(s) line by line
+            for entry, keys in zip(to_derive, derived):
+                entry["_derived"] = keys
+
+        added = 0
+        for line, entry in entries:
+            derived = entry.pop("_derived", None)
+            try:
+                if derived is not None:
+                    if isinstance(derived, Exception):
+                        raise derived
+                    if entry.get("address") and normalize_address(entry["address"]) != normalize_address(derived["address"]):
+                        raise ValueError("private key does not belong to this address")
+                    if verify and entry.get("public_key") and entry["public_key"].lower() != derived["public_key"].lower():
+                        raise ValueError("public key does not belong to this private key")
+                    entry["address"], entry["public_key"] = derived["address"], derived["public_key"]
+                if not entry.get("address"):
+                    raise InvalidAddress("no address or private key")
+                self.add(entry["address"], entry.get("public_key"), entry.get("private_key"), entry.get("label", ""))
+                added += 1
+            except ValueError as e: # InvalidAddress included
+                errors.append((line, str(e)))
+        return added, errors
+
+    def _derive_one(self, private_key):
+        try:
+            key_pair = KeyPair(private_key)
+        except ValueError as e:
+            return e
+        return {"address": key_pair.get_address(self.network), "public_key": key_pair.public_key}
+
+    def export_csv(self, include_private_keys=True):
+        """All accounts as CSV with a header row; ``import_csv`` reads it back."""
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(CSV_FIELDS)
+        for record in self._records:
+            row = record.as_dict()
+            if not include_private_keys:
+                row["private_key"] = ""
+            writer.writerow([row[field] for field in CSV_FIELDS])
+        return out.getvalue()
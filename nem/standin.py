@@ -0,0 +1,284 @@
+"""Local NIS1 stand-in node for offline throughput, pooling and failover tests.
+
+Serves the NIS1 endpoints the apps use from ``nem.mock.get_mock_data``: the
+hand-written fixtures first, then a ``SyntheticChain`` for every other
+address, hash and height. Each endpoint can be given a latency distribution,
+an error rate and a request rate limit, so a pool of stand-ins on different
+ports can imitate fast, slow, flaky and throttled nodes reproducibly.
+
+Run one from the command line::
+
+    python -m nem.standin --port 7890 --latency "*=lognormal:40:0.5" --errors /account/get=0.05:503
+    python -m nem.standin --port 7891 --latency "*=200-800" --rate "*=20" --errors "*=0.2:drop"
+
+or start one in-process with ``start_standin()``, which returns the server
+and its base URL. ``GET /standin/stats`` reports request, error and
+throttle counts per endpoint.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .address import Address
+from .crypto import keccak_256, verify
+from .flow import TokenBucket
+from .mock import SYNTHETIC_CHAIN, get_mock_data
+from .synthetic import SyntheticChain
+
+DEFAULT_PORT = 7890
+ANY_ENDPOINT = "*"
+NEM_EPOCH_MS = 1427587585 * 1000
+BLOCKS_AFTER_COUNT = 10 # Blocks per /local/chain/blocks-after response, as NIS
+
+
+class Latency:
+    """A latency distribution in milliseconds, parsed from ``"50"``, ``"20-200"`` or ``"lognormal:MEDIAN:SIGMA"``."""
+
+    def __init__(self, spec="0"):
+        self.spec = spec
+        if spec.startswith("lognormal:"):
+            _, median, sigma = spec.split(":")
+            mu, sigma = math.log(float(median)), float(sigma)
+            self._sample = lambda: random.lognormvariate(mu, sigma)
+        elif "-" in spec:
+            low, high = (float(part) for part in spec.split("-", 1))
+            self._sample = lambda: random.uniform(low, high)
+        else:
+            fixed = float(spec)
+            self._sample = lambda: fixed
+
+    def sample_seconds(self):
+        return self._sample() / 1000.0
+
+
+class EndpointProfile:
+    """Behaviour of one endpoint: latency, injected failures (an HTTP status or ``"drop"``) and rate limit."""
+
+    def __init__(self, latency="0", error_rate=0.0, error_status=500, rate=None):
+        self.latency = latency if isinstance(latency, Latency) else Latency(str(latency))
+        self.error_rate = float(error_rate)
+        self.error_status = error_status
+        self.bucket = TokenBucket(rate) if rate else None
+
+    def __repr__(self):
+        return f"EndpointProfile(latency={self.latency.spec!r}, error_rate={self.error_rate}, error_status={self.error_status!r})"
+
+
+class StandinServer(ThreadingHTTPServer):
+    """HTTP/1.1 keep-alive server; ``profiles`` maps endpoint paths (or ``"*"``) to ``EndpointProfile``."""
+
+    daemon_threads = True
+
+    def __init__(self, address, profiles=None, chain=None, verify_signatures=False):
+        super().__init__(address, StandinHandler)
+        self.profiles = profiles or {}
+        self.chain = chain or SYNTHETIC_CHAIN
+        self.verify_signatures = verify_signatures
+        self.stats = {} # endpoint -> {"requests", "errors", "throttled", "dropped"}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def profile(self, endpoint):
+        return self.profiles.get(endpoint) or self.profiles.get(ANY_ENDPOINT)
+
+    def count(self, endpoint, outcome):
+        with self._stats_lock:
+            counters = self.stats.setdefault(endpoint, {"requests": 0, "errors": 0, "throttled": 0, "dropped": 0})
+            counters[outcome] += 1
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep connections alive so client pooling can be measured
+    disable_nagle_algorithm = True # Headers and body are separate writes; don't wait for delayed ACKs
+
+    def log_message(self, format, *args):
+        pass # One line per request would dominate load tests
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        parts = urlsplit(self.path)
+        endpoint = parts.path.rstrip("/") or "/"
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        body = None
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                return self._error(400, "Bad Request", "request body is not valid JSON")
+
+        if endpoint == "/standin/stats":
+            with self.server._stats_lock:
+                return self._reply(200, self.server.stats)
+
+        server = self.server
+        server.count(endpoint, "requests")
+        profile = server.profile(endpoint)
+        if profile is not None:
+            if profile.bucket is not None and not profile.bucket.try_acquire():
+                server.count(endpoint, "throttled")
+                return self._error(429, "Too Many Requests", "request rate limit exceeded")
+            time.sleep(profile.latency.sample_seconds())
+            if profile.error_rate and random.random() < profile.error_rate:
+                if profile.error_status == "drop": # Imitate a node that resets the connection
+                    server.count(endpoint, "dropped")
+                    self.close_connection = True
+                    return
+                server.count(endpoint, "errors")
+                return self._error(int(profile.error_status), "Injected Failure", "stand-in failure injection")
+
+        try:
+            status, data = self._resolve(method, endpoint, params, body)
+        except (KeyError, TypeError, ValueError) as e:
+            status, data = 400, str(e)
+        if status != 200:
+            return self._error(status, "Not Found" if status == 404 else "Bad Request", data)
+        return self._reply(200, data)
+
+    def _resolve(self, method, endpoint, params, body):
+        """Return ``(200, json)`` or ``(status, message)`` for one request."""
+        chain = self.server.chain
+        if endpoint == "/transaction/announce" and method == "POST":
+            return self._announce(body or {})
+        if endpoint == "/chain/height":
+            return 200, {"height": chain.height} # The tip of the chain served here, not the demo fixture's
+        if endpoint == "/time-sync/network-time":
+            now = int(time.time() * 1000) - NEM_EPOCH_MS
+            return 200, {"sendTimeStamp": now, "receiveTimeStamp": now}
+        if endpoint == "/block/at/public" and method == "POST":
+            params = {"height": (body or {})["height"]}
+        if endpoint == "/local/chain/blocks-after" and method == "POST":
+            return 200, {"data": self._blocks_after(chain, int((body or {})["height"]))}
+        if endpoint == "/account/get":
+            address = params.get("address", "")
+            if not Address.is_valid(address):
+                return 400, "invalid address"
+            data, error = get_mock_data(endpoint, params, chain)
+            return 200, _empty_account(address) if error else data # NIS answers unseen accounts with an empty one
+        data, error = get_mock_data(endpoint, params, chain)
+        if error:
+            return 404, error
+        return 200, data
+
+    def _blocks_after(self, chain, height):
+        blocks = []
+        for h in range(height + 1, min(height + BLOCKS_AFTER_COUNT, chain.height) + 1):
+            block = chain.block(h)
+            first = (h - 1) * chain.per_block
+            txes = [{"tx": tx, "hash": chain.transaction_hash(first + i), "innerHash": {}} for i, tx in enumerate(block["transactions"])]
+            blocks.append({"block": block, "hash": chain.block_hash(h), "txes": txes, "difficulty": 100000000000000})
+        return blocks
+
+    def _announce(self, request):
+        data = bytes.fromhex(request["data"])
+        signature = bytes.fromhex(request["signature"])
+        if len(signature) != 64 or len(data) < 48:
+            return 400, "malformed transaction"
+        if self.server.verify_signatures and not verify(data[16:48].hex(), data, signature): # Signer key follows type, version, timestamp, length
+            return 200, {"type": 1, "code": 7, "message": "FAILURE_SIGNATURE_NOT_VERIFIABLE", "transactionHash": {"data": None}}
+        return 200, {"type": 1, "code": 1, "message": "SUCCESS", "transactionHash": {"data": keccak_256(data).hex()}}
+
+    def _error(self, status, error, message):
+        """Reply with a NIS-style error body."""
+        body = {"timeStamp": int(time.time() * 1000) - NEM_EPOCH_MS, "error": error, "message": message, "status": status}
+        return self._reply(status, body)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _empty_account(address):
+    return {
+        "meta": {"cosignatories": [], "cosignatoryOf": [], "status": "LOCKED", "remoteStatus": "INACTIVE"},
+        "account": {"address": address, "balance": 0, "vestedBalance": 0, "importance": 0.0,
+                    "publicKey": None, "label": None, "harvestedBlocks": 0, "multisigInfo": {}},
+    }
+
+
+def start_standin(host="127.0.0.1", port=0, profiles=None, chain=None, verify_signatures=False):
+    """Start a stand-in on a daemon thread; returns ``(server, url)``. Port 0 picks a free port."""
+    server = StandinServer((host, port), profiles, chain, verify_signatures)
+    threading.Thread(target=server.serve_forever, name=f"nis-standin-{server.server_address[1]}", daemon=True).start()
+    return server, server.url
+
+
+def _parse_assignments(values):
+    """``["PATH=VALUE", ...]`` -> ``{PATH: VALUE}``; ``*`` applies to every endpoint without its own entry."""
+    assignments = {}
+    for value in values or ():
+        path, _, setting = value.partition("=")
+        if not setting:
+            raise argparse.ArgumentTypeError(f"Expected PATH=VALUE, got {value!r}")
+        assignments[path] = setting
+    return assignments
+
+
+def build_profiles(latency=None, errors=None, rate=None):
+    """Combine ``--latency``/``--errors``/``--rate`` assignments into per-endpoint profiles."""
+    latency, errors, rate = _parse_assignments(latency), _parse_assignments(errors), _parse_assignments(rate)
+    profiles = {}
+    for path in set(latency) | set(errors) | set(rate):
+        error_rate, _, status = errors.get(path, errors.get(ANY_ENDPOINT, "0")).partition(":")
+        profiles[path] = EndpointProfile(
+            latency=latency.get(path, latency.get(ANY_ENDPOINT, "0")),
+            error_rate=error_rate,
+            error_status=status if status == "drop" else int(status or 500),
+            rate=rate.get(path, rate.get(ANY_ENDPOINT)),
+        )
+    return profiles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local NIS1 stand-in node")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", action="append", metavar="PATH=DIST", help='e.g. "*=50", "/account/get=20-200", "*=lognormal:40:0.5" (ms)')
+    parser.add_argument("--errors", action="append", metavar="PATH=RATE[:STATUS]", help='e.g. "/account/get=0.05:503" or "*=0.1:drop"')
+    parser.add_argument("--rate", action="append", metavar="PATH=RPS", help="Token-bucket limit; excess requests get 429")
+    parser.add_argument("--seed", help="Seed of the synthetic chain (default: the demo chain)")
+    parser.add_argument("--accounts", type=int, help="Accounts in the synthetic chain")
+    parser.add_argument("--height", type=int, help="Height of the synthetic chain")
+    parser.add_argument("--verify-signatures", action="store_true", help="Reject announces with bad signatures (slow)")
+    args = parser.parse_args(argv)
+
+    chain = None
+    if args.seed or args.accounts or args.height:
+        chain = SyntheticChain(
+            seed=args.seed or "nem-demo-vn",
+            accounts=args.accounts or SYNTHETIC_CHAIN.accounts,
+            height=args.height or SYNTHETIC_CHAIN.height,
+        )
+    profiles = build_profiles(args.latency, args.errors, args.rate)
+    server = StandinServer((args.host, args.port), profiles, chain, args.verify_signatures)
+    print(f"NIS1 stand-in listening on {server.url}")
+    for path, profile in sorted(profiles.items()):
+        print(f"  {path}: {profile}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""Push updates from a node's websocket (STOMP) channel.
+
+NIS1 publishes events over STOMP on ``ws://host:7778/w/messages/websocket``:
+
+* ``/blocks/new``: ``{"height"}`` of every new block
+* ``/unconfirmed/{address}``: transactions touching the address as they are announced
+* ``/transactions/{address}``: the same once they are included in a block
+* ``/account/{address}``: the account's new AccountMetaDataPair after a change
+
+``get_stream(node_url)`` returns the process-wide ``NodeStream`` for a node:
+one websocket, reconnected with backoff, whose subscriptions are shared by
+every listener in the process (a destination is subscribed on the node once,
+however many sessions listen to it). ``get_pool_stream(pool)`` returns one
+that connects to a ``NodePool``'s best-ranked node and moves to another on
+every reconnect, as the pool's REST calls do. Listeners are called on the
+stream's thread and must be quick.
+
+``LiveUpdates`` connects such a stream to a ``HeightCache``: new blocks move
+the pool's height forward at once instead of at the next probe, pushed
+account data replaces the cached entry in place, and confirmed transfers
+invalidate the addresses they touch. Readers of the cache then see changes
+within a block time without anyone polling the node.
+
+The ``websockets`` package is optional; without it ``available()`` is false
+and the apps fall back to per-block cache expiry.
+"""
+import importlib.util
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+from . import metrics
+
+WEBSOCKET_PORT = 7778 # NIS serves websockets here (and the REST API on 7890)
+WEBSOCKET_TLS_PORT = 7779
+WEBSOCKET_PATH = "/w/messages/websocket" # SockJS raw websocket transport, plain STOMP frames
+RECONNECT_MIN = 1.0 # Seconds before the first reconnect attempt
+RECONNECT_MAX = 60.0 # Upper bound of the exponential reconnect backoff
+OPEN_TIMEOUT = 10.0
+PENDING_PER_ADDRESS = 100 # Unconfirmed transactions remembered per address
+VIEWER_TTL = 120.0 # Seconds a viewer's addresses stay tracked without another ``watch`` call
+
+_streams = {}
+_lock = threading.Lock()
+
+
+def available():
+    """True when the optional ``websockets`` package is installed."""
+    return importlib.util.find_spec("websockets") is not None
+
+
+def websocket_url(node_url, port=None):
+    """``http://host:7890`` -> ``ws://host:7778/w/messages/websocket`` (``https`` maps to ``wss`` on 7779)."""
+    parts = urlsplit(node_url if "://" in node_url else f"http://{node_url}")
+    secure = parts.scheme in ("https", "wss")
+    port = port or (WEBSOCKET_TLS_PORT if secure else WEBSOCKET_PORT)
+    return f"{'wss' if secure else 'ws'}://{parts.hostname}:{port}{WEBSOCKET_PATH}"
+
+
+# --- STOMP frames ---
+def encode_frame(command, headers=None, body=""):
+    lines = [command] + [f"{key}:{value}" for key, value in (headers or {}).items()]
+    return "\n".join(lines) + "\n\n" + body + "\0"
+
+
+def decode_frame(text):
+    """``(command, headers, body)`` of one frame, or ``None`` for a heart-beat."""
+    text = text.rstrip("\0").lstrip("\r\n")
+    if not text:
+        return None
+    head, _, body = text.partition("\n\n")
+    command, *header_lines = head.replace("\r\n", "\n").split("\n")
+    headers = {}
+    for line in header_lines:
+        key, _, value = line.partition(":")
+        headers.setdefault(key, value) # STOMP: the first occurrence of a repeated header wins
+    return command, headers, body
+
+
+class NodeStream:
+    """Shared STOMP subscription connection to one node, e.g. ``get_stream("http://bob.nem.ninja:7890")``.
+
+    With ``pool`` (a ``NodePool``) every (re)connect goes to the pool's
+    best-ranked node, so a node the pool has marked down is left behind.
+    """
+
+    def __init__(self, node_url, ws_url=None, pool=None):
+        self.node_url = node_url.rstrip("/")
+        self.ws_url = ws_url or websocket_url(node_url)
+        self.pool = pool
+        self.connected = False
+        self.reconnects = 0
+        self.switches = 0 # Times a pool stream moved to another node
+        self.last_event = None # time.time() of the last message
+        self.last_error = None
+        self._listeners = defaultdict(dict) # destination -> {token: callback}
+        self._subscription_ids = {} # destination -> STOMP subscription id on the current connection
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._outbox = None # asyncio.Queue of frames, created on the stream thread
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __repr__(self):
+        return f"NodeStream({self.ws_url!r})"
+
+    # --- Listeners (any thread) ---
+    def subscribe(self, destination, callback):
+        """Call ``callback(body)`` for every message on ``destination``; returns a token for ``unsubscribe``."""
+        token = next(self._tokens)
+        with self._lock:
+            first = not self._listeners[destination]
+            self._listeners[destination][token] = callback
+        if first:
+            self._send_threadsafe(("subscribe", destination))
+        return (destination, token)
+
+    def unsubscribe(self, token):
+        destination, key = token
+        with self._lock:
+            listeners = self._listeners.get(destination, {})
+            listeners.pop(key, None)
+            last = not listeners
+            if last:
+                self._listeners.pop(destination, None)
+        if last:
+            self._send_threadsafe(("unsubscribe", destination))
+
+    def destinations(self):
+        with self._lock:
+            return sorted(self._listeners)
+
+    def _send_threadsafe(self, command):
+        loop, outbox = self._loop, self._outbox
+        if loop is not None and outbox is not None and self.connected:
+            loop.call_soon_threadsafe(outbox.put_nowait, command)
+        # Otherwise the (re)connect subscribes every destination that has listeners
+
+    # --- Connection thread ---
+    def start(self):
+        """Connect in the background (idempotent). Returns the stream for chaining."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"nis-stream-{self.node_url}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        loop, outbox = self._loop, self._outbox
+        if loop is not None and outbox is not None:
+            loop.call_soon_threadsafe(outbox.put_nowait, ("close", None))
+
+    def _run(self):
+        import asyncio
+
+        asyncio.run(self._main())
+
+    async def _main(self):
+        import asyncio
+
+        delay = RECONNECT_MIN
+        self._pick()
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                await self._session()
+            except Exception as e: # Connection refused, dropped, protocol errors: all end in a reconnect
+                self.last_error = str(e)
+                metrics.inc("nem_stream_errors_total", node=self.node_url)
+            self.connected = False
+            if self._stop.is_set():
+                return
+            if time.monotonic() - started > RECONNECT_MAX:
+                delay = RECONNECT_MIN # The connection was up for a while; start the backoff again
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = RECONNECT_MIN if self._pick() else min(delay * 2, RECONNECT_MAX) # A new node starts a fresh backoff
+
+    def _pick(self):
+        """Move to the pool's best-ranked node; True when that is a different node."""
+        if self.pool is None:
+            return False
+        node_url = self.pool.ranked()[0].url.rstrip("/")
+        if node_url == self.node_url:
+            return False
+        self.node_url, self.ws_url = node_url, websocket_url(node_url)
+        self.switches += 1
+        return True
+
+    async def _session(self):
+        import asyncio
+        import websockets
+
+        async with websockets.connect(self.ws_url, open_timeout=OPEN_TIMEOUT) as ws:
+            await ws.send(encode_frame("CONNECT", {"accept-version": "1.1,1.0", "heart-beat": "0,0"}))
+            frame = decode_frame(await asyncio.wait_for(ws.recv(), OPEN_TIMEOUT))
+            if not frame or frame[0] != "CONNECTED":
+                raise ConnectionError(f"STOMP handshake failed: {frame and frame[0]}")
+            self._loop, self._outbox = asyncio.get_running_loop(), asyncio.Queue()
+            self._subscription_ids = {}
+            self.connected = True
+            self.last_error = None
+            for destination in self.destinations():
+                await self._subscribe(ws, destination)
+            reader = asyncio.ensure_future(self._read(ws))
+            try:
+                while True:
+                    getter = asyncio.ensure_future(self._outbox.get())
+                    done, _ = await asyncio.wait({reader, getter}, return_when=asyncio.FIRST_COMPLETED)
+                    if reader in done:
+                        getter.cancel()
+                        reader.result() # Raises the connection error, if any
+                        return
+                    command, destination = getter.result()
+                    if command == "close":
+                        return
+                    if command == "subscribe" and destination not in self._subscription_ids:
+                        await self._subscribe(ws, destination)
+                    elif command == "unsubscribe" and destination in self._subscription_ids:
+                        await ws.send(encode_frame("UNSUBSCRIBE", {"id": self._subscription_ids.pop(destination)}))
+            finally:
+                reader.cancel()
+                self._outbox = None
+
+    async def _subscribe(self, ws, destination):
+        subscription_id = f"sub-{next(self._tokens)}"
+        self._subscription_ids[destination] = subscription_id
+        await ws.send(encode_frame("SUBSCRIBE", {"id": subscription_id, "destination": destination}))
+
+    async def _read(self, ws):
+        async for message in ws:
+            frame = decode_frame(message if isinstance(message, str) else message.decode("utf-8"))
+            if frame is None:
+                continue
+            command, headers, body = frame
+            if command == "ERROR":
+                raise ConnectionError(f"STOMP error: {headers.get('message') or body}")
+            if command == "MESSAGE":
+                self._dispatch(headers.get("destination"), body)
+
+    def _dispatch(self, destination, body):
+        self.last_event = time.time()
+        metrics.inc("nem_stream_messages_total", node=self.node_url, topic=destination.split("/")[1] if destination else "")
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = body
+        with self._lock:
+            callbacks = list(self._listeners.get(destination, {}).values())
+        for callback in callbacks:
+            try:
+                callback(data)
+            except Exception: # One broken listener must not stop the others or the connection
+                metrics.inc("nem_stream_errors_total", node=self.node_url)
+
+    def status(self):
+        return {
+            "url": self.ws_url,
+            "connected": self.connected,
+            "subscriptions": len(self.destinations()),
+            "reconnects": self.reconnects,
+            "switches": self.switches,
+            "last_event": self.last_event,
+            "last_error": self.last_error,
+        }
+
+
+def get_stream(node_url):
+    """The process-wide, started ``NodeStream`` for ``node_url``."""
+    key = node_url.rstrip("/")
+    with _lock:
+        stream = _streams.get(key)
+        if stream is None:
+            stream = _streams[key] = NodeStream(key).start()
+    return stream
+
+
+def get_pool_stream(pool):
+    """The process-wide, started ``NodeStream`` that follows ``pool``'s best-ranked node."""
+    key = tuple(node.url for node in pool.nodes)
+    with _lock:
+        stream = _streams.get(key)
+        if stream is None:
+            stream = _streams[key] = NodeStream(pool.ranked()[0].url, pool=pool).start()
+    return stream
+
+
+class LiveUpdates:
+    """Keeps a ``HeightCache`` current from one node's push events.
+
+    ``pool`` (optional) is a ``NodePool`` whose best height is moved forward
+    on every new block, which is what expires the cache's per-height entries.
+    Each viewer (e.g. an app session) calls ``watch(viewer, addresses)`` with
+    the addresses it shows; an address is tracked while any viewer shows it.
+    """
+
+    def __init__(self, stream, cache, pool=None):
+        self.stream = stream
+        self.cache = cache
+        self.pool = pool
+        self.height = None
+        self._tracked = {} # address -> subscription tokens
+        self._viewers = {} # viewer -> (addresses, time.monotonic() of its last watch call)
+        self._versions = defaultdict(int) # address -> bumped on every event touching it
+        self._pending = defaultdict(lambda: deque(maxlen=PENDING_PER_ADDRESS)) # address -> unconfirmed hashes
+        self._unconfirmed_listeners = []
+        self._lock = threading.Lock()
+        self._watch_lock = threading.Lock()
+        self._block_token = stream.subscribe("/blocks/new", self._on_block)
+
+    def close(self):
+        self.stream.unsubscribe(self._block_token)
+        with self._lock:
+            tracked, self._tracked = self._tracked, {}
+            self._viewers = {}
+        for tokens in tracked.values():
+            for token in tokens:
+                self.stream.unsubscribe(token)
+
+    def track(self, address):
+        """Subscribe to ``address``'s account, unconfirmed and confirmed events (idempotent)."""
+        with self._lock:
+            if address in self._tracked:
+                return
+            self._tracked[address] = None # Reserve before subscribing; the callbacks may fire right away
+        tokens = [
+            self.stream.subscribe(f"/account/{address}", lambda data: self._on_account(address, data)),
+            self.stream.subscribe(f"/unconfirmed/{address}", lambda data: self._on_unconfirmed(address, data)),
+            self.stream.subscribe(f"/transactions/{address}", lambda data: self._on_confirmed(address, data)),
+        ]
+        with self._lock:
+            self._tracked[address] = tokens
+
+    def untrack(self, address):
+        """Drop ``address``'s subscriptions; its pending hashes are forgotten, since confirmations no longer arrive."""
+        with self._lock:
+            tokens = self._tracked.pop(address, None)
+            self._pending.pop(address, None)
+        for token in tokens or ():
+            self.stream.unsubscribe(token)
+        self._bump(address)
+
+    def watch(self, viewer, addresses):
+        """Track exactly ``addresses`` for ``viewer``; addresses no viewer shows any more are untracked.
+
+        Viewers that have not called this for ``VIEWER_TTL`` seconds (closed
+        sessions) no longer count.
+        """
+        now = time.monotonic()
+        addresses = frozenset(addresses)
+        with self._watch_lock: # Another viewer's watch must not untrack what this one is about to show
+            with self._lock:
+                self._viewers[viewer] = (addresses, now)
+                for stale in [v for v, (_, seen) in self._viewers.items() if now - seen > VIEWER_TTL]:
+                    del self._viewers[stale]
+                wanted = frozenset().union(*(shown for shown, _ in self._viewers.values()))
+                dropped = [address for address in self._tracked if address not in wanted]
+            for address in addresses:
+                self.track(address)
+            for address in dropped:
+                self.untrack(address)
+
+    def tracked(self):
+        with self._lock:
+            return sorted(self._tracked)
+
+    def version(self, address):
+        """Counter bumped by every event for ``address``; compare two reads to see if anything changed."""
+        with self._lock:
+            return self._versions.get(address, 0)
+
+    def on_unconfirmed(self, callback):
+        """Call ``callback(tx_hash)`` (on the stream thread) for every new unconfirmed hash of a tracked address."""
+        self._unconfirmed_listeners.append(callback)
+
+    def pending(self, address):
+        """Hashes of transactions announced for ``address`` and not yet seen confirmed, oldest first."""
+        with self._lock:
+            return list(self._pending.get(address, ()))
+
+    # --- Event handlers (stream thread) ---
+    def _on_block(self, data):
+        height = data.get("height") if isinstance(data, dict) else None
+        if height is None:
+            return
+        self.height = height
+        if self.pool is not None:
+            self.pool.observe_height(height)
+
+    def _on_account(self, address, data):
+        if isinstance(data, dict) and "account" in data:
+            self.cache.put("account", address, data) # The pushed AccountMetaDataPair is what /account/get returns
+        self._bump(address)
+
+    def _on_unconfirmed(self, address, data):
+        tx_hash = _hash_of(data)
+        with self._lock:
+            new = bool(tx_hash) and tx_hash not in self._pending[address]
+            if new:
+                self._pending[address].append(tx_hash)
+        self._bump(address)
+        if new:
+            for callback in list(self._unconfirmed_listeners):
+                callback(tx_hash)
+
+    def _on_confirmed(self, address, data):
+        tx_hash = _hash_of(data)
+        with self._lock:
+            pending = self._pending.get(address)
+            if pending and tx_hash in pending:
+                pending.remove(tx_hash)
+        self.cache.invalidate(address) # Balance and history changed; the next read refetches them
+        self._bump(address)
+
+    def _bump(self, address):
+        with self._lock:
+            self._versions[address] += 1
+
+
+def _hash_of(data):
+    """Transaction hash of a pushed ``{"meta": {"hash": {"data"}}, "transaction"}`` pair, if present."""
+    if not isinstance(data, dict):
+        return None
+    return ((data.get("meta") or {}).get("hash") or {}).get("data")
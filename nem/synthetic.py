@@ -0,0 +1,266 @@
+"""Deterministic synthetic NIS1 chain for demos and load tests.
+
+``SyntheticChain`` answers node-style lookups (accounts, transfers, blocks,
+transactions) for millions of accounts and transfers without storing any of
+them. Everything is derived on demand from the seed and the key asked for:
+
+* Transfer ``n`` (0-based, chain order) sits in block ``n // per_block + 1``.
+  In round ``r = n // accounts`` it is sent by account ``i = n % accounts``
+  to account ``(i + 1 + r % (accounts - 1)) % accounts``.
+* Amounts, fees and messages repeat with the round over a short seed-derived
+  table, so an account's totals are closed-form sums: balances always equal
+  the genesis allocation plus received minus sent and fees, in O(1).
+* Addresses embed the account index, and transaction hashes embed ``n``,
+  each behind a keyed tag. Lookup by address, hash or height is arithmetic
+  plus one check; unknown or forged keys are simply not found.
+
+Public keys are synthetic (they do not derive the matching address).
+"""
+import base64
+import functools
+import hashlib
+
+from .address import Address, InvalidAddress
+from .crypto import MAINNET, keccak_256
+from .client import TRANSFERS_PAGE_SIZE
+from .history import TRANSFER_TYPE
+from .transactions import DEADLINE_SECONDS, minimum_fee
+
+DEFAULT_ACCOUNTS = 1_000_000
+DEFAULT_HEIGHT = 4_012_345
+TRANSFERS_PER_BLOCK = 4
+BLOCK_SECONDS = 60
+PERIOD = 101 # Length of the repeating amount/message table (prime, so it drifts against the account count)
+MESSAGES = ("", "", "", "invoice paid", "thanks!", "load test", "refund", "")
+GENESIS_EXTRA = 10_000_000_000 # Up to 10,000 XEM left over after every transfer an account makes
+
+
+def _signed_version(network):
+    version = (network << 24) | 1
+    return version - (1 << 32) if version >= 1 << 31 else version
+
+
+class SyntheticChain:
+    """A chain of ``height`` blocks and ``accounts`` accounts, e.g. ``SyntheticChain(seed="demo")``."""
+
+    def __init__(self, seed="nem", accounts=DEFAULT_ACCOUNTS, height=DEFAULT_HEIGHT, per_block=TRANSFERS_PER_BLOCK, network=MAINNET):
+        if accounts < 2:
+            raise ValueError("A synthetic chain needs at least two accounts")
+        self.key = hashlib.blake2b(str(seed).encode("utf-8"), digest_size=32).digest()
+        self.accounts = accounts
+        self.height = height
+        self.per_block = per_block
+        self.network = network
+        self.transfers = height * per_block
+        self._version = _signed_version(network)
+        self.address = functools.lru_cache(maxsize=65536)(self._address) # Page renders repeat the same accounts
+
+        # Per-round amount, message and fee tables, with prefix sums for closed-form totals
+        self._amounts, self._messages, self._fees = [], [], []
+        for p in range(PERIOD):
+            digest = self._digest(b"round", p)
+            self._amounts.append(100_000 + int.from_bytes(digest[:8], "big") % 50_000_000) # 0.1 to 50 XEM
+            message = MESSAGES[digest[8] % len(MESSAGES)].encode("utf-8")
+            self._messages.append(message)
+            self._fees.append(minimum_fee(self._amounts[-1], message))
+        self._amount_prefix = self._prefix(self._amounts)
+        self._spent_prefix = self._prefix([a + f for a, f in zip(self._amounts, self._fees)])
+        self._fee_prefix = self._prefix(self._fees)
+
+    @staticmethod
+    def _prefix(values):
+        sums = [0]
+        for value in values:
+            sums.append(sums[-1] + value)
+        return sums
+
+    @staticmethod
+    def _periodic_sum(prefix, rounds):
+        """Sum of the per-round table over rounds ``0 .. rounds - 1``."""
+        return (rounds // PERIOD) * prefix[PERIOD] + prefix[rounds % PERIOD]
+
+    def _digest(self, kind, number, size=32):
+        return hashlib.blake2b(kind + number.to_bytes(8, "big"), key=self.key, digest_size=size).digest()
+
+    # --- Keys ---
+    def _address(self, index):
+        """Plain address of account ``index``: a keyed tag, then the index, then the NIS checksum."""
+        raw = bytes([self.network]) + self._digest(b"account", index, 12) + index.to_bytes(8, "big")
+        return base64.b32encode(raw + keccak_256(raw)[:4]).decode("ascii")
+
+    def account_index(self, address):
+        """Index of a synthetic address, or ``None`` for any other address."""
+        try:
+            raw = Address(address, self.network).raw
+        except InvalidAddress:
+            return None
+        index = int.from_bytes(raw[13:21], "big")
+        if index >= self.accounts or raw[1:13] != self._digest(b"account", index, 12):
+            return None
+        return index
+
+    def public_key(self, index):
+        return self._digest(b"public-key", index).hex()
+
+    def transaction_hash(self, n):
+        return (self._digest(b"transaction", n, 24) + n.to_bytes(8, "big")).hex()
+
+    def transaction_number(self, tx_hash):
+        """``n`` for a synthetic transaction hash, or ``None``."""
+        try:
+            raw = bytes.fromhex(tx_hash)
+        except (TypeError, ValueError):
+            return None
+        if len(raw) != 32:
+            return None
+        n = int.from_bytes(raw[24:], "big")
+        if n >= self.transfers or raw[:24] != self._digest(b"transaction", n, 24):
+            return None
+        return n
+
+    def block_hash(self, height):
+        return self._digest(b"block", height).hex()
+
+    # --- Transfer layout ---
+    def sender_of(self, n):
+        return n % self.accounts
+
+    def recipient_of(self, n):
+        round_, sender = divmod(n, self.accounts)
+        return (sender + 1 + round_ % (self.accounts - 1)) % self.accounts
+
+    def _incoming_number(self, index, round_):
+        """Transfer paying account ``index`` in ``round_`` (every round pays every account once)."""
+        sender = (index - 1 - round_ % (self.accounts - 1)) % self.accounts
+        return round_ * self.accounts + sender
+
+    def _rounds_sent(self, index):
+        return max(0, (self.transfers - index + self.accounts - 1) // self.accounts)
+
+    def _received(self, index):
+        full_rounds, remainder = divmod(self.transfers, self.accounts)
+        received = self._periodic_sum(self._amount_prefix, full_rounds)
+        count = full_rounds
+        if remainder and self._incoming_number(index, full_rounds) < self.transfers:
+            received += self._amounts[full_rounds % PERIOD]
+            count += 1
+        return received, count
+
+    # --- Node-style views ---
+    def account(self, address):
+        """``/account/get`` response (AccountMetaDataPair) for a synthetic address, else ``None``."""
+        index = self.account_index(address)
+        if index is None:
+            return None
+        sent_rounds = self._rounds_sent(index)
+        spent = self._periodic_sum(self._spent_prefix, sent_rounds)
+        received, _ = self._received(index)
+        genesis = spent + int.from_bytes(self._digest(b"genesis", index, 8), "big") % GENESIS_EXTRA
+        balance = genesis + received - spent
+        return {
+            "meta": {"cosignatories": [], "cosignatoryOf": [], "status": "LOCKED", "remoteStatus": "INACTIVE"},
+            "account": {
+                "address": self.address(index),
+                "harvestedBlocks": len(range(index or self.accounts, self.height + 1, self.accounts)), # Block h is harvested by h % accounts
+                "balance": balance,
+                "vestedBalance": balance * 9 // 10,
+                "importance": balance / (self.accounts * GENESIS_EXTRA),
+                "publicKey": self.public_key(index),
+                "label": None,
+                "multisigInfo": {},
+            },
+        }
+
+    def account_totals(self, address):
+        """Closed-form received/sent/fees (microXEM) and counts for a synthetic address, else ``None``."""
+        index = self.account_index(address)
+        if index is None:
+            return None
+        sent_rounds = self._rounds_sent(index)
+        received, incoming = self._received(index)
+        return {
+            "received": received,
+            "incoming": incoming,
+            "sent": self._periodic_sum(self._amount_prefix, sent_rounds),
+            "fees": self._periodic_sum(self._fee_prefix, sent_rounds),
+            "outgoing": sent_rounds,
+        }
+
+    def transaction_json(self, n):
+        """The NIS transaction dict of transfer ``n``."""
+        height, slot = divmod(n, self.per_block)
+        timestamp = (height + 1) * BLOCK_SECONDS - self.per_block + slot # Just before its block
+        period = (n // self.accounts) % PERIOD
+        message = self._messages[period]
+        return {
+            "timeStamp": timestamp,
+            "amount": self._amounts[period],
+            "signature": (self._digest(b"signature", n) + self._digest(b"signature-2", n)).hex(),
+            "fee": self._fees[period],
+            "recipient": self.address(self.recipient_of(n)),
+            "type": TRANSFER_TYPE,
+            "deadline": timestamp + DEADLINE_SECONDS,
+            "message": {"payload": message.hex(), "type": 1} if message else {},
+            "version": self._version,
+            "signer": self.public_key(self.sender_of(n)),
+        }
+
+    def transaction(self, n):
+        """TransactionMetaDataPair of transfer ``n`` as ``/transaction/get`` returns it."""
+        return {
+            "meta": {"innerHash": {}, "id": n + 1, "hash": {"data": self.transaction_hash(n)}, "height": n // self.per_block + 1},
+            "transaction": self.transaction_json(n),
+        }
+
+    def transaction_by_hash(self, tx_hash):
+        n = self.transaction_number(tx_hash)
+        return None if n is None else self.transaction(n)
+
+    def block(self, height):
+        """``/block/at/public`` response for ``height``, else ``None``."""
+        if not 1 <= height <= self.height:
+            return None
+        first = (height - 1) * self.per_block
+        return {
+            "timeStamp": height * BLOCK_SECONDS,
+            "signature": (self._digest(b"block-signature", height) + self._digest(b"block-signature-2", height)).hex(),
+            "prevBlockHash": {"data": self.block_hash(height - 1)},
+            "type": 1,
+            "transactions": [self.transaction_json(n) for n in range(first, first + self.per_block)],
+            "version": self._version,
+            "signer": self.public_key(height % self.accounts),
+            "height": height,
+        }
+
+    def _outgoing_numbers(self, index, below):
+        n = index + ((below - 1 - index) // self.accounts) * self.accounts if below > index else -1
+        while n >= 0:
+            yield n
+            n -= self.accounts
+
+    def _incoming_numbers(self, index, below):
+        for round_ in range((below - 1) // self.accounts, -1, -1):
+            n = self._incoming_number(index, round_)
+            if n < below:
+                yield n
+
+    def transfers_page(self, address, direction="all", id=None, page_size=TRANSFERS_PAGE_SIZE):
+        """``/account/transfers/{direction}`` page: newest first, older than ``id`` when given."""
+        index = self.account_index(address)
+        if index is None:
+            return []
+        below = self.transfers if id is None else min(self.transfers, id - 1) # meta.id is n + 1
+        if below <= 0:
+            return []
+        outgoing = self._outgoing_numbers(index, below) if direction in ("all", "outgoing") else iter(())
+        incoming = self._incoming_numbers(index, below) if direction in ("all", "incoming") else iter(())
+        page = []
+        next_out, next_in = next(outgoing, None), next(incoming, None)
+        while len(page) < page_size and (next_out is not None or next_in is not None):
+            if next_in is None or (next_out is not None and next_out > next_in):
+                page.append(next_out)
+                next_out = next(outgoing, None)
+            else:
+                page.append(next_in)
+                next_in = next(incoming, None)
+        return [self.transaction(n) for n in page]
@@ -0,0 +1,222 @@
+"""Confirmation tracking for announced transactions.
+
+``PendingTracker`` keeps every announced hash that has not been resolved yet
+and checks them all together, once per new block: one
+``/local/chain/blocks-after`` request returns the new block (up to ten of
+them when catching up) with every transaction hash, inner multisig hashes
+included, and each block is matched against the whole pending set with
+dictionary lookups. A transaction is
+
+* ``pending`` once announced,
+* ``unconfirmed`` when the node reports it among its unconfirmed
+  transactions (``mark_unconfirmed``, fed by ``LiveUpdates`` push events),
+* ``confirmed`` at the height of the block that includes it, or
+* ``expired`` once a block stamped after its deadline has been checked
+  without it (NIS can no longer include it).
+
+Matching starts after the height a transaction was added at (pass the
+height seen before announcing it). Without one, the first check looks back
+over every block since the transaction was signed, taken from its deadline.
+Nothing is requested while no transaction is pending, and failed requests
+are retried with exponential backoff instead of on every tick.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from .client import NisError
+from .transactions import DEADLINE_SECONDS, nem_timestamp
+
+PENDING, UNCONFIRMED, CONFIRMED, EXPIRED = "pending", "unconfirmed", "confirmed", "expired"
+CHECK_INTERVAL = 2.0 # Seconds between height checks of the background thread (no request unless the height moved)
+BACKOFF_MIN = 2.0 # Seconds before retrying after a failed request
+BACKOFF_MAX = 120.0
+RESOLVED_KEPT = 10_000 # Confirmed/expired entries remembered for status queries
+EARLY_KEPT = 1000 # Unconfirmed hashes remembered before their announce returns
+LOOKBACK_BLOCK_SECONDS = 30 # Half the 60 s NIS1 block target, so a run of fast blocks is still looked back over
+
+
+class TrackedTransaction:
+    __slots__ = ("hash", "deadline", "since_height", "state", "height", "added")
+
+    def __init__(self, tx_hash, deadline, since_height):
+        self.hash = tx_hash
+        self.deadline = deadline # NEM seconds
+        self.since_height = since_height # The transaction cannot be in blocks at or below this height
+        self.state = PENDING
+        self.height = None
+        self.added = time.time()
+
+    def as_dict(self):
+        return {"hash": self.hash, "state": self.state, "height": self.height, "deadline": self.deadline}
+
+
+class PendingTracker:
+    """Resolves announced hashes block by block, e.g. ``PendingTracker(pool).start(lambda: pool.best_height)``."""
+
+    def __init__(self, client, resolved_kept=RESOLVED_KEPT):
+        self.client = client
+        self.resolved_kept = resolved_kept
+        self.checked_height = None # Every block up to here has been matched against the pending set
+        self.requests = 0
+        self.last_error = None
+        self._pending = {} # hash -> TrackedTransaction
+        self._resolved = {} # hash -> TrackedTransaction, oldest first
+        self._early = OrderedDict() # Hashes reported unconfirmed before they were added
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock() # One check at a time, whoever triggers it
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._thread = None
+        self._stop = threading.Event()
+
+    # --- Registration and queries ---
+    def add(self, tx_hash, deadline=None, height=None):
+        """Track an announced transaction; ``deadline`` in NEM seconds defaults to now plus the announce deadline."""
+        tx_hash = tx_hash.lower()
+        deadline = deadline if deadline is not None else nem_timestamp() + DEADLINE_SECONDS
+        with self._lock:
+            if tx_hash in self._pending or tx_hash in self._resolved:
+                return
+            since = height if height is not None else self.checked_height
+            tracked = self._pending[tx_hash] = TrackedTransaction(tx_hash, deadline, since)
+            if self._early.pop(tx_hash, None):
+                tracked.state = UNCONFIRMED
+
+    def mark_unconfirmed(self, tx_hash):
+        """Record that a node holds ``tx_hash`` as unconfirmed; it stays matched against new blocks."""
+        tx_hash = tx_hash.lower()
+        with self._lock:
+            tracked = self._pending.get(tx_hash)
+            if tracked is not None:
+                tracked.state = UNCONFIRMED
+            elif tx_hash not in self._resolved: # The push can beat the announce response
+                self._early[tx_hash] = True
+                while len(self._early) > EARLY_KEPT:
+                    self._early.popitem(last=False)
+
+    def add_results(self, results, height=None):
+        """Track every announced entry of a ``send_batch`` result list."""
+        for result in results:
+            if result.get("hash"):
+                self.add(result["hash"], result.get("deadline"), height)
+
+    def on_resolved(self, callback):
+        """Call ``callback(status dict)`` (on the checking thread) whenever a transaction is confirmed or expires."""
+        self._listeners.append(callback)
+
+    def status(self, tx_hash):
+        tx_hash = tx_hash.lower()
+        with self._lock:
+            tracked = self._pending.get(tx_hash) or self._resolved.get(tx_hash)
+            return tracked.as_dict() if tracked else None
+
+    def statuses(self, tx_hashes=None):
+        """Status dicts for ``tx_hashes`` (unknown ones omitted), or for everything tracked, newest first."""
+        if tx_hashes is not None:
+            return [status for status in map(self.status, tx_hashes) if status]
+        with self._lock:
+            tracked = sorted([*self._pending.values(), *self._resolved.values()], key=lambda t: -t.added)
+            return [t.as_dict() for t in tracked]
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    # --- Checking ---
+    def check(self, height):
+        """Match every block up to ``height`` against the pending set; returns the status dicts resolved by this call."""
+        if height is None or not self._check_lock.acquire(blocking=False):
+            return []
+        try:
+            with self._lock:
+                if not self._pending:
+                    self.checked_height = height # Nothing to look for: skip those blocks entirely
+                    return []
+                if self.checked_height is None:
+                    self.checked_height = min(self._start_height(t, height) for t in self._pending.values())
+            if self.checked_height >= height or time.monotonic() < self._retry_at:
+                return []
+            resolved = []
+            while self.checked_height < height:
+                try:
+                    blocks = self.client.blocks_after(self.checked_height)
+                    self.requests += 1
+                except NisError as e:
+                    self._backoff = min(max(self._backoff * 2, BACKOFF_MIN), BACKOFF_MAX)
+                    self._retry_at = time.monotonic() + self._backoff
+                    self.last_error = str(e)
+                    break
+                self._backoff, self.last_error = 0.0, None
+                if not blocks:
+                    break # The node has not got that far yet
+                for block in blocks:
+                    resolved.extend(self._match(block))
+                    if self._is_idle():
+                        break
+                if self._is_idle():
+                    self.checked_height = max(self.checked_height, height)
+                    break
+            for status in resolved:
+                for callback in list(self._listeners):
+                    callback(status)
+            return resolved
+        finally:
+            self._check_lock.release()
+
+    @staticmethod
+    def _start_height(tracked, height):
+        """Last block known not to include ``tracked``: its ``since_height``, else the block before it was signed."""
+        if tracked.since_height is not None:
+            return tracked.since_height
+        age = max(0, nem_timestamp() - (tracked.deadline - DEADLINE_SECONDS)) # Seconds since it was signed
+        return max(0, height - 1 - math.ceil(age / LOOKBACK_BLOCK_SECONDS))
+
+    def _is_idle(self):
+        with self._lock:
+            return not self._pending
+
+    def _match(self, block):
+        """Resolve the pending transactions a ``blocks-after`` entry includes or outlives."""
+        header = block["block"]
+        height, block_time = header["height"], header["timeStamp"]
+        resolved = []
+        with self._lock:
+            for entry in block.get("txes", ()):
+                for tx_hash in (entry.get("hash"), (entry.get("innerHash") or {}).get("data")):
+                    tracked = self._pending.get(tx_hash) if tx_hash else None
+                    if tracked is not None:
+                        resolved.append(self._resolve(tracked, CONFIRMED, height))
+            for tracked in [t for t in self._pending.values() if t.deadline < block_time]:
+                resolved.append(self._resolve(tracked, EXPIRED, None))
+            self.checked_height = height
+        return resolved
+
+    def _resolve(self, tracked, state, height):
+        del self._pending[tracked.hash]
+        tracked.state, tracked.height = state, height
+        self._resolved[tracked.hash] = tracked
+        while len(self._resolved) > self.resolved_kept:
+            del self._resolved[next(iter(self._resolved))]
+        return tracked.as_dict()
+
+    # --- Background thread ---
+    def start(self, height_source, interval=CHECK_INTERVAL):
+        """Check whenever ``height_source()`` (e.g. a pool's probed best height) moves; idempotent."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(height_source, interval), name="nis-tracker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, height_source, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.check(height_source())
+            except Exception as e: # Malformed node data must not kill the thread
+                self.last_error = str(e)
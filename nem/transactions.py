@@ -0,0 +1,154 @@
+"""Building, signing and announcing NIS1 transfer transactions in bulk.
+
+``send_batch`` takes ``(recipient, amount_xem, message)`` entries and:
+
+1. serializes each one as a version 1 transfer in the NIS1 binary format,
+   with a shared timestamp, deadline and the minimum fee;
+2. signs the serialized bytes on a process pool (signing is pure Python
+   and CPU bound);
+3. announces the signed transfers with bounded concurrency.
+
+It returns one result dict per entry, in input order, with either the
+transaction ``hash`` or an ``error``; one bad entry never stops the batch.
+"""
+import functools
+import struct
+import time
+
+from .address import Address, InvalidAddress
+from .crypto import TESTNET, keccak_256, sign
+from .history import NEM_EPOCH_UNIX, TRANSFER_TYPE
+from .nodes import fan_out
+
+TRANSFER_VERSION = 1
+PLAIN_MESSAGE = 1
+DEADLINE_SECONDS = 3600 # NIS accepts at most 24 hours
+FEE_UNIT = 50_000 # microXEM (0.05 XEM)
+MAX_MESSAGE_BYTES = 1024
+MAX_CONCURRENT_ANNOUNCES = 8
+SIGN_CHUNK_SIZE = 64 # Transfers signed per worker task
+
+
+def minimum_fee(amount_micro, message_bytes=b""):
+    """Minimum NIS1 fee in microXEM: 0.05 XEM per 10,000 XEM sent (1 to 25 units) plus 0.05 XEM per 32 message bytes."""
+    fee_units = min(25, max(1, amount_micro // 1_000_000 // 10_000))
+    if message_bytes:
+        fee_units += len(message_bytes) // 32 + 1
+    return fee_units * FEE_UNIT
+
+
+def nem_timestamp(unix_time=None):
+    """Seconds since the NEM epoch."""
+    return int(unix_time if unix_time is not None else time.time()) - NEM_EPOCH_UNIX
+
+
+def serialize_transfer(signer_public_key, recipient, amount_micro, message_bytes=b"", timestamp=None, network=TESTNET, fee=None):
+    """Binary form of a version 1 transfer; this is what gets signed and announced as ``data``."""
+    timestamp = nem_timestamp() if timestamp is None else timestamp
+    fee = minimum_fee(amount_micro, message_bytes) if fee is None else fee
+    signer = bytes.fromhex(signer_public_key)
+    recipient_bytes = recipient.plain.encode("ascii")
+    parts = [
+        struct.pack("<IIiI", TRANSFER_TYPE, (network << 24) | TRANSFER_VERSION, timestamp, len(signer)),
+        signer,
+        struct.pack("<QiI", fee, timestamp + DEADLINE_SECONDS, len(recipient_bytes)),
+        recipient_bytes,
+        struct.pack("<Q", amount_micro),
+    ]
+    if message_bytes:
+        parts.append(struct.pack("<III", 8 + len(message_bytes), PLAIN_MESSAGE, len(message_bytes)))
+        parts.append(message_bytes)
+    else:
+        parts.append(struct.pack("<I", 0))
+    return b"".join(parts)
+
+
+def _sign_chunk(private_key_hex, payloads):
+    return [sign(private_key_hex, payload) for payload in payloads]
+
+
+def sign_payloads(private_key_hex, payloads, workers=None):
+    """Signatures for many serialized transactions, in input order, signed on a process pool."""
+    chunks = [payloads[i:i + SIGN_CHUNK_SIZE] for i in range(0, len(payloads), SIGN_CHUNK_SIZE)]
+    if len(chunks) <= 1 or workers == 1:
+        return _sign_chunk(private_key_hex, payloads)
+    from concurrent.futures import ProcessPoolExecutor # multiprocessing is only loaded for bulk work
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_sign_chunk, [private_key_hex] * len(chunks), chunks)
+        return [signature for chunk in results for signature in chunk]
+
+
+def _prepare(entry, network):
+    """Validate one ``(recipient, amount_xem, message)`` entry; returns (Address, microXEM, message bytes)."""
+    recipient, amount_xem, message = (tuple(entry) + ("",))[:3]
+    recipient = Address(recipient, network)
+    amount_micro = round(float(amount_xem) * 1_000_000)
+    if amount_micro <= 0:
+        raise ValueError("Amount must be positive")
+    message_bytes = (message or "").encode("utf-8")
+    if len(message_bytes) > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message longer than {MAX_MESSAGE_BYTES} bytes")
+    return recipient, amount_micro, message_bytes
+
+
+def build_signed_transfers(key_pair, entries, network=TESTNET, timestamp=None, workers=None):
+    """Serialize and sign every entry; returns dicts with ``request``, ``hash`` and ``deadline`` (NEM seconds) or an ``error``."""
+    timestamp = nem_timestamp() if timestamp is None else timestamp
+    results = []
+    payloads = []
+    for entry in entries:
+        result = {"recipient": str(entry[0]) if entry else "", "amount": None, "hash": None, "error": None}
+        try:
+            recipient, amount_micro, message_bytes = _prepare(entry, network)
+        except (InvalidAddress, ValueError, TypeError, IndexError) as e:
+            result["error"] = str(e)
+        else:
+            payload = serialize_transfer(key_pair.public_key, recipient, amount_micro, message_bytes, timestamp, network)
+            result.update(recipient=recipient.plain, amount=amount_micro / 1_000_000, deadline=timestamp + DEADLINE_SECONDS, data=payload)
+            payloads.append(payload)
+        results.append(result)
+
+    signatures = iter(sign_payloads(key_pair.private_key, payloads, workers))
+    for result in results:
+        if "data" in result:
+            payload = result.pop("data")
+            result["request"] = {"data": payload.hex(), "signature": next(signatures).hex()}
+            result["hash"] = keccak_256(payload).hex() # NIS hashes the unsigned transaction data
+    return results
+
+
+def _announce(client, request):
+    response = client.announce_transaction(request)
+    if response.get("message") != "SUCCESS":
+        raise ValueError(response.get("message", "Announce rejected by node"))
+    return response["transactionHash"]["data"]
+
+
+def announce_signed(client, results, max_concurrent=MAX_CONCURRENT_ANNOUNCES):
+    """Announce every signed result with at most ``max_concurrent`` requests in flight; fills in hash or error."""
+    jobs = {i: functools.partial(_announce, client, result["request"]) for i, result in enumerate(results) if result.get("request")}
+    for i, tx_hash, error, _ in fan_out(jobs, max_workers=max_concurrent):
+        result = results[i]
+        del result["request"]
+        if error:
+            result["hash"], result["error"] = None, str(error)
+        else:
+            result["hash"] = tx_hash
+    return results
+
+
+def network_timestamp(client):
+    """Current NEM time according to the node, falling back to the local clock."""
+    try:
+        return int(client.network_time()["sendTimeStamp"] // 1000)
+    except Exception:
+        return nem_timestamp()
+
+
+def send_batch(client, key_pair, entries, network=TESTNET, max_concurrent=MAX_CONCURRENT_ANNOUNCES, workers=None):
+    """Build, sign and announce many transfers from one account. Returns one result per entry."""
+    entries = list(entries)
+    timestamp = network_timestamp(client)
+    results = build_signed_transfers(key_pair, entries, network, timestamp, workers)
+    return announce_signed(client, results, max_concurrent)
@@ -0,0 +1,148 @@
+"""Account-level operations shared by the apps, batch workers and scripts.
+
+Each function takes the client, cache and index it works with instead of
+finding them itself, and reports problems by return value rather than by
+drawing anything, so front-ends decide how to show an error and headless
+callers can simply log it.
+"""
+import sys
+
+from .accounts import fetch_account_rows
+from .address import Address, normalize_address
+from .crypto import TESTNET, KeyPair
+from .history import NEM_EPOCH_UNIX
+from .transactions import send_batch
+
+
+def generate_account(network=TESTNET):
+    """A new random account as ``{"private_key", "public_key", "address"}``."""
+    key_pair = KeyPair.generate()
+    return {
+        "private_key": key_pair.private_key,
+        "public_key": key_pair.public_key,
+        "address": key_pair.get_address(network),
+    }
+
+
+def is_unknown_account(error):
+    """True for the errors NIS returns when asked about an account it has never seen."""
+    return "does not exist" in str(error).lower() or "account_not_found" in str(error).upper()
+
+
+def account_balance(client, address_str, cache=None, network=TESTNET):
+    """Balance in XEM; 0.0 for invalid addresses and accounts unknown to the node. Other node errors are raised."""
+    if not Address.is_valid(address_str, network): # Checksum and network checked locally, before calling the node
+        return 0.0
+    address = normalize_address(address_str)
+    fetch = lambda: client.account_get(address) # NIS AccountMetaDataPair
+    try:
+        # Cached until a new block is seen or this address is invalidated
+        account_info = cache.get_or_fetch("account", address, fetch) if cache is not None else fetch()
+    except Exception as e:
+        if is_unknown_account(e):
+            return 0.0
+        raise
+    return account_info["account"]["balance"] / 1_000_000.0 # microXEM to XEM
+
+
+def account_balances(client, address_strs, cache=None):
+    """Balance, vested balance and importance rows for many accounts in one round of concurrent requests."""
+    # Shares the "account" cache entries with account_balance
+    return fetch_account_rows(client, [normalize_address(a) for a in address_strs], cache)
+
+
+def send_transfer(client, key_pair, recipient_str, amount_xem, message="", network=TESTNET):
+    """Sign and announce one transfer; returns ``(hash, None)`` on success or ``(None, error message)``."""
+    if not Address.is_valid(recipient_str, network): # Base32, network byte and checksum
+        return None, "Invalid recipient address (bad format, checksum or not a testnet address)."
+    if amount_xem <= 0:
+        return None, "Amount must be positive."
+    # A batch of one: same serialization, minimum fee and announce path as bulk sends
+    result = send_batch(client, key_pair, [(recipient_str, amount_xem, message)], network=network)[0]
+    return result["hash"], result["error"]
+
+
+def parse_batch_lines(text):
+    """``recipient,amount[,message]`` per line; the message may itself contain commas."""
+    entries = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        parts = [part.strip() for part in line.split(",", 2)]
+        entries.append(tuple(parts + [""] * (3 - len(parts))))
+    return entries
+
+
+def _sync_history(client, index, address, cache, count, direction):
+    """Bring the index up to date for ``address`` and deep enough for ``count`` rows; returns the node error or ``None``."""
+    if client is None:
+        return None
+    try:
+        # At most one "anything newer?" call per address per block (or after the address is invalidated)
+        if cache is not None:
+            cache.get_or_fetch("history_sync", address, lambda: index.sync_newer(client, address))
+        else:
+            index.sync_newer(client, address)
+        index.backfill(client, address, count, direction) # No-op when enough rows are already indexed
+    except Exception as e:
+        return e
+    return None
+
+
+def transfer_history(client, index, address_str, cache=None, count=20, direction="all", network=TESTNET):
+    """``(newest count transfers as TransferColumns, more available?, sync error or None)`` from the local index.
+
+    Only transfers newer than the indexed ones, and older pages not yet
+    indexed, are fetched from the node. When the node fails, what is already
+    indexed is still returned, together with the error.
+    """
+    if not Address.is_valid(address_str, network):
+        from .columns import TransferColumns # NumPy is only needed once there is history to hold
+
+        return TransferColumns.empty(), False, None
+    address = normalize_address(address_str)
+    error = _sync_history(client, index, address, cache, count, direction)
+    state = index.state(address)
+    has_more = index.count(address, direction) > count or bool(state and not state[2])
+    return index.history(address, count, direction=direction), has_more, error
+
+
+def index_full_history(client, index, address_str, network=TESTNET):
+    """Backfill every older page of ``address_str`` into the index; returns ``(transfers indexed, error or None)``."""
+    if not Address.is_valid(address_str, network):
+        return 0, None
+    address = normalize_address(address_str)
+    error = _sync_history(client, index, address, None, sys.maxsize, "all") # Stops only when the node has no older page
+    return index.count(address), error
+
+
+def _nem_seconds(moment):
+    return None if moment is None else int(moment.timestamp()) - NEM_EPOCH_UNIX
+
+
+def transfer_history_page(client, index, address_str, cache=None, page=0, page_size=100, direction="all",
+                          order_by="id", descending=True, min_xem=None, max_xem=None, since=None, until=None,
+                          network=TESTNET):
+    """One page of filtered, sorted history: ``(TransferColumns, rows matching, history complete?, sync error or None)``.
+
+    Filtering and sorting run in the local index, so they cover what is
+    indexed: the newest ``(page + 1) * page_size`` transfers are made
+    available first, and the rest once ``index.backfill`` has been run for
+    the whole history (then ``complete`` is true). ``since``/``until`` are
+    timezone-aware datetimes; amounts are in XEM.
+    """
+    if not Address.is_valid(address_str, network):
+        from .columns import TransferColumns
+
+        return TransferColumns.empty(), 0, True, None
+    address = normalize_address(address_str)
+    error = _sync_history(client, index, address, cache, (page + 1) * page_size, direction)
+    filters = {
+        "min_amount": None if min_xem is None else round(min_xem * 1_000_000),
+        "max_amount": None if max_xem is None else round(max_xem * 1_000_000),
+        "since": _nem_seconds(since),
+        "until": _nem_seconds(until),
+    }
+    state = index.state(address)
+    columns = index.history(address, page_size, page * page_size, direction, order_by, descending, **filters)
+    return columns, index.count(address, direction, **filters), bool(state and state[2]), error
@@ -0,0 +1,24 @@
+"""Address parsing rejects anything that is not an address."""
+import pytest
+
+from nem.address import Address, InvalidAddress, normalize_address
+
+VALID = "NDD2CT6LQLIYQ56KIXI3ENTM6EK3D44P5JFXJ4R4"
+
+
+@pytest.mark.parametrize("value", [None, 42, 4.2, ["N" * 40], {"address": VALID}, b"short"])
+def test_non_string_input_is_invalid(value):
+    assert not Address.is_valid(value)
+    with pytest.raises(InvalidAddress):
+        Address(value)
+
+
+def test_normalize_rejects_non_strings():
+    with pytest.raises(InvalidAddress):
+        normalize_address(None)
+    assert normalize_address(VALID.lower()) == VALID
+
+
+def test_comparison_with_non_address_is_false():
+    assert Address(VALID) != None # noqa: E711
+    assert Address(VALID) == VALID
@@ -0,0 +1,94 @@
+"""ResponseArchive and ArchivedApi against a stand-in node."""
+import itertools
+import os
+import types
+
+import pytest
+
+from nem import archive as nem_archive
+from nem.archive import FINALITY_DEPTH, ArchivedApi, ResponseArchive, response_key
+from nem.client import NisClient
+from nem.standin import start_standin
+from nem.synthetic import SyntheticChain
+
+CHAIN = SyntheticChain("archive-tests", accounts=10, height=1000)
+TIP = CHAIN.height
+DEEP, RECENT = 100, TIP - FINALITY_DEPTH + 1 # Final, and one block too recent to be
+
+
+@pytest.fixture
+def node():
+    server, url = start_standin(chain=CHAIN)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "responses.sqlite3")
+
+
+def node_requests(server, endpoint):
+    return server.stats.get(endpoint, {}).get("requests", 0)
+
+
+def tx_hash_at(height):
+    return CHAIN.transaction_hash((height - 1) * CHAIN.per_block)
+
+
+def test_only_final_responses_are_stored(node, path):
+    api = ArchivedApi(NisClient(node.url), ResponseArchive(path), lambda: TIP)
+    for _ in range(2):
+        assert api.transaction_get(tx_hash_at(DEEP))["meta"]["height"] == DEEP
+        assert api.transaction_get(tx_hash_at(RECENT))["meta"]["height"] == RECENT
+        assert api.block_at(DEEP)["height"] == DEEP
+        assert api.block_at(RECENT)["height"] == RECENT
+        assert [block["block"]["height"] for block in api.blocks_after(DEEP)] == list(range(DEEP + 1, DEEP + 11))
+        api.blocks_after(RECENT - 5) # Ends inside the unsettled blocks
+    assert node_requests(node, "/transaction/get") == 3 # The final one once, the recent one twice
+    assert node_requests(node, "/block/at/public") == 3
+    assert node_requests(node, "/local/chain/blocks-after") == 3
+    assert api.archive.stats()["entries"] == 3
+
+
+def test_other_endpoints_and_unknown_height_pass_through(node, path):
+    api = ArchivedApi(NisClient(node.url), ResponseArchive(path), lambda: None)
+    for _ in range(2):
+        api.transaction_get(tx_hash_at(DEEP))
+        api.account_get(CHAIN.address(1))
+    assert node_requests(node, "/transaction/get") == 2 # Nothing is stored while the tip is unknown
+    assert node_requests(node, "/account/get") == 2
+    assert api.archive.stats()["entries"] == 0
+    assert api.chain_height() == TIP and api.url == node.url # Everything else reaches the wrapped client
+
+
+def test_reopened_archive_serves_hits(node, path):
+    first = ResponseArchive(path)
+    ArchivedApi(NisClient(node.url), first, lambda: TIP).transaction_get(tx_hash_at(DEEP))
+    first.close()
+
+    reopened = ArchivedApi(NisClient(node.url), ResponseArchive(path), lambda: TIP)
+    assert reopened.transaction_get(tx_hash_at(DEEP)) == CHAIN.transaction_by_hash(tx_hash_at(DEEP))
+    assert node_requests(node, "/transaction/get") == 1
+
+
+def test_least_recently_used_entries_are_pruned(path, monkeypatch):
+    clock = itertools.count(1000.0)
+    monkeypatch.setattr(nem_archive, "time", types.SimpleNamespace(time=lambda: next(clock)))
+    monkeypatch.setattr(nem_archive, "TOUCH_INTERVAL", 0.0)
+    payload = lambda i: {"n": i, "noise": os.urandom(1000).hex()} # Random, so every entry stores about the same size
+    key = lambda i: response_key("GET", "/transaction/get", {"hash": str(i)})
+
+    archive = ResponseArchive(path)
+    archive.put(key(0), payload(0))
+    archive.max_bytes = int(archive.stats()["bytes"] * 5.5) # Room for five entries
+    for i in range(1, 4):
+        archive.put(key(i), payload(i))
+    assert archive.get(key(0))["n"] == 0 # Now the most recently used
+    for i in range(4, 6):
+        archive.put(key(i), payload(i))
+
+    assert archive.stats()["bytes"] <= archive.max_bytes
+    kept = [i for i in range(6) if archive.get(key(i)) is not None]
+    assert kept == [0, 3, 4, 5] # Six did not fit: down to 90% of the limit by evicting 1 and 2, the least recently used
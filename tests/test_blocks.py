@@ -0,0 +1,121 @@
+"""Decoding NIS1 transactions and blocks through the dispatch table."""
+import pytest
+
+from nem.blocks import decode_block, decode_message, decode_transaction
+
+SIGNER = "a1" * 32
+COSIGNER = "b2" * 32
+RECIPIENT = "TALICE2AL3GZ5XW7PTF3HNDHFE6JTYAXSJ5N7RNL"
+TESTNET_V1, TESTNET_V2 = -1744830463, -1744830462
+
+
+def tx(tx_type, version=TESTNET_V1, **fields):
+    return {"type": tx_type, "version": version, "signer": SIGNER, "timeStamp": 1000, "deadline": 4600, "fee": 150_000, **fields}
+
+
+TRANSFER = tx(257, recipient=RECIPIENT, amount=2_000_000, message={"type": 1, "payload": "hi".encode().hex()})
+MOSAIC_TRANSFER = tx(257, TESTNET_V2, recipient=RECIPIENT, amount=1_000_000, message={}, mosaics=[
+    {"mosaicId": {"namespaceId": "nem", "name": "xem"}, "quantity": 5_000_000},
+    {"mosaicId": {"namespaceId": "alice.coins", "name": "gold"}, "quantity": 7},
+])
+FIXTURES = {
+    "importance": (tx(2049, remoteAccount="c3" * 32, mode=1), {"remote": "c3" * 32, "mode": "activate"}),
+    "modification": (
+        tx(4097, TESTNET_V2, modifications=[{"modificationType": 1, "cosignatoryAccount": COSIGNER}], minCosignatories={"relativeChange": 1}),
+        {"modifications": [("add", COSIGNER)], "min_cosignatories_delta": 1},
+    ),
+    "modification_v1": (
+        tx(4097, modifications=[{"modificationType": 2, "cosignatoryAccount": COSIGNER}]),
+        {"modifications": [("delete", COSIGNER)], "min_cosignatories_delta": 0},
+    ),
+    "signature": (
+        tx(4098, otherHash={"data": "d4" * 32}, otherAccount=RECIPIENT),
+        {"other_hash": "d4" * 32, "multisig_account": RECIPIENT},
+    ),
+    "root_namespace": (
+        tx(8193, newPart="alice", parent=None, rentalFeeSink="TSINK", rentalFee=100_000_000),
+        {"namespace": "alice", "rental_fee": 100_000_000, "rental_fee_sink": "TSINK"},
+    ),
+    "sub_namespace": (tx(8193, newPart="coins", parent="alice", rentalFeeSink="TSINK", rentalFee=10_000_000), {"namespace": "alice.coins"}),
+    "mosaic_definition": (
+        tx(16385, creationFeeSink="TSINK", creationFee=10_000_000, mosaicDefinition={
+            "creator": SIGNER, "id": {"namespaceId": "alice.coins", "name": "gold"}, "description": "Gold",
+            "properties": [{"name": "divisibility", "value": "0"}, {"name": "transferable", "value": "true"}],
+            "levy": {"type": 1, "recipient": RECIPIENT, "mosaicId": {"namespaceId": "nem", "name": "xem"}, "fee": 10},
+        }),
+        {
+            "mosaic": "alice.coins:gold", "description": "Gold", "properties": {"divisibility": "0", "transferable": "true"},
+            "levy": {"type": 1, "recipient": RECIPIENT, "mosaic": "nem:xem", "fee": 10}, "creation_fee": 10_000_000,
+        },
+    ),
+    "mosaic_definition_no_levy": (
+        tx(16385, creationFeeSink="TSINK", creationFee=10_000_000, mosaicDefinition={"id": {"namespaceId": "a", "name": "b"}, "levy": {}}),
+        {"mosaic": "a:b", "levy": None, "properties": {}},
+    ),
+    "supply": (
+        tx(16386, mosaicId={"namespaceId": "alice.coins", "name": "gold"}, supplyType=2, delta=500),
+        {"mosaic": "alice.coins:gold", "supply_type": "delete", "delta": 500},
+    ),
+}
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_type_specific_fields(name):
+    transaction, expected = FIXTURES[name]
+    row = decode_transaction(transaction, 10, "ee" * 32)
+    assert row["type"] == transaction["type"] and row["name"] != "Unknown Transaction Type"
+    assert {key: row[key] for key in expected} == expected
+
+
+def test_common_fields_and_plain_message():
+    row = decode_transaction(TRANSFER, 10, "ee" * 32)
+    assert row == {
+        "height": 10, "hash": "ee" * 32, "type": 257, "name": "Transfer", "version": 1, "signer": SIGNER,
+        "timestamp": 1000, "deadline": 4600, "fee": 150_000, "inner_hash": None,
+        "recipient": RECIPIENT, "amount": 2_000_000, "message": "hi", "message_type": 1, "mosaics": [],
+    }
+
+
+def test_mosaic_transfer():
+    row = decode_transaction(MOSAIC_TRANSFER)
+    assert row["version"] == 2 and row["message"] == "" and row["message_type"] is None
+    assert row["mosaics"] == [("nem:xem", 5_000_000), ("alice.coins:gold", 7)]
+
+
+def test_multisig_decodes_inner_transaction():
+    wrapper = tx(4100, otherTrans=MOSAIC_TRANSFER, signatures=[tx(4098, signer=COSIGNER, otherHash={"data": "ff" * 32}, otherAccount=RECIPIENT)])
+    row = decode_transaction(wrapper, 10, "ee" * 32, "ff" * 32)
+    assert row["name"] == "Multisig Transaction" and row["signatures"] == [COSIGNER]
+    inner = row["inner"]
+    assert inner["hash"] == "ff" * 32 and inner["height"] == 10
+    assert inner["recipient"] == RECIPIENT and inner["mosaics"][1] == ("alice.coins:gold", 7)
+
+
+def test_unknown_type_keeps_common_fields():
+    row = decode_transaction(tx(9999, extra=1))
+    assert row["name"] == "Unknown Transaction Type" and "extra" not in row and row["fee"] == 150_000
+
+
+@pytest.mark.parametrize("message, expected", [
+    (None, ("", None)),
+    ({"type": 1, "payload": ""}, ("", None)),
+    ({"type": 1, "payload": "zz"}, ("zz", 1)), # Malformed hex stays as it is
+    ({"type": 2, "payload": "00ff"}, ("00ff", 2)),
+])
+def test_decode_message(message, expected):
+    assert decode_message(message) == expected
+
+
+def test_block_from_either_endpoint():
+    header = {"height": 12, "timeStamp": 5000, "signer": SIGNER}
+    explorer = decode_block({"block": header, "hash": "ab" * 32, "txes": [
+        {"tx": TRANSFER, "hash": "01" * 32},
+        {"tx": tx(4100, otherTrans=TRANSFER), "hash": "02" * 32, "innerHash": {"data": "03" * 32}},
+    ]})
+    assert explorer["hash"] == "ab" * 32 and explorer["height"] == 12
+    assert [t["hash"] for t in explorer["transactions"]] == ["01" * 32, "02" * 32]
+    assert explorer["transactions"][1]["inner"]["hash"] == "03" * 32
+
+    public = decode_block(dict(header, transactions=[TRANSFER, MOSAIC_TRANSFER]))
+    assert public["hash"] is None and [t["hash"] for t in public["transactions"]] == [None, None]
+    assert [t["height"] for t in public["transactions"]] == [12, 12]
@@ -0,0 +1,54 @@
+"""HeightCache serves entries only at the height they were fetched at."""
+from nem.cache import HeightCache
+
+
+class Fetches:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"balance": self.calls}
+
+
+def test_entries_served_until_the_height_changes():
+    height = [100]
+    cache, fetch = HeightCache(lambda: height[0]), Fetches()
+    assert cache.get_or_fetch("account", "TALICE", fetch) == {"balance": 1}
+    assert cache.get_or_fetch("account", "TALICE", fetch) == {"balance": 1}
+    assert fetch.calls == 1
+    height[0] = 101
+    assert cache.get_or_fetch("account", "TALICE", fetch) == {"balance": 2}
+    assert fetch.calls == 2 and len(cache) == 1
+
+
+def test_nothing_cached_while_height_unknown():
+    cache, fetch = HeightCache(lambda: None), Fetches()
+    cache.get_or_fetch("account", "TALICE", fetch)
+    cache.get_or_fetch("account", "TALICE", fetch)
+    cache.put("account", "TBOB", {"balance": 0})
+    assert fetch.calls == 2 and len(cache) == 0
+
+
+def test_invalidate_drops_only_named_addresses():
+    cache, fetch = HeightCache(lambda: 5), Fetches()
+    for address in ("TALICE", "TBOB"):
+        cache.get_or_fetch("account", address, fetch)
+        cache.get_or_fetch("transfers", address, fetch)
+    cache.invalidate("TALICE")
+    assert len(cache) == 2
+    cache.get_or_fetch("account", "TBOB", fetch)
+    cache.get_or_fetch("account", "TALICE", fetch)
+    assert fetch.calls == 5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, fetch = HeightCache(lambda: 5, max_entries=2), Fetches()
+    cache.get_or_fetch("account", "A", fetch)
+    cache.get_or_fetch("account", "B", fetch)
+    cache.get_or_fetch("account", "A", fetch) # A is now the most recent
+    cache.get_or_fetch("account", "C", fetch)
+    cache.get_or_fetch("account", "A", fetch)
+    assert fetch.calls == 3
+    cache.get_or_fetch("account", "B", fetch)
+    assert fetch.calls == 4
@@ -0,0 +1,51 @@
+"""NisClient error handling."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+import pytest
+
+from nem.client import NisApi, NisClient, NisError
+
+
+class ErrorHandler(BaseHTTPRequestHandler):
+    """Answers every request with the status and raw body named in its path, e.g. ``/500/[1,2]``."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        _, status, body = unquote(self.path).split("/", 2)
+        payload = body.encode()
+        self.send_response(int(status))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture(scope="module")
+def client():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ErrorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield NisClient(f"http://127.0.0.1:{server.server_address[1]}")
+    server.shutdown()
+    server.server_close()
+
+
+def test_api_base_requires_request():
+    with pytest.raises(TypeError):
+        NisApi()
+
+
+@pytest.mark.parametrize("body, message", [
+    (json.dumps({"message": "invalid address"}), "invalid address"),
+    (json.dumps([1, 2]), "Internal Server Error"),
+    (json.dumps("boom"), "Internal Server Error"),
+    ("not json", "Internal Server Error"),
+])
+def test_error_message_from_any_body(client, body, message):
+    with pytest.raises(NisError, match=message) as raised:
+        client.request("GET", f"/500/{body}")
+    assert raised.value.status == 500 and raised.value.node_url == client.url
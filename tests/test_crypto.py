@@ -0,0 +1,79 @@
+"""Keys, signatures and addresses against the published NIS1 test vectors."""
+import pytest
+
+from nem.address import Address, InvalidAddress
+from nem.crypto import MAINNET, TESTNET, KeyPair, derive_keypairs, verify
+
+# nem-test-vectors: 1.test-keys.dat and 2.test-sign.dat (first entries)
+KEY_VECTOR = {
+    "private_key": "575dbb3062267eff57c970a336ebbc8fbcfe12c5bd3ed7bc11eb0481d7704ced",
+    "public_key": "c5f54ba980fcbb657dbaaa42700539b207873e134d2375efeab5f1ab52f87844",
+    "address": "NDD2CT6LQLIYQ56KIXI3ENTM6EK3D44P5JFXJ4R4",
+}
+SIGN_VECTOR = {
+    "private_key": "abf4cf55a2b3f742d7543d9cc17f50447b969e6e06f5ea9195d428ab12b7318d",
+    "public_key": "8a558c728c21c126181e5e654b404a45b4f0137ce88177435a69978cc6bec1f4",
+    "data": "8ce03cd60514233b86789729102ea09e867fc6d964dea8c2018ef7d0a2e0e24bf7e348e917116690b9",
+    "signature": "d9cec0cc0e3465fab229f8e1d6db68ab9cc99a18cb0435f70deb6100948576cd"
+                 "5c0aa1feb550bdd8693ef81eb10a556a622db1f9301986827b96716a7134230c",
+}
+
+
+def test_key_vector():
+    key_pair = KeyPair(KEY_VECTOR["private_key"])
+    assert key_pair.public_key == KEY_VECTOR["public_key"]
+    assert key_pair.get_address(MAINNET) == KEY_VECTOR["address"]
+
+
+def test_private_key_with_sign_byte():
+    assert KeyPair("00" + KEY_VECTOR["private_key"]).public_key == KEY_VECTOR["public_key"]
+
+
+@pytest.mark.parametrize("private_key", ["", "abcd", "zz" * 32, "01" + KEY_VECTOR["private_key"]])
+def test_invalid_private_key(private_key):
+    with pytest.raises(ValueError):
+        KeyPair(private_key)
+
+
+def test_sign_vector():
+    key_pair = KeyPair(SIGN_VECTOR["private_key"])
+    assert key_pair.public_key == SIGN_VECTOR["public_key"]
+    assert key_pair.sign(bytes.fromhex(SIGN_VECTOR["data"])).hex() == SIGN_VECTOR["signature"]
+
+
+@pytest.mark.parametrize("data", [b"", b"x", bytes(range(256))])
+def test_sign_verify_round_trip(data):
+    key_pair = KeyPair.generate()
+    signature = key_pair.sign(data)
+    assert len(signature) == 64
+    assert key_pair.verify(data, signature)
+    assert not key_pair.verify(data + b"!", signature)
+    assert not KeyPair.generate().verify(data, signature)
+    tampered = bytes([signature[0] ^ 1]) + signature[1:]
+    assert not key_pair.verify(data, tampered)
+
+
+def test_verify_rejects_malformed_input():
+    assert not verify(SIGN_VECTOR["public_key"], b"", b"short")
+    assert not verify("00" * 32, b"", bytes(64))
+
+
+def test_derive_keypairs_matches_single_derivation():
+    keys = [KEY_VECTOR["private_key"], SIGN_VECTOR["private_key"]]
+    rows = derive_keypairs(keys, MAINNET)
+    assert [row["public_key"] for row in rows] == [KEY_VECTOR["public_key"], SIGN_VECTOR["public_key"]]
+    assert rows[0]["address"] == KEY_VECTOR["address"]
+
+
+def test_address_checksum():
+    address = Address(KEY_VECTOR["address"])
+    assert address.network == MAINNET
+    assert address.pretty == "NDD2CT-6LQLIY-Q56KIX-I3ENTM-6EK3D4-4P5JFX-J4R4"
+    assert Address(address.pretty.lower()) == address
+    assert Address.from_public_key(KEY_VECTOR["public_key"], MAINNET) == address
+    corrupted = KEY_VECTOR["address"][:-1] + ("A" if KEY_VECTOR["address"][-1] != "A" else "B")
+    assert not Address.is_valid(corrupted)
+    with pytest.raises(InvalidAddress):
+        Address(corrupted)
+    with pytest.raises(InvalidAddress):
+        Address(KEY_VECTOR["address"], TESTNET) # Right checksum, wrong network
@@ -0,0 +1,62 @@
+"""SingleFlight and TokenBucket timing."""
+import threading
+import time
+
+import pytest
+
+from nem.flow import SingleFlight, TokenBucket
+
+
+def test_single_flight_shares_the_running_call():
+    flights, started, release = SingleFlight(), threading.Event(), threading.Event()
+    calls, results = [], {}
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "answer"
+
+    def run(name):
+        results[name] = flights.do("k", slow)
+    leader = threading.Thread(target=run, args=("leader",))
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=run, args=("follower",))
+    follower.start()
+    time.sleep(0.1) # Let the follower join the flight
+    assert flights.in_flight() == 1
+    release.set()
+    leader.join()
+    follower.join()
+    assert results == {"leader": ("answer", False), "follower": ("answer", True)} and len(calls) == 1
+    assert flights.in_flight() == 0
+    assert flights.do("k", lambda: "fresh") == ("fresh", False) # A finished flight is not reused
+
+
+def test_burst_then_rate():
+    bucket = TokenBucket(rate=20, burst=2)
+    assert bucket.acquire() == 0.0 and bucket.acquire() == 0.0 # The burst
+    started = time.monotonic()
+    waited = bucket.acquire()
+    assert waited == pytest.approx(0.05, abs=0.01)
+    assert time.monotonic() - started >= 0.045
+
+
+def test_max_wait_takes_no_token():
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.acquire()
+    assert bucket.acquire(max_wait=0.01) is None
+    assert not bucket.try_acquire()
+    assert bucket.acquire(max_wait=0.2) == pytest.approx(0.1, abs=0.02) # The refused call did not move the queue
+
+
+def test_pause_holds_every_token():
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.pause(0.3)
+    assert not bucket.try_acquire()
+    assert bucket.acquire(max_wait=0.2) is None
+    started = time.monotonic()
+    waited = bucket.acquire()
+    assert waited == pytest.approx(0.4, abs=0.03) # The pause, then one token at the rate
+    assert time.monotonic() - started >= 0.38
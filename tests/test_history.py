@@ -0,0 +1,26 @@
+"""Flattening NIS transfers into history rows."""
+from nem.history import transfer_record
+
+
+def transfer(message, **fields):
+    tx = {"type": 257, "signer": "ab" * 32, "recipient": "TALICE", "amount": 1_000_000, "fee": 50_000,
+          "timeStamp": 1000, "message": message, **fields}
+    return {"meta": {"id": 7, "height": 42, "hash": {"data": "cd" * 32}}, "transaction": tx}
+
+
+def test_plain_message_is_decoded():
+    assert transfer_record(transfer({"type": 1, "payload": "hello".encode().hex()}))[-1] == "hello"
+
+
+def test_malformed_payload_keeps_raw_text():
+    assert transfer_record(transfer({"type": 1, "payload": "not hex"}))[-1] == "not hex"
+
+
+def test_encrypted_payload_stays_hex():
+    assert transfer_record(transfer({"type": 2, "payload": "00ff"}))[-1] == "00ff"
+
+
+def test_multisig_reports_inner_transfer():
+    item = transfer({})
+    item["transaction"] = {"type": 4100, "otherTrans": dict(item["transaction"], amount=5)}
+    assert transfer_record(item)[6] == 5
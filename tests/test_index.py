@@ -0,0 +1,211 @@
+"""TransactionIndex sync, backfill and queries against a local stand-in node."""
+import datetime
+
+import pytest
+
+from nem.client import NisClient
+from nem.history import NEM_EPOCH, transfer_record
+from nem.index import TransactionIndex
+from nem.standin import start_standin
+from nem.synthetic import SyntheticChain
+from nem.wallet import transfer_history_page
+
+SEED = "index-tests"
+ACCOUNTS = 10
+HEIGHT = 40 # 32 transfers per account: one full page of 25, then 7
+GROWN_HEIGHT = 50 # 8 more per account
+
+
+@pytest.fixture(scope="module")
+def chains():
+    return SyntheticChain(SEED, ACCOUNTS, HEIGHT), SyntheticChain(SEED, ACCOUNTS, GROWN_HEIGHT)
+
+
+@pytest.fixture(scope="module")
+def nodes(chains):
+    servers = [start_standin(chain=chain)[0] for chain in chains]
+    yield servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TransactionIndex(str(tmp_path / "index.sqlite3"))
+    yield index
+    index.close()
+
+
+def transfer_requests(server):
+    return server.stats.get("/account/transfers/all", {}).get("requests", 0)
+
+
+def test_first_sync_fetches_one_page(nodes, chains, index):
+    address = chains[0].address(3)
+    assert index.sync_newer(NisClient(nodes[0].url), address) == 25
+    newest_id, oldest_id, complete, _ = index.state(address)
+    expected = [item["meta"]["id"] for item in chains[0].transfers_page(address)]
+    assert (newest_id, oldest_id, complete) == (expected[0], expected[-1], 0)
+    assert list(index.history(address, limit=None).id) == expected
+
+
+def test_backfill_completes_history(nodes, chains, index):
+    chain, client = chains[0], NisClient(nodes[0].url)
+    address = chain.address(3)
+    index.backfill(client, address, 100) # Syncs the newest page first
+    totals = chain.account_totals(address)
+    assert index.count(address) == totals["incoming"] + totals["outgoing"] == 32
+    assert index.state(address)[2] == 1
+    indexed = index.totals(address)
+    assert indexed["received"] == totals["received"] / 1_000_000
+    assert indexed["sent"] == totals["sent"] / 1_000_000
+    assert (indexed["incoming"], indexed["outgoing"]) == (totals["incoming"], totals["outgoing"])
+    ids = list(index.history(address, limit=None).id)
+    assert ids == sorted(ids, reverse=True) and len(set(ids)) == 32
+
+    before = transfer_requests(nodes[0])
+    index.backfill(client, address, 1000) # Complete: nothing to fetch
+    assert transfer_requests(nodes[0]) == before
+
+
+def test_backfill_stops_at_count(nodes, chains, index):
+    client, address = NisClient(nodes[0].url), chains[0].address(5)
+    index.backfill(client, address, 10, direction="incoming")
+    assert index.count(address, "incoming") >= 10
+    assert index.state(address)[2] == 0 # Older pages were not needed
+
+
+def test_sync_newer_adds_only_new_transfers(nodes, chains, index):
+    address = chains[0].address(3)
+    index.backfill(NisClient(nodes[0].url), address, 100)
+    grown = NisClient(nodes[1].url)
+
+    assert index.sync_newer(grown, address) == 8
+    assert index.count(address) == 40
+    assert index.state(address)[0] == chains[1].transfers_page(address)[0]["meta"]["id"]
+    assert index.totals(address)["incoming"] == chains[1].account_totals(address)["incoming"]
+
+    before = transfer_requests(nodes[1])
+    assert index.sync_newer(grown, address) == 0
+    assert transfer_requests(nodes[1]) == before + 1 # Nothing new costs one request
+
+
+def test_unknown_address(nodes, index):
+    address = SyntheticChain("elsewhere", ACCOUNTS, HEIGHT).address(0)
+    assert index.sync_newer(NisClient(nodes[0].url), address) == 0
+    assert index.state(address)[:3] == (None, None, 1)
+    index.backfill(NisClient(nodes[0].url), address, 10)
+    assert index.count(address) == 0
+
+
+def indexed_rows(chain, address):
+    """Every transfer of ``address`` as ``transfer_record`` tuples, newest first, straight from the chain."""
+    rows, last_id = [], None
+    while True:
+        page = chain.transfers_page(address, id=last_id)
+        if not page:
+            return rows
+        rows.extend(transfer_record(item) for item in page)
+        last_id = page[-1]["meta"]["id"]
+
+
+@pytest.fixture
+def filled(nodes, chains, index):
+    address = chains[0].address(4)
+    index.backfill(NisClient(nodes[0].url), address, 100)
+    return index, address, indexed_rows(chains[0], address)
+
+
+def ids(columns):
+    return list(columns.id)
+
+
+def test_direction_filters(filled):
+    index, address, rows = filled
+    incoming = [row[0] for row in rows if row[5] == address]
+    outgoing = [row[0] for row in rows if row[5] != address]
+    assert incoming and outgoing
+    assert ids(index.history(address, limit=None, direction="incoming")) == incoming
+    assert ids(index.history(address, limit=None, direction="outgoing")) == outgoing
+    assert (index.count(address, "incoming"), index.count(address, "outgoing")) == (len(incoming), len(outgoing))
+    with pytest.raises(ValueError):
+        index.count(address, "sideways")
+
+
+def test_amount_and_date_filters_are_inclusive(filled):
+    index, address, rows = filled
+    amounts = sorted({row[6] for row in rows})
+    low, high = amounts[2], amounts[-3]
+    expected = [row[0] for row in rows if low <= row[6] <= high]
+    assert ids(index.history(address, limit=None, min_amount=low, max_amount=high)) == expected
+    assert index.count(address, min_amount=low, max_amount=high) == len(expected)
+
+    times = sorted(row[8] for row in rows)
+    since, until = times[5], times[20]
+    expected = [row[0] for row in rows if since <= row[8] <= until]
+    assert ids(index.history(address, limit=None, since=since, until=until)) == expected
+    assert ids(index.history(address, limit=None, direction="incoming", since=since)) == [
+        row[0] for row in rows if row[8] >= since and row[5] == address
+    ]
+
+
+@pytest.mark.parametrize("order_by, column", [("amount", 6), ("fee", 7), ("timestamp", 8), ("height", 1), ("id", 0)])
+@pytest.mark.parametrize("descending", [True, False])
+def test_sort_order_breaks_ties_newest_first(filled, order_by, column, descending):
+    index, address, rows = filled
+    expected = sorted(rows, key=lambda row: (-row[column] if descending else row[column], -row[0]))
+    assert ids(index.history(address, limit=None, order_by=order_by, descending=descending)) == [row[0] for row in expected]
+
+
+def test_unknown_sort_column_is_refused(filled):
+    index, address, _ = filled
+    with pytest.raises(ValueError):
+        index.history(address, order_by="message; DROP TABLE transfers")
+
+
+def test_pages_cover_every_row_once(filled):
+    index, address, rows = filled
+    pages = [ids(index.history(address, limit=10, offset=offset, order_by="amount")) for offset in range(0, 40, 10)]
+    assert [len(page) for page in pages] == [10, 10, 10, 2]
+    assert sum(pages, []) == ids(index.history(address, limit=None, order_by="amount"))
+    assert ids(index.history(address, limit=10, offset=32)) == []
+
+
+def test_history_page_syncs_only_as_deep_as_the_page(nodes, chains, index):
+    chain, client = chains[0], NisClient(nodes[0].url)
+    address = chain.address(6)
+    rows = indexed_rows(chain, address)
+
+    columns, total, complete, error = transfer_history_page(client, index, address, page=0, page_size=10, network=chain.network)
+    assert ids(columns) == [row[0] for row in rows[:10]] and error is None
+    assert (total, complete) == (25, False) # Only the newest NIS page is indexed so far
+
+    columns, total, complete, _ = transfer_history_page(client, index, address, page=3, page_size=10, network=chain.network)
+    assert ids(columns) == [row[0] for row in rows[30:]] and (total, complete) == (32, True)
+
+    columns, total, _, _ = transfer_history_page(client, index, address, page=9, page_size=10, network=chain.network)
+    assert len(columns) == 0 and total == 32
+
+
+def test_history_page_filters_in_display_units(nodes, chains, index):
+    chain = chains[0]
+    address = chain.address(6)
+    rows = indexed_rows(chain, address)
+    index.backfill(NisClient(nodes[0].url), address, 100)
+    amounts, times = sorted(row[6] for row in rows), sorted(row[8] for row in rows)
+    low, high, since = amounts[3], amounts[-4], times[4]
+    expected = [row for row in rows if low <= row[6] <= high and row[8] >= since and row[5] != address]
+
+    columns, total, complete, _ = transfer_history_page( # No client: answered from the index alone
+        None, index, address, page=0, page_size=5, direction="outgoing", order_by="amount", descending=False,
+        min_xem=low / 1_000_000, max_xem=high / 1_000_000, since=NEM_EPOCH + datetime.timedelta(seconds=since),
+        network=chain.network,
+    )
+    assert total == len(expected) and complete
+    assert ids(columns) == [row[0] for row in sorted(expected, key=lambda row: (row[6], -row[0]))[:5]]
+
+
+def test_history_page_rejects_invalid_addresses(index):
+    columns, total, complete, error = transfer_history_page(None, index, "not an address")
+    assert (len(columns), total, complete, error) == (0, 0, True, None)
@@ -0,0 +1,131 @@
+"""Bulk lookups: output order, resumable output files and the command line."""
+import json
+import threading
+import time
+
+import pytest
+
+from nem.lookup import WINDOW_PER_WORKER, completed_lines, detect_kind, main, resolve_all
+from nem.mock import SYNTHETIC_CHAIN
+
+
+def run(items, resolve, **options):
+    emitted = []
+    counts = resolve_all(list(enumerate(items, start=1)), resolve, emitted.append, **options)
+    return emitted, counts
+
+
+def slow_for_early_items(kind, item):
+    """Resolves later items first: item ``n`` of 8 takes ``(8 - n) * 20`` ms."""
+    time.sleep((8 - int(item)) * 0.02)
+    if item == "5":
+        raise ValueError("no such thing")
+    return {"kind": kind, "item": item}
+
+
+def test_input_order_waits_for_earlier_items():
+    emitted, counts = run([str(n) for n in range(8)], slow_for_early_items, kind="account", workers=8)
+    assert [record["line"] for record in emitted] == list(range(1, 9))
+    assert counts == (7, 1)
+    failed = emitted[5]
+    assert failed == {"line": 6, "input": "5", "kind": "account", "ok": False, "error": "no such thing"}
+    assert emitted[0] == {"line": 1, "input": "0", "kind": "account", "ok": True, "result": {"kind": "account", "item": "0"}}
+
+
+def test_completion_order_emits_as_soon_as_done():
+    emitted, counts = run([str(n) for n in range(8)], slow_for_early_items, kind="account", workers=8, order="completion")
+    assert [record["line"] for record in emitted] == list(range(8, 0, -1))
+    assert counts == (7, 1)
+
+
+def test_input_order_bounds_items_read_ahead():
+    release, pulled = threading.Event(), []
+
+    def items():
+        for n in range(1000):
+            pulled.append(n)
+            yield n + 1, str(n)
+
+    def resolve(kind, item):
+        if item == "0":
+            release.wait() # The first item holds up every later one in input order
+        return item
+    emitted = []
+    worker = threading.Thread(target=lambda: resolve_all(items(), resolve, emitted.append, kind="account", workers=2))
+    worker.start()
+    time.sleep(0.2)
+    assert len(pulled) == 2 * WINDOW_PER_WORKER and not emitted # Reading stops at the window, not at the end of the input
+    release.set()
+    worker.join()
+    assert [record["input"] for record in emitted] == [str(n) for n in range(1000)]
+
+
+def test_detect_kind():
+    assert detect_kind(SYNTHETIC_CHAIN.transaction_hash(1)) == "transaction"
+    assert detect_kind(SYNTHETIC_CHAIN.transaction_hash(1).upper()) == "transaction"
+    assert detect_kind(SYNTHETIC_CHAIN.address(1)) == "account"
+    assert detect_kind("zz" * 32) == "account"
+
+
+def test_completed_lines_drops_a_partial_last_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+    assert completed_lines(str(path)) == set()
+    records = [
+        {"line": 1, "input": "a", "ok": True},
+        {"line": 2, "input": "b", "ok": False},
+        {"line": 3, "input": "c", "ok": True},
+    ]
+    complete = "".join(json.dumps(record) + "\n" for record in records) + "not json\n"
+    path.write_text(complete + '{"line": 4, "input": "d", "o')
+    assert completed_lines(str(path)) == {(1, "a"), (3, "c")}
+    assert path.read_text() == complete # Cut back to the last full line
+    assert completed_lines(str(path)) == {(1, "a"), (3, "c")}
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    items = [SYNTHETIC_CHAIN.address(n) for n in range(6)] + ["# a comment", "", "not-an-address", SYNTHETIC_CHAIN.transaction_hash(42)]
+    path = tmp_path / "items.txt"
+    path.write_text("\n".join(items) + "\n")
+    return str(path), str(tmp_path / "out.jsonl")
+
+
+def lookup(*args):
+    return main([*args, "--standin", "--network", "mainnet", "--archive", "", "--quiet", "--workers", "4"])
+
+
+def test_command_line_resolves_against_the_standin(inputs):
+    source, output = inputs
+    assert lookup(source, "-o", output) == 1 # One line fails
+    records = read_records(output)
+    assert [record["line"] for record in records] == [1, 2, 3, 4, 5, 6, 9, 10]
+    assert [record["ok"] for record in records] == [True] * 6 + [False, True]
+    assert records[0]["result"]["address"] == SYNTHETIC_CHAIN.address(0)
+    assert records[-1]["kind"] == "transaction" and records[-1]["result"]["hash"] == SYNTHETIC_CHAIN.transaction_hash(42)
+
+
+def test_resume_skips_completed_lines(inputs):
+    source, output = inputs
+    lookup(source, "-o", output)
+    with open(output, encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(output, "w", encoding="utf-8") as f: # Interrupted after three records, in the middle of the fourth
+        f.writelines(lines[:3])
+        f.write(lines[3][:20])
+
+    assert lookup(source, "-o", output, "--resume") == 1
+    records = read_records(output)
+    assert [record["line"] for record in records[:3]] == [1, 2, 3]
+    assert [record["line"] for record in records[3:]] == [4, 5, 6, 9, 10] # Only what was not done, failures retried
+    assert lookup(source, "-o", output, "--resume") == 1
+    assert [record["line"] for record in read_records(output)[8:]] == [9] # Only the failed line again
+
+
+def test_resume_needs_an_output_file(inputs):
+    with pytest.raises(SystemExit):
+        lookup(inputs[0], "--resume")
@@ -0,0 +1,39 @@
+"""Metrics registry counters, histograms and summaries."""
+from nem.metrics import Histogram, Registry, cache_summary
+
+
+def test_counters_are_kept_per_label_set():
+    registry = Registry()
+    registry.inc("nem_failovers_total", node="a")
+    registry.inc("nem_failovers_total", node="a")
+    registry.inc("nem_failovers_total", 3, node="b")
+    assert registry.counter("nem_failovers_total", node="a") == 2
+    assert registry.counter("nem_failovers_total", node="c") == 0
+    assert registry.total("nem_failovers_total") == 5
+    registry.reset()
+    assert registry.total("nem_failovers_total") == 0
+
+
+def test_histogram_quantile_and_prometheus_buckets():
+    registry = Registry()
+    for value in (0.002, 0.002, 0.02, 0.2):
+        registry.observe("nem_request_seconds", value, endpoint="/x", method="GET")
+    [(labels, histogram)] = registry.histograms("nem_request_seconds")
+    assert labels == {"endpoint": "/x", "method": "GET"} and histogram.count == 4
+    assert 0.001 <= histogram.quantile(0.5) <= 0.0025
+    text = registry.render_prometheus()
+    assert "# TYPE nem_request_seconds histogram" in text
+    assert 'nem_request_seconds_bucket{endpoint="/x",method="GET",le="+Inf"} 4' in text
+    assert 'nem_request_seconds_count{endpoint="/x",method="GET"} 4' in text
+
+
+def test_empty_histogram_has_no_quantile():
+    assert Histogram().quantile(0.5) is None
+
+
+def test_cache_summary_hit_ratio():
+    registry = Registry()
+    registry.inc("nem_cache_events_total", 3, cache="height", kind="account", event="hit")
+    registry.inc("nem_cache_events_total", 1, cache="height", kind="account", event="miss")
+    [row] = cache_summary(registry)
+    assert row["hit"] == 3 and row["miss"] == 1 and row["hit_ratio"] == 0.75
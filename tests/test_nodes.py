@@ -0,0 +1,114 @@
+"""NodePool failover and request coalescing against stand-in nodes."""
+import threading
+
+import pytest
+
+from nem import metrics, nodes
+from nem.client import NisError
+from nem.nodes import NodePool
+from nem.standin import EndpointProfile, start_standin
+from nem.synthetic import SyntheticChain
+
+CHAIN = SyntheticChain("pool-tests", accounts=100, height=100)
+
+
+@pytest.fixture
+def standins():
+    servers = []
+
+    def start(**profiles):
+        server, url = start_standin(profiles={path.replace("_", "/"): p for path, p in profiles.items()}, chain=CHAIN)
+        servers.append(server)
+        return server, url
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def account_requests(server):
+    return server.stats.get("/account/get", {})
+
+
+def test_throttled_node_hands_over_without_being_marked_down(standins):
+    busy, busy_url = standins(_account_get=EndpointProfile(rate=1)) # One request per second, then 429
+    spare, spare_url = standins(**{"*": EndpointProfile(latency=20)}) # Slower, so the busy node ranks first
+    pool = NodePool([busy_url, spare_url])
+    pool.probe_all()
+    assert pool.ranked()[0].url == busy_url
+
+    for i in range(5):
+        assert pool.account_get(CHAIN.address(i))["account"]["address"] == CHAIN.address(i)
+    assert account_requests(busy)["throttled"] == 1 # Paused after the first 429: no further requests to it
+    assert account_requests(spare)["requests"] == 4
+    busy_node = next(node for node in pool.nodes if node.url == busy_url)
+    assert busy_node.alive and busy_node.failures == 0 and "rate limit" in busy_node.last_error
+
+
+def test_lone_overloaded_node_is_retried_after_its_pause(standins, monkeypatch):
+    monkeypatch.setattr(nodes, "THROTTLE_PAUSE", 0.05)
+    server, url = standins(_account_get=EndpointProfile(error_rate=1.0, error_status=503))
+    pool = NodePool([url])
+    with pytest.raises(NisError, match="all 1 nodes failed"):
+        pool.account_get(CHAIN.address(1))
+    assert account_requests(server)["errors"] == 2 # Tried, paused, tried once more
+    assert pool.nodes[0].failures == 1
+
+
+def test_client_errors_do_not_fail_over(standins):
+    first, first_url = standins()
+    second, second_url = standins(**{"*": EndpointProfile(latency=20)})
+    pool = NodePool([first_url, second_url])
+    pool.probe_all()
+    with pytest.raises(NisError) as raised:
+        pool.transaction_get("00" * 32)
+    assert raised.value.status == 404
+    assert "/transaction/get" not in second.stats
+
+
+def concurrently(count, call):
+    """Start ``call(0) .. call(count - 1)`` together; returns their results (or exceptions) in order."""
+    barrier, results = threading.Barrier(count), [None] * count
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = call(i)
+        except Exception as e:
+            results[i] = e
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_requests_in_flight_share_one_upstream_call(standins):
+    server, url = standins(**{"*": EndpointProfile(latency=200)}) # Long enough for every caller to join the flight
+    pool = NodePool([url])
+    coalesced = metrics.REGISTRY.counter("nem_coalesced_requests_total", endpoint="/account/get")
+
+    results = concurrently(8, lambda i: pool.account_get(CHAIN.address(3)))
+    assert account_requests(server)["requests"] == 1
+    assert all(result == results[0] for result in results) and results[0]["account"]["address"] == CHAIN.address(3)
+    assert metrics.REGISTRY.counter("nem_coalesced_requests_total", endpoint="/account/get") == coalesced + 7
+
+    pool.account_get(CHAIN.address(3)) # Finished flights are not reused: the next call asks the node again
+    concurrently(4, lambda i: pool.account_get(CHAIN.address(10 + i))) # Different requests are not shared
+    assert account_requests(server)["requests"] == 6
+
+
+def test_coalesced_callers_share_the_failure(standins):
+    server, url = standins(_account_get=EndpointProfile(latency=200, error_rate=1.0, error_status=500))
+    pool = NodePool([url])
+    results = concurrently(5, lambda i: pool.account_get(CHAIN.address(1)))
+    assert all(isinstance(result, NisError) for result in results)
+    assert account_requests(server)["errors"] == 1
+
+
+def test_announces_are_never_coalesced(standins):
+    server, url = standins(**{"*": EndpointProfile(latency=100)})
+    pool = NodePool([url])
+    concurrently(4, lambda i: pool.announce_transaction({"data": "00", "signature": "00"}))
+    assert server.stats["/transaction/announce"]["requests"] == 4
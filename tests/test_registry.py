@@ -0,0 +1,54 @@
+"""AccountRegistry search and CSV import."""
+from nem.address import Address
+from nem.crypto import TESTNET, KeyPair
+from nem.registry import AccountRegistry
+
+KEY_PAIR = KeyPair("575dbb3062267eff57c970a336ebbc8fbcfe12c5bd3ed7bc11eb0481d7704ced")
+ADDRESS = KEY_PAIR.get_address(TESTNET)
+
+
+def test_import_reports_file_line_numbers():
+    text = "\n".join([
+        "address,public_key,private_key,label",
+        "",
+        f"{ADDRESS},,,cold",
+        "TBADADDRESS",
+        f'"{KeyPair.generate().get_address(TESTNET)}",,,"two',
+        'lines"',
+        ",,not-a-key,",
+        "",
+    ])
+    registry = AccountRegistry()
+    added, errors = registry.import_csv(text)
+    assert added == 2
+    assert [line for line, _ in errors] == [4, 7]
+
+
+def test_import_derives_and_checks_keys():
+    other = KeyPair.generate().get_address(TESTNET)
+    for verify in (True, False): # A key for another address is refused either way: it would sign for an account not shown
+        registry = AccountRegistry()
+        added, errors = registry.import_csv(f",,{KEY_PAIR.private_key}\n{other},,{KEY_PAIR.private_key}\n", verify=verify)
+        assert added == 1 and errors == [(2, "private key does not belong to this address")]
+        assert registry.addresses() == [ADDRESS]
+        record = registry.get(ADDRESS)
+        assert record.public_key == KEY_PAIR.public_key and not record.watch_only
+
+
+def test_import_checks_public_keys_when_verifying():
+    line = f"{ADDRESS},{'00' * 32},{KEY_PAIR.private_key},\n"
+    registry = AccountRegistry()
+    assert registry.import_csv(line) == (0, [(1, "public key does not belong to this private key")])
+    assert registry.import_csv(line, verify=False) == (1, [])
+    assert registry.get(ADDRESS).public_key == KEY_PAIR.public_key # Replaced by the derived one
+
+
+def test_search_labels_and_addresses():
+    registry = AccountRegistry()
+    registry.add(ADDRESS, label="cold-wallet")
+    registry.add(KeyPair.generate().get_address(TESTNET), label="hot")
+    assert list(registry.search("cold-wallet")) == [0]
+    assert list(registry.search("COLD")) == [0]
+    assert list(registry.search(Address(ADDRESS).pretty[:13].lower())) == [0] # Dashed address prefix
+    assert len(registry.search("")) == 2
+    assert list(registry.search("nothing")) == []
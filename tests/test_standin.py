@@ -0,0 +1,16 @@
+"""The stand-in node serves the chain it was built for."""
+from nem.client import NisClient
+from nem.standin import start_standin
+from nem.synthetic import SyntheticChain
+
+
+def test_height_follows_chain():
+    chain = SyntheticChain("standin-tests", accounts=10, height=500)
+    server, url = start_standin(chain=chain)
+    try:
+        client = NisClient(url)
+        assert client.chain_height() == 500
+        assert client.block_at(500)["height"] == 500
+    finally:
+        server.shutdown()
+        server.server_close()
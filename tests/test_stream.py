@@ -0,0 +1,109 @@
+"""LiveUpdates bookkeeping, against a recording stand-in for NodeStream."""
+from nem import stream as nem_stream
+from nem.cache import HeightCache
+from nem.stream import LiveUpdates
+
+
+class RecordingStream:
+    def __init__(self):
+        self.listeners = {} # destination -> {token: callback}
+        self.count = 0
+
+    def subscribe(self, destination, callback):
+        self.count += 1
+        self.listeners.setdefault(destination, {})[self.count] = callback
+        return destination, self.count
+
+    def unsubscribe(self, token):
+        destination, key = token
+        self.listeners[destination].pop(key)
+        if not self.listeners[destination]:
+            del self.listeners[destination]
+
+    def push(self, destination, data):
+        for callback in list(self.listeners.get(destination, {}).values()):
+            callback(data)
+
+
+def live_updates():
+    stream = RecordingStream()
+    return stream, LiveUpdates(stream, HeightCache(lambda: 1))
+
+
+def test_watch_tracks_what_any_viewer_shows():
+    stream, live = live_updates()
+    live.watch("a", ["TA", "TB"])
+    live.watch("b", ["TB"])
+    assert live.tracked() == ["TA", "TB"]
+    assert "/unconfirmed/TA" in stream.listeners
+
+    live.watch("a", ["TC"]) # TA is no longer on any screen; TB still is, for viewer b
+    assert live.tracked() == ["TB", "TC"]
+    assert not any(destination.endswith("/TA") for destination in stream.listeners)
+    assert len(stream.listeners["/account/TB"]) == 1 # Subscribed once, however many viewers
+
+
+def test_silent_viewers_expire(monkeypatch):
+    stream, live = live_updates()
+    live.watch("gone", ["TA"])
+    monkeypatch.setattr(nem_stream, "VIEWER_TTL", 0.0)
+    live.watch("here", ["TB"])
+    assert live.tracked() == ["TB"]
+
+
+def test_versions_and_pending():
+    stream, live = live_updates()
+    live.watch("a", ["TA"])
+    assert live.version("TA") == 0
+    stream.push("/unconfirmed/TA", {"meta": {"hash": {"data": "ab"}}, "transaction": {}})
+    assert live.pending("TA") == ["ab"] and live.version("TA") == 1
+    stream.push("/transactions/TA", {"meta": {"hash": {"data": "ab"}}, "transaction": {}})
+    assert live.pending("TA") == [] and live.version("TA") == 2
+
+    stream.push("/unconfirmed/TA", {"meta": {"hash": {"data": "cd"}}, "transaction": {}})
+    live.watch("a", [])
+    assert live.pending("TA") == [] # No confirmation would ever clear it
+    assert live.version("TA") == 4
+    assert stream.listeners == {"/blocks/new": stream.listeners["/blocks/new"]}
+
+
+def test_unconfirmed_listeners():
+    stream, live = live_updates()
+    seen = []
+    live.on_unconfirmed(seen.append)
+    live.watch("a", ["TA"])
+    for _ in range(2): # A repeated push is reported once
+        stream.push("/unconfirmed/TA", {"meta": {"hash": {"data": "ab"}}, "transaction": {}})
+    assert seen == ["ab"]
+
+
+class RankedPool:
+    """The part of ``NodePool`` a pool stream uses: ``nodes`` and ``ranked()``."""
+
+    def __init__(self, *urls):
+        self.nodes = [type("Node", (), {"url": url})() for url in urls]
+
+    def ranked(self):
+        return list(self.nodes)
+
+
+def test_pool_stream_moves_to_the_best_node_on_reconnect(monkeypatch):
+    import asyncio
+
+    monkeypatch.setattr(nem_stream, "RECONNECT_MIN", 0.0)
+    pool = RankedPool("http://a.example:7890", "http://b.example:7890")
+    stream = nem_stream.NodeStream(pool.ranked()[0].url, pool=pool)
+    attempts = []
+
+    async def session():
+        attempts.append(stream.ws_url)
+        if len(attempts) == 2:
+            pool.nodes.reverse() # The probes found node a dead: b ranks first now
+        elif len(attempts) == 4:
+            stream._stop.set()
+        raise ConnectionError("refused")
+    stream._session = session
+    asyncio.run(stream._main())
+    assert attempts == [nem_stream.websocket_url("http://a.example")] * 2 + [nem_stream.websocket_url("http://b.example")] * 2
+    assert stream.node_url == "http://b.example:7890" and stream.switches == 1
+    assert stream.status()["url"] == attempts[-1]
@@ -0,0 +1,79 @@
+"""The synthetic chain is self-consistent and deterministic."""
+from nem.address import Address
+from nem.synthetic import SyntheticChain
+
+CHAIN = SyntheticChain("synthetic-tests", accounts=7, height=30, per_block=4)
+
+
+def walk(chain, address, direction="all"):
+    """Every transfer of ``address``, following the ``id`` of each page's last item."""
+    items, last_id = [], None
+    while True:
+        page = chain.transfers_page(address, direction, id=last_id, page_size=5)
+        if not page:
+            return items
+        items.extend(page)
+        last_id = page[-1]["meta"]["id"]
+
+
+def test_blocks_and_transactions_round_trip():
+    for height in range(1, CHAIN.height + 1):
+        block = CHAIN.block(height)
+        assert block["height"] == height
+        assert block["prevBlockHash"]["data"] == CHAIN.block_hash(height - 1)
+        numbers = range((height - 1) * CHAIN.per_block, height * CHAIN.per_block)
+        assert block["transactions"] == [CHAIN.transaction_json(n) for n in numbers]
+        assert all(CHAIN.transaction(n)["meta"]["height"] == height for n in numbers)
+    assert CHAIN.block(0) is None and CHAIN.block(CHAIN.height + 1) is None
+
+
+def test_transaction_hashes_round_trip():
+    for n in range(CHAIN.transfers):
+        tx_hash = CHAIN.transaction_hash(n)
+        assert CHAIN.transaction_number(tx_hash) == n
+        assert CHAIN.transaction_by_hash(tx_hash)["meta"]["hash"]["data"] == tx_hash
+    forged = CHAIN.transaction_hash(3)[:-2] + "04" # Right tag for 3, number 4
+    assert CHAIN.transaction_number(forged) is None
+    assert CHAIN.transaction_number(SyntheticChain("other", accounts=7, height=30).transaction_hash(3)) is None
+    assert CHAIN.transaction_number(CHAIN.transaction_hash(0)[:10]) is None
+
+
+def test_addresses_are_valid_and_round_trip():
+    other = SyntheticChain("other", accounts=7, height=30)
+    for index in range(CHAIN.accounts):
+        address = CHAIN.address(index)
+        assert Address.is_valid(address, CHAIN.network)
+        assert CHAIN.account_index(address) == index
+        assert CHAIN.account_index(Address(address).pretty.lower()) == index
+        assert CHAIN.account(address)["account"]["address"] == address
+        assert other.account_index(address) is None
+    assert CHAIN.account_index("not an address") is None
+
+
+def test_transfer_pages_are_stable():
+    address = CHAIN.address(2)
+    first = CHAIN.transfers_page(address)
+    assert CHAIN.transfers_page(address) == first
+    assert SyntheticChain("synthetic-tests", accounts=7, height=30, per_block=4).transfers_page(address) == first
+    assert CHAIN.transfers_page(address, id=first[2]["meta"]["id"])[:len(first) - 3] == first[3:] # Paging from any id lines up
+
+
+def test_pages_agree_with_closed_form_totals():
+    for index in range(CHAIN.accounts):
+        address = CHAIN.address(index)
+        items = walk(CHAIN, address)
+        ids = [item["meta"]["id"] for item in items]
+        assert ids == sorted(set(ids), reverse=True) # Newest first, no repeats across pages
+        incoming = [item["transaction"] for item in items if item["transaction"]["recipient"] == address]
+        outgoing = [item["transaction"] for item in items if item["transaction"]["recipient"] != address]
+        assert all(tx["signer"] == CHAIN.public_key(index) for tx in outgoing)
+        assert CHAIN.account_totals(address) == {
+            "received": sum(tx["amount"] for tx in incoming),
+            "incoming": len(incoming),
+            "sent": sum(tx["amount"] for tx in outgoing),
+            "fees": sum(tx["fee"] for tx in outgoing),
+            "outgoing": len(outgoing),
+        }
+        assert [item["meta"]["id"] for item in walk(CHAIN, address, "incoming")] == [
+            item["meta"]["id"] for item in items if item["transaction"]["recipient"] == address
+        ]
@@ -0,0 +1,69 @@
+"""PendingTracker against a stand-in node serving a small synthetic chain."""
+import pytest
+
+from nem.client import NisClient
+from nem.standin import start_standin
+from nem.synthetic import BLOCK_SECONDS, SyntheticChain
+from nem.tracker import CONFIRMED, EXPIRED, PENDING, UNCONFIRMED, PendingTracker
+
+HEIGHT = 60
+
+
+@pytest.fixture(scope="module")
+def chain():
+    return SyntheticChain("tracker-tests", accounts=10, height=HEIGHT)
+
+
+@pytest.fixture(scope="module")
+def client(chain):
+    server, url = start_standin(chain=chain)
+    yield NisClient(url)
+    server.shutdown()
+    server.server_close()
+
+
+def test_confirmed_and_expired(chain, client):
+    tracker = PendingTracker(client)
+    included = chain.transaction_hash(30 * chain.per_block + 1) # In block 31
+    tracker.add(included, deadline=HEIGHT * BLOCK_SECONDS, height=20)
+    tracker.add("ab" * 32, deadline=40 * BLOCK_SECONDS, height=20) # Never included
+    assert tracker.status(included)["state"] == PENDING
+
+    resolved = tracker.check(HEIGHT)
+    assert {status["hash"]: status["state"] for status in resolved} == {included: CONFIRMED, "ab" * 32: EXPIRED}
+    assert tracker.status(included)["height"] == 31
+    assert tracker.pending_count() == 0
+    assert tracker.requests == 3 # Ten blocks per request from height 20 to the expiry at 41
+    assert tracker.check(HEIGHT) == []
+
+
+def test_nothing_pending_costs_no_request(client):
+    tracker = PendingTracker(client)
+    assert tracker.check(HEIGHT) == [] and tracker.requests == 0
+
+
+def test_unconfirmed(chain, client):
+    tracker = PendingTracker(client)
+    early, late = chain.transaction_hash(50 * chain.per_block), "cd" * 32
+    tracker.mark_unconfirmed(early.upper()) # Pushed before the announce returned
+    tracker.add(early, deadline=HEIGHT * BLOCK_SECONDS, height=45)
+    tracker.add(late, deadline=HEIGHT * BLOCK_SECONDS, height=45)
+    tracker.mark_unconfirmed(late)
+    assert [tracker.status(h)["state"] for h in (early, late)] == [UNCONFIRMED, UNCONFIRMED]
+
+    tracker.check(HEIGHT) # Unconfirmed transactions are still matched against new blocks
+    assert tracker.status(early)["state"] == CONFIRMED
+    assert tracker.status(late)["state"] == UNCONFIRMED
+
+
+def test_without_height_looks_back_to_signing(chain, client, monkeypatch):
+    from nem import tracker as nem_tracker
+    from nem.transactions import DEADLINE_SECONDS
+
+    included = chain.transaction_hash(30 * chain.per_block + 2) # In block 31, stamped just before it
+    signed = 31 * BLOCK_SECONDS - chain.per_block
+    monkeypatch.setattr(nem_tracker, "nem_timestamp", lambda: 55 * BLOCK_SECONDS) # The node is at block 55 now
+    tracker = PendingTracker(client)
+    tracker.add(included, deadline=signed + DEADLINE_SECONDS) # No height known when it was announced
+    tracker.check(55)
+    assert tracker.status(included) == {"hash": included, "state": CONFIRMED, "height": 31, "deadline": signed + DEADLINE_SECONDS}
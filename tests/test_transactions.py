@@ -0,0 +1,68 @@
+"""Binary transfer serialization, fees and signing of batches."""
+import pytest
+
+from nem.address import Address
+from nem.crypto import TESTNET, KeyPair, keccak_256
+from nem.transactions import build_signed_transfers, minimum_fee, serialize_transfer
+
+PRIVATE_KEY = "575dbb3062267eff57c970a336ebbc8fbcfe12c5bd3ed7bc11eb0481d7704ced"
+PUBLIC_KEY = "c5f54ba980fcbb657dbaaa42700539b207873e134d2375efeab5f1ab52f87844"
+RECIPIENT = "TDD2CT6LQLIYQ56KIXI3ENTM6EK3D44P5KZPFMK2"
+
+
+@pytest.mark.parametrize("amount_xem, message, units", [
+    (1, b"", 1),
+    (9_999, b"", 1),
+    (10_000, b"", 1),
+    (20_000, b"", 2),
+    (249_999, b"", 24),
+    (250_000, b"", 25),
+    (8_000_000, b"", 25), # Capped
+    (1, b"x", 2),
+    (1, b"x" * 31, 2),
+    (1, b"x" * 32, 3),
+    (30_000, b"x" * 64, 6),
+])
+def test_minimum_fee(amount_xem, message, units):
+    assert minimum_fee(amount_xem * 1_000_000, message) == units * 50_000
+
+
+def test_serialize_transfer_with_message():
+    data = serialize_transfer(PUBLIC_KEY, Address(RECIPIENT), 1_000_000, b"hi", timestamp=100, network=TESTNET)
+    expected = "".join([
+        "01010000", # type 257 (transfer)
+        "01000098", # version 1 on testnet (0x98 << 24 | 1)
+        "64000000", # timestamp 100
+        "20000000" + PUBLIC_KEY, # signer key length and key
+        "a086010000000000", # fee 100,000 microXEM: 1 unit + 1 message unit
+        "740e0000", # deadline: timestamp + 3600
+        "28000000" + RECIPIENT.encode("ascii").hex(), # recipient length 40 and address
+        "40420f0000000000", # amount 1,000,000 microXEM
+        "0a000000", # message field length 8 + 2
+        "01000000", # plain message
+        "02000000" + b"hi".hex(), # payload length and payload
+    ])
+    assert data.hex() == expected
+
+
+def test_serialize_transfer_without_message():
+    data = serialize_transfer(PUBLIC_KEY, Address(RECIPIENT), 25_000 * 1_000_000, timestamp=0, network=TESTNET, fee=123)
+    assert data[-12:-4] == (25_000 * 1_000_000).to_bytes(8, "little")
+    assert data[-4:] == bytes(4) # Message field length 0
+    assert data[48:56] == (123).to_bytes(8, "little") # Explicit fee wins
+    assert len(data) == 4 + 4 + 4 + 4 + 32 + 8 + 4 + 4 + 40 + 8 + 4
+
+
+def test_build_signed_transfers():
+    key_pair = KeyPair(PRIVATE_KEY)
+    entries = [(RECIPIENT, "1.5", "hello"), ("not-an-address", 1, ""), (RECIPIENT, 0, "")]
+    ok, bad_address, bad_amount = build_signed_transfers(key_pair, entries, TESTNET, timestamp=1000, workers=1)
+
+    assert ok["error"] is None and ok["amount"] == 1.5 and ok["deadline"] == 4600
+    data = bytes.fromhex(ok["request"]["data"])
+    assert data == serialize_transfer(PUBLIC_KEY, Address(RECIPIENT), 1_500_000, b"hello", 1000, TESTNET)
+    assert key_pair.verify(data, bytes.fromhex(ok["request"]["signature"]))
+    assert ok["hash"] == keccak_256(data).hex()
+
+    assert bad_address["error"] and bad_address["hash"] is None and "request" not in bad_address
+    assert bad_amount["error"] == "Amount must be positive"